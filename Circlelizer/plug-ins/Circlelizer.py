@@ -3,17 +3,26 @@
 # Circlelizer
 
 import maya.api.OpenMaya as om
-import math as m
+import numpy as np
 import sys
+from collections import namedtuple, OrderedDict
 
 # own classes and scripts
-from QMessageDialog import QMessageDialog as QMessageDialog
+from QMessageDialog import getQMessageDialog
 from QMessageDialog import MESSAGE_ERROR, MESSAGE_INFORMATION
-from QSlideInput import QSlideInput as QSlideInput
-from apiHelper import createComponent, usingIterator_c, createComponent, convertMIterToList
-from geogebraHelper import _createGeogebraPointString
-
-import os
+from apiHelper import createComponent
+from apiHelper import getShapePath, getTriangles
+from topologyCache import topologyCache
+import circleKernel
+from meshBuffer import MeshPointBuffer
+from loopOrdering import orderLoops, regionEdges, LoopOrderingError
+import loopFitting
+import parallelFitting
+import interiorFill
+from rayCaster import TriangleBVH
+from circlelizeDeformer import CirclelizeDeformer
+from commandProfile import CommandProfile
+from undoRecords import MeshEdit, undoHistory
 
 #+-----------------------------------------------------------------------------+
 #| constants pre defined for easier usage                                      |
@@ -30,66 +39,43 @@ MODE = DEBUG
 # version constant which will be used in the window title
 VERSION = "v0.99"
 
-#+-----------------------------------------------------------------------------+
-#| Version Selection use 2017 or 2016 and below                                |
-#+-----------------------------------------------------------------------------+
-isVersion2017 = True
-# try load load pyside2 which is used in 2017 and above
-try:
-    import PySide2.QtCore as qc 
-    import PySide2.QtGui as qg
-    import PySide2.QtWidgets as qw
-except ImportError:
-    import PySide.QtCore as qc
-    import PySide.QtGui as qg
-    # importing twice because under pyside2 a new submodule
-    # was named QWidgets
-    import PySide.QtGui as qw
-    isVersion2017 = False
-
-# used for independent argument assignments
-from functools import partial
-
 # for own command import (gui)
 import maya.cmds as cmds
 
-# determine which maya version is beeing used
-is_version_2020 = cmds.about(version=True) == "2020"
-
-## resolve the resource file paths
-themes_path = os.environ["CIRCLELIZER_THEMES_PATH"]
-docs_path = os.environ["CIRCLELIZER_DOCS_PATH"]
-resources_path_unresolved = os.environ["XBMLANGPATH"]
-
-fileObject = om.MFileObject()
-fileObject.resolveMethod = om.MFileObject.kExact
-fileObject.setRawPath(resources_path_unresolved)
-fileObject.setRawName("header.png")
-resources_path = fileObject.resolvedPath()
-
-# load all the style files which are needed
-styleSheet = None
-with open(themes_path + "/default-theme.qss","r") as styleFile:
-    styleSheet = styleFile.read()
-
-aboutHTML = None
-with open(docs_path + "/about.html", "r") as aboutFile:
-    aboutHTML = aboutFile.read()
-
-helpHTML = None
-with open(docs_path + "/help.html", "r") as helpFile:
-    helpHTML = helpFile.read()
+# qt, the style sheet, the icons and the documents are loaded by the
+# interface and the dialogs when they are needed (see circlelizerResources),
+# so the plug-in loads fast in a mayapy -batch job which never opens a window
 
 #+-----------------------------------------------------------------------------+
 #|                           QMessageDialog String                             |
 #+-----------------------------------------------------------------------------+
 
-MESSAGE_ERROR_ZERO_RADIUS = "The radius can not be zero!"
-MESSAGE_ERROR_NEGATIVE_RADIUS = "The radius can not be negative!"
 MESSAGE_ERROR_MORETHANONECOMPOENT = "You have selected more than one component!"
 
+MESSAGE_ERROR_UNKNOWN_RAYCASTER = "The ray caster has to be maya or numpy!"
+MESSAGE_ERROR_UNKNOWN_PROJECTIONMODE = "The projection mode has to be ray or closest!"
+
 MESSAGE_INFORMATION_NOCOMPONENT ="You need to select a component!"
 
+MESSAGE_ERROR_NOMESH = "The mesh flag needs the name of a polygon mesh!"
+MESSAGE_ERROR_NOTARGETCOMPONENT = "The mesh flag needs vertices, edges or faces!"
+MESSAGE_ERROR_TARGETCOMPONENT_WITHOUTMESH = "The vertices, edges and faces flags need the mesh flag!"
+MESSAGE_ERROR_COMPONENT_OUTOFRANGE = "The {0} id {1} does not exist on {2}!"
+
+# meshes with at least this many loops are fitted in one batched pass
+BATCH_MIN_LOOPS = 4
+
+# available backends for the projection on the mesh
+RAY_CASTERS = ("maya", "numpy")
+
+# ray casts along the circle normal or snaps onto the closest surface point
+PROJECTION_MODES = ("ray", "closest")
+
+# selected components of these types are circlelized
+MESH_COMPONENT_TYPES = (om.MFn.kMeshVertComponent,
+                        om.MFn.kMeshEdgeComponent,
+                        om.MFn.kMeshPolygonComponent)
+
 #+-----------------------------------------------------------------------------+
 #|                            Plug-in Circlelizer                              |
 #+-----------------------------------------------------------------------------+
@@ -111,6 +97,34 @@ class Circlelizer(om.MPxCommand):
     kCircleNormalLongFlag = "-circleNormal"
     kProjectOnMeshFlag = "-p"
     kProjectOnMeshLongFlag = "-projectOnMesh"
+    kThreadsFlag = "-t"
+    kThreadsLongFlag = "-threads"
+    kRayCasterFlag = "-rc"
+    kRayCasterLongFlag = "-rayCaster"
+    kProjectionModeFlag = "-pm"
+    kProjectionModeLongFlag = "-projectionMode"
+    kFillInteriorFlag = "-fi"
+    kFillInteriorLongFlag = "-fillInterior"
+    kProfileFlag = "-pf"
+    kProfileLongFlag = "-profile"
+    kMeshFlag = "-ms"
+    kMeshLongFlag = "-mesh"
+    kVerticesFlag = "-vtx"
+    kVerticesLongFlag = "-vertices"
+    kEdgesFlag = "-edg"
+    kEdgesLongFlag = "-edges"
+    kFacesFlag = "-fcs"
+    kFacesLongFlag = "-faces"
+    kCompressUndoFlag = "-cu"
+    kCompressUndoLongFlag = "-compressUndo"
+    kUndoMemoryFlag = "-um"
+    kUndoMemoryLongFlag = "-undoMemory"
+    kNoUndoFlag = "-nu"
+    kNoUndoLongFlag = "-noUndo"
+    # the component flags in the order of MESH_COMPONENT_TYPES
+    kComponentFlags = ((kVerticesFlag, kVerticesLongFlag),
+                       (kEdgesFlag, kEdgesLongFlag),
+                       (kFacesFlag, kFacesLongFlag))
     
     # Help Text
     kHelpText = "This command calculates a circle for the current selection."
@@ -120,16 +134,15 @@ class Circlelizer(om.MPxCommand):
 
         self.initDefaultValues()
 
-        # for the redo function the calculated points must be stored, to
-        # ensure that we dont need to calculate them again
-        self.calculatedPoints = None
-        self.orderedVerts = None
+        # for the undo and redo function we need to save for every changed
+        # mesh its mdagpath, the changed vertices, their previous postions and
+        # the calculated points, to ensure that we dont need to calculate
+        # them again
+        self.meshEdits = None
 
-        # for the undo function we need to save our mdagpath to create
-        # a mvertiter object and we need to save to previous postions of the
-        # vertices
-        self.mDagPath = None
-        self.previousPositions = None
+        # timings and counts of the current call, only measured if the
+        # profile flag is set
+        self.commandProfile = CommandProfile(False)
 
     def initDefaultValues(self):
         """initializes all of the variables so I can init again after a command
@@ -140,6 +153,18 @@ class Circlelizer(om.MPxCommand):
         self.circleNormal = None
         self.projectOnMesh = False
         self.degree = 360
+        self.threads = parallelFitting.DEFAULT_THREADS
+        self.rayCaster = "maya"
+        self.projectionMode = "ray"
+        self.fillInterior = False
+        self.profile = False
+        # the mesh and component id's of the flags, the selection is used if
+        # the mesh is None
+        self.mesh = None
+        self.targetComponents = []
+        self.compressUndo = False
+        self.undoMemory = False
+        self.noUndo = False
 
     @staticmethod
     def cmdCreator():
@@ -170,6 +195,37 @@ class Circlelizer(om.MPxCommand):
         # Project on Mesh Flag
         syntax.addFlag(Circlelizer.kProjectOnMeshFlag,
                        Circlelizer.kProjectOnMeshLongFlag, om.MSyntax.kBoolean)
+        # Threads Flag
+        syntax.addFlag(Circlelizer.kThreadsFlag,
+                       Circlelizer.kThreadsLongFlag, om.MSyntax.kLong)
+        # Ray Caster Flag
+        syntax.addFlag(Circlelizer.kRayCasterFlag,
+                       Circlelizer.kRayCasterLongFlag, om.MSyntax.kString)
+        # Projection Mode Flag
+        syntax.addFlag(Circlelizer.kProjectionModeFlag,
+                       Circlelizer.kProjectionModeLongFlag, om.MSyntax.kString)
+        # Fill Interior Flag
+        syntax.addFlag(Circlelizer.kFillInteriorFlag,
+                       Circlelizer.kFillInteriorLongFlag, om.MSyntax.kBoolean)
+        # Profile Flag
+        syntax.addFlag(Circlelizer.kProfileFlag,
+                       Circlelizer.kProfileLongFlag, om.MSyntax.kBoolean)
+        # Mesh Flag
+        syntax.addFlag(Circlelizer.kMeshFlag,
+                       Circlelizer.kMeshLongFlag, om.MSyntax.kString)
+        # Component Flags, every use adds one id
+        for flag, longFlag in Circlelizer.kComponentFlags:
+            syntax.addFlag(flag, longFlag, om.MSyntax.kLong)
+            syntax.makeFlagMultiUse(flag)
+        # Compress Undo Flag
+        syntax.addFlag(Circlelizer.kCompressUndoFlag,
+                       Circlelizer.kCompressUndoLongFlag, om.MSyntax.kBoolean)
+        # Undo Memory Flag
+        syntax.addFlag(Circlelizer.kUndoMemoryFlag,
+                       Circlelizer.kUndoMemoryLongFlag)
+        # No Undo Flag
+        syntax.addFlag(Circlelizer.kNoUndoFlag,
+                       Circlelizer.kNoUndoLongFlag, om.MSyntax.kBoolean)
         return syntax
 
     def argumentParser(self, args):
@@ -182,1275 +238,936 @@ class Circlelizer(om.MPxCommand):
             self.degree = argData.flagArgumentDouble(Circlelizer.kDegreeFlag, 0)
         # MidPoint Flag
         if argData.isFlagSet(Circlelizer.kMidPointFlag):
-            self.midPoint = om.MPoint(
-                argData.flagArgumentDouble(Circlelizer.kMidPointFlag, 0),
-                argData.flagArgumentDouble(Circlelizer.kMidPointFlag, 1),
-                argData.flagArgumentDouble(Circlelizer.kMidPointFlag, 2))
+            self.midPoint = np.array(
+                [argData.flagArgumentDouble(Circlelizer.kMidPointFlag, i)
+                 for i in range(3)])
         # CircleNormal Flag
         if argData.isFlagSet(Circlelizer.kCircleNormalFlag):
-            self.circleNormal = om.MVector(
-                argData.flagArgumentDouble(Circlelizer.kCircleNormalFlag, 0),
-                argData.flagArgumentDouble(Circlelizer.kCircleNormalFlag, 1),
-                argData.flagArgumentDouble(Circlelizer.kCircleNormalFlag, 2))
+            self.circleNormal = np.array(
+                [argData.flagArgumentDouble(Circlelizer.kCircleNormalFlag, i)
+                 for i in range(3)])
         # Project on Mesh Flag
         if argData.isFlagSet(Circlelizer.kProjectOnMeshFlag):
             self.projectOnMesh = argData.flagArgumentBool(
                 Circlelizer.kProjectOnMeshFlag, 0)
+        # Threads Flag
+        if argData.isFlagSet(Circlelizer.kThreadsFlag):
+            self.threads = max(1, argData.flagArgumentInt(
+                Circlelizer.kThreadsFlag, 0))
+        # Ray Caster Flag
+        if argData.isFlagSet(Circlelizer.kRayCasterFlag):
+            self.rayCaster = argData.flagArgumentString(
+                Circlelizer.kRayCasterFlag, 0).lower()
+        # Projection Mode Flag
+        if argData.isFlagSet(Circlelizer.kProjectionModeFlag):
+            self.projectionMode = argData.flagArgumentString(
+                Circlelizer.kProjectionModeFlag, 0).lower()
+        # Fill Interior Flag
+        if argData.isFlagSet(Circlelizer.kFillInteriorFlag):
+            self.fillInterior = argData.flagArgumentBool(
+                Circlelizer.kFillInteriorFlag, 0)
+        # Profile Flag
+        if argData.isFlagSet(Circlelizer.kProfileFlag):
+            self.profile = argData.flagArgumentBool(
+                Circlelizer.kProfileFlag, 0)
+        # Mesh Flag
+        if argData.isFlagSet(Circlelizer.kMeshFlag):
+            self.mesh = argData.flagArgumentString(Circlelizer.kMeshFlag, 0)
+        # Component Flags
+        for (flag, _), componentType in zip(Circlelizer.kComponentFlags,
+                                            MESH_COMPONENT_TYPES):
+            if argData.isFlagSet(flag):
+                self.targetComponents.append((componentType, [
+                    argData.getFlagArgumentList(flag, use).asInt(0)
+                    for use in range(argData.numberOfFlagUses(flag))]))
+        # Compress Undo Flag
+        if argData.isFlagSet(Circlelizer.kCompressUndoFlag):
+            self.compressUndo = argData.flagArgumentBool(
+                Circlelizer.kCompressUndoFlag, 0)
+        # Undo Memory Flag
+        if argData.isFlagSet(Circlelizer.kUndoMemoryFlag):
+            self.undoMemory = True
+        # No Undo Flag
+        if argData.isFlagSet(Circlelizer.kNoUndoFlag):
+            self.noUndo = argData.flagArgumentBool(Circlelizer.kNoUndoFlag, 0)
 
     def doIt(self, args):
         # before we are doing anything we need to pass the given arguments
         self.argumentParser(args)
+        self.commandProfile = CommandProfile(self.profile)
 
-        # get selected vertices and save the actual dagPath for later reference
-        # inside the undo and redo function
-        result = self._getSelectedVertices()
-        # if an error occurs within getslectedvertices the function returns 0
-        # otherwise it returns a tripel
-        if result == None:
+        # only returns the bytes of every circlelize inside the undo queue
+        if self.undoMemory:
+            self.setResult(undoHistory.sizes())
             self.initDefaultValues()
             return
 
-        mDagPath, selectedVerts, selectedEdges = result
-
-        self.mDagPath = mDagPath
-
-        # create an iteration object for later iterations over the mesh surface
-        vertComponent = createComponent(om.MFn.kMeshVertComponent,
-                                        selectedVerts)
-        mVertIter = om.MItMeshVertex(mDagPath, vertComponent.object())
-        # before we can continue we need to order the vertices into a continues
-        # selection
-        orderedVerts = self._getContinuesSelection(mVertIter,
-                                                   mDagPath,
-                                                   selectedVerts,
-                                                   selectedEdges)
-        # we can now set the selection and convert it to a vertex selection
-        meshName = mDagPath.fullPathName()
+        # batch jobs are running with undo turned off, nothing would ever
+        # use the stored positions
+        if not self.noUndo:
+            self.noUndo = not cmds.undoInfo(query=True, state=True)
+
+        self._circlelize()
+        if self.meshEdits:
+            undoHistory.add(self)
+            self.commandProfile.count("undoBytes", self.undoBytes())
+
+        # the profile is returned even if the command was stopped early, the
+        # counts are showing how far it got
+        if self.commandProfile.enabled:
+            self.setResult(self.commandProfile.asString())
+            self.commandProfile = CommandProfile(False)
+        self.initDefaultValues()
+
+    def _circlelize(self):
+        """circlelizes the current selection with the parsed arguments. Every
+        stage is measured by the command profile"""
+
+        profile = self.commandProfile
+        if self.rayCaster not in RAY_CASTERS:
+            self._showMessage(MESSAGE_ERROR, MESSAGE_ERROR_UNKNOWN_RAYCASTER)
+            return
+        if self.projectionMode not in PROJECTION_MODES:
+            self._showMessage(MESSAGE_ERROR,
+                              MESSAGE_ERROR_UNKNOWN_PROJECTIONMODE)
+            return
+
+        # get the edges of every component of the flags or of every selected
+        # component and mesh
+        if self._isTargeted():
+            groups = self._getTargetGroups()
+        else:
+            groups = self._getSelectedGroups()
+        # if an error occurs within getSelectedGroups the function returns None
+        if groups == None:
+            return
+        profile.count("components", len(groups))
+        profile.count("selectedEdges", sum(len(group[2]) for group in groups))
+
+        # before we can continue we need to order the vertices into continues
+        # selections. Components of the same mesh share one topology and
+        # are changed together
+        try:
+            with profile.stage("ordering"):
+                meshes = self._groupLoopsByMesh(groups)
+        except LoopOrderingError as orderingError:
+            self._showMessage(MESSAGE_ERROR, str(orderingError))
+            return
+
+        # read all points and normals of every mesh once on the main thread,
+        # every calculation afterwards works on these arrays
+        tasks = []
+        taskMeshes = []
+        for meshIndex, (mDagPath, topology, loops,
+                        regionVerts) in enumerate(meshes.values()):
+            with profile.stage("read"):
+                pointBuffer = MeshPointBuffer(mDagPath)
+                normals = pointBuffer.normals()
+            profile.count("meshes")
+            profile.count("meshVertices", topology.numVertices)
+            profile.count("meshEdges", len(topology.edgeVertices))
+            profile.count("loops", len(loops))
+            profile.count("loopVertices", sum(len(loop) for loop in loops))
+            for chunk in parallelFitting.chunkLoops(loops, self.threads):
+                tasks.append((topology, pointBuffer.points, normals, chunk))
+                taskMeshes.append((meshIndex, mDagPath, pointBuffer,
+                                   topology, regionVerts))
+        profile.count("tasks", len(tasks))
+
+        # the fits of independent loops are pure array work which runs on
+        # several threads. The results come back in the order of the tasks so
+        # undo and redo stay stable
+        with profile.stage("fit"):
+            results = parallelFitting.mapOrdered(self._fitTask, tasks,
+                                                 self.threads)
+
+        # everything which touches the mesh runs on the main thread again
+        fittedMeshes = OrderedDict()
+        for (meshIndex, mDagPath, pointBuffer, topology,
+             regionVerts), result in zip(taskMeshes, results):
+            if meshIndex not in fittedMeshes:
+                fittedMeshes[meshIndex] = (mDagPath, pointBuffer, topology,
+                                           regionVerts, [], [], [])
+            for fitted, values in zip(fittedMeshes[meshIndex][4:], result):
+                fitted.extend(values)
+
+        # without undo the positions are just computed and written, no
+        # snapshot is taken and the command is not undoable
+        self.meshEdits = None if self.noUndo else []
         selectionList = om.MSelectionList()
-        for vert in orderedVerts:
-            selectionList.add("{0}.vtx[{1}]".format(meshName, vert))
-        om.MGlobal.setActiveSelectionList(selectionList)
-        cmds.ConvertSelectionToContainedEdges()
-
-        # now calculate all of the parameters we need. If non of the
-        # paramters were passed, it will calculate average values but some
-        # parameters dependend on some others
-        # ----!!!! Because in this Version of the maya api we cant check 
-        # whether a om.MPoint is None or not, we have to use a method called 
-        # isinstance !!!! ----
+        for (mDagPath, pointBuffer, topology, regionVerts, fittedVerts,
+             fittedPositions, circleNormals) in fittedMeshes.values():
+            # if the projectonmesh option was checked, recalculate the verticies
+            # so they are matching the surface of the object
+            with profile.stage("projection"):
+                if self.projectOnMesh and self.projectionMode == "closest":
+                    fittedPositions = [
+                        self._snapVertsToMeshSurface(mDagPath,
+                                                     transformedVerts)
+                        for transformedVerts in fittedPositions]
+                elif self.projectOnMesh and self.rayCaster == "numpy":
+                    fittedPositions = self._projectLoopsOnMeshSurface(
+                        mDagPath, pointBuffer.points, fittedPositions,
+                        circleNormals)
+                elif self.projectOnMesh:
+                    fittedPositions = [
+                        self._projectVertsOnMeshSurface(mDagPath,
+                                                        transformedVerts,
+                                                        circleNormal)
+                        for transformedVerts, circleNormal in zip(
+                            fittedPositions, circleNormals)]
+
+            loopVertices = np.concatenate(fittedVerts)
+            vertices = loopVertices
+            calculatedPoints = np.concatenate(fittedPositions)
+
+            # the vertices inside of a selected region are relaxed with the
+            # new circles as fixed boundary
+            if self.fillInterior and regionVerts:
+                interior = np.setdiff1d(regionVerts, loopVertices)
+                if len(interior):
+                    fillPoints = pointBuffer.points.copy()
+                    fillPoints[loopVertices] = calculatedPoints
+                    vertices = np.concatenate((loopVertices, interior))
+                    with profile.stage("fill"):
+                        calculatedPoints = np.concatenate((
+                            calculatedPoints,
+                            interiorFill.harmonicFill(topology, fillPoints,
+                                                      interior)))
+                    profile.count("interiorVertices", len(interior))
+            profile.count("changedVertices", len(vertices))
+
+            with profile.stage("writeBack"):
+                # save the current positions of the changed vertices and the
+                # calculated points for the undo and redo functions
+                if self.meshEdits is not None:
+                    self.meshEdits.append(MeshEdit(
+                        mDagPath, vertices, pointBuffer.gather(vertices),
+                        calculatedPoints, self.compressUndo))
+
+                # now just apply the calculated positions to the actuall
+                # selected vertices with a single write per mesh
+                pointBuffer.scatter(vertices, calculatedPoints)
+                pointBuffer.commit()
+
+            # the circles are selected as the edges between their vertices,
+            # calls with the component flags never change the selection
+            if not self._isTargeted():
+                with profile.stage("reselect"):
+                    loopEdges = topology.containedEdges(
+                        topology.mask(loopVertices))
+                    edgeComponent = createComponent(
+                        om.MFn.kMeshEdgeComponent, loopEdges.tolist())
+                    selectionList.add((mDagPath, edgeComponent.object()))
+
+        # calls with the component flags never change the selection
+        if self._isTargeted():
+            return
+
+        # the new selection is set at once
+        with profile.stage("reselect"):
+            om.MGlobal.setActiveSelectionList(selectionList)
+
+    def _isTargeted(self):
+        """whether the components are given by the flags instead of the
+        selection"""
+
+        return self.mesh is not None or bool(self.targetComponents)
+
+    def _showMessage(self, messageType, text):
+        """opens a message dialog. Calls with the component flags are made by
+        scripts which must not be blocked by a dialog, so the message is
+        raised as error instead
+
+        Args:\n
+            messageType (int): MESSAGE_ERROR or MESSAGE_INFORMATION
+            text (str): the message
+
+        Raises:\n
+            RuntimeError: if the components are given by the flags
+        """
+        if self._isTargeted():
+            raise RuntimeError(text)
+
+        error = getQMessageDialog()(messageType, text)
+        error.exec_()
+
+    def _groupLoopsByMesh(self, groups):
+        """orders the selected edges of every group into loops. Groups of the
+        same mesh share one topology and are merged
+
+        Args:\n
+            groups (List[(om.MDagPath, MeshTopology, Set[int], List[int])]):
+                the groups of _getSelectedGroups
+
+        Returns:\n
+            OrderedDict[str, (om.MDagPath, MeshTopology, List[np.ndarray],
+                List[int])]: for every mesh its path, topology, ordered loops
+                and region vertices
+
+        Raises:\n
+            LoopOrderingError: if the edges can not be ordered into loops
+        """
+        meshes = OrderedDict()
+        for mDagPath, topology, selectedEdges, regionVerts in groups:
+            meshName = mDagPath.fullPathName()
+            if meshName not in meshes:
+                meshes[meshName] = (mDagPath, topology, [], [])
+            meshes[meshName][2].extend(
+                self._getContinuesSelections(topology, selectedEdges))
+            meshes[meshName][3].extend(regionVerts)
+
+        return meshes
+
+    def _fitTask(self, task):
+        """fits the loops of one parallel task, see _fitLoops. It only
+        works on arrays and must not use the maya api"""
+
+        return self._fitLoops(*task)
+
+    def _fitLoops(self, topology, points, normals, loops):
+        """calculates the circles for all ordered loops of one mesh. Many
+        loops are fitted together in one batched pass
+
+        Args:\n
+            topology (MeshTopology): neighbourhood index of the mesh
+            points (np.ndarray): (n, 3) positions of all mesh vertices
+            normals (np.ndarray): (n, 3) normals of all mesh vertices
+            loops (List[np.ndarray]): vertices id's of every loop
+
+        Returns:\n
+            (List[np.ndarray], List[np.ndarray], List[np.ndarray]): for every
+                loop the ordered vertices in the order of the circle, their
+                new (n, 3) positions and the normal of the circle
+        """
+        if len(loops) >= BATCH_MIN_LOOPS:
+            return loopFitting.fitLoops(topology, points, normals, loops,
+                                        self.degree, self.radius,
+                                        self.midPoint, self.circleNormal)
+
+        fittedLoops = [self._fitLoop(topology, points, normals, orderedVerts)
+                       for orderedVerts in loops]
+        return tuple(list(values) for values in zip(*fittedLoops))
+
+    def _fitLoop(self, topology, points, normals, orderedVerts):
+        """calculates the circle for one ordered loop
+
+        Args:\n
+            topology (MeshTopology): neighbourhood index of the mesh
+            points (np.ndarray): (n, 3) positions of all mesh vertices
+            normals (np.ndarray): (n, 3) normals of all mesh vertices which
+                decide the facing side of the circle or None
+            orderedVerts (np.ndarray): vertices id's which form a continues
+                row (or circle)
+
+        Returns:\n
+            (np.ndarray, np.ndarray, np.ndarray): the ordered vertices in the
+                order of the circle, their new (n, 3) positions and the
+                normal of the circle
+        """
+        orderedPositions = points[orderedVerts]
+
+        # midPoint, radius, normal and winding are calculated together in a
+        # single pass. The passed parameters are overriding the averages but
         # because we need the average midPoint to move the selection into the
         # origin, we need to calculaute everytime the avg midPoint
-        avgMidPoint = self._avgMidPoint(mVertIter)
-
-        if not isinstance(self.midPoint, om.MPoint):
-            self.midPoint = avgMidPoint
-        if not isinstance(self.radius, float):
-            self.radius = self._avgRadius(mVertIter, avgMidPoint)
-        if not isinstance(self.circleNormal, om.MVector):
-            self.circleNormal = self._avgNormal(mVertIter)
-        # after the paramter asignments determine whether
-        # the ordered selection is clockwise or anticlockwise
-        isClockwise = self._isClockwiseOrder(mVertIter,
-                                             orderedVerts,
-                                             self.circleNormal)
+        referenceNormal = None
+        if normals is not None:
+            referenceNormal = normals[orderedVerts].mean(axis=0)
+        avgMidPoint, avgRadius, circleNormal, isClockwise = \
+            circleKernel.loopStatistics(orderedPositions, self.circleNormal,
+                                        referenceNormal)
+
+        midPoint = self.midPoint
+        if midPoint is None:
+            midPoint = avgMidPoint
+        radius = self.radius
+        if radius is None:
+            radius = avgRadius
 
         # if it is clockwise, reverse the ordered List because then the pre
         # calculated circle points maps to the correct position
         if isClockwise:
-            orderedVerts = list(reversed(orderedVerts))
+            orderedVerts = orderedVerts[::-1]
 
         # get the inner vertices for decide whether a vertex is a true border vertex or not used within the calculateTransforms function
         # it will also be used for the circlelation of the inner vertices
-        firstInnerVerticesLoop, firstOuterVerticesLoop = self._getInnerOuterVertices(mVertIter,
+        firstInnerVerticesLoop, firstOuterVerticesLoop = self._getInnerOuterVertices(topology,
+                                                                                     points,
                                                                                      orderedVerts,
                                                                                      avgMidPoint)
 
-        # pre calculate the circle vertices postions
-        circleVerts = self._calculateCircle(orderedVerts,
-                                            self.degree,
-                                            self.radius)
-
-        transformedVerts = self._calculateTransforms(mVertIter,
-                                                     circleVerts,
+        transformedVerts = self._calculateTransforms(topology,
+                                                     points,
                                                      orderedVerts,
                                                      avgMidPoint,
-                                                     self.radius,
-                                                     self.circleNormal,
+                                                     self.degree,
+                                                     radius,
+                                                     circleNormal,
                                                      firstInnerVerticesLoop)
 
-        # if the projectonmesh option was checked, recalculate the verticies
-        # so they are matching the surface of the object
-        if self.projectOnMesh:
-            projectedVerts = self._projectVertsOnMeshSurface(mDagPath,
-                                                             transformedVerts,
-                                                             self.circleNormal,
-                                                             self.midPoint)
-            transformedVerts = projectedVerts
-
-        # save some variables before tranform our vertices, for the undo redo
-        # functions
+        # because we rotated always at the origin we need to move
+        # the vertices to the correct position via midPoint
+        transformedVerts += midPoint
 
-        # save the current positions of the selected vertices
-        self.previousPositions = self._getPositions(mVertIter, orderedVerts)
-        # save for undo/redo
-        self.orderedVerts = orderedVerts
-
-
-        # now just apply the calculated positions to the actuall selected
-        # vertices
-        self._transformVerts(mVertIter, transformedVerts, orderedVerts,
-                             self.midPoint)
-
-        self.initDefaultValues()
+        return orderedVerts, transformedVerts, circleNormal
 
     def undoIt(self):
         # we can only undo if we have every value we need
-        if isinstance(self.previousPositions, list) and \
-           isinstance(self.orderedVerts, list) and \
-           isinstance(self.mDagPath, om.MDagPath):
-
-            # create a mvertIter object to iterate over all the verts
-            # and apply the previous position
-            vertComponent = createComponent(om.MFn.kMeshVertComponent,
-                                            self.orderedVerts)
-            mVertIter = om.MItMeshVertex(self.mDagPath,
-                                         vertComponent.object())
-
-            for vert, position in zip(self.orderedVerts,
-                                      self.previousPositions):
-                mVertIter.setIndex(vert)
-                mVertIter.setPosition(position)
+        if self.meshEdits is not None:
+            # apply the previous positions with a single write per mesh
+            for meshEdit in reversed(self.meshEdits):
+                self._restorePositions(meshEdit.mDagPath, meshEdit.vertices,
+                                       meshEdit.previousPositions)
 
             return True
 
         else:
-            print(("[undoIt] saved parameter missing:"
-                  "\nPreviousPositions: {0}"
-                  "\nOrderedVerts: {1}"
-                  "\nmDagPath: {2}").format(self.previousPositions,
-                                            self.orderedVerts,
-                                            self.mDagPath))
+            print("[undoIt] saved parameter missing: meshEdits")
 
     def redoIt(self):
         # we can only redo if we have every value we need
-        if isinstance(self.calculatedPoints, list) and \
-           isinstance(self.orderedVerts, list) and \
-           isinstance(self.mDagPath, om.MDagPath):
-
-            # create a mVertIter object to iterate over all the verts and apply
-            # again the calculated postitions
-            vertComponent = createComponent(om.MFn.kMeshVertComponent,
-                                            self.orderedVerts)
-            mVertIter = om.MItMeshVertex(self.mDagPath, vertComponent.object())
-
-            for vert, position in zip(self.orderedVerts, self.calculatedPoints):
-                mVertIter.setIndex(vert)
-                mVertIter.setPosition(position)
+        if self.meshEdits is not None:
+            # apply again the calculated postitions with a single write per
+            # mesh
+            for meshEdit in self.meshEdits:
+                self._restorePositions(meshEdit.mDagPath, meshEdit.vertices,
+                                       meshEdit.calculatedPoints)
             return True
 
         else:
-            print(("[redoIt] saved parameter missing:"
-                  "\CalculatedPoints: {0}"
-                  "\nOrderedVerts: {1}"
-                  "\nmDagPath: {2}").format(self.calculatedPoints,
-                                            self.orderedVerts,
-                                            self.mDagPath))
+            print("[redoIt] saved parameter missing: meshEdits")
 
     def isUndoable(self):
-        return True
+        # calls which did not change anything or ran without undo are not
+        # put onto the queue
+        return bool(self.meshEdits)
+
+    def undoBytes(self):
+        """returns the bytes of the stored undo and redo positions"""
+
+        if self.meshEdits is None:
+            return 0
+        return sum(meshEdit.nbytes for meshEdit in self.meshEdits)
 
-    @usingIterator_c
-    def _calculateTransforms(self, mVertIter, circleVerts, orderedVerts,
-                             midPoint, radius, circleNormal,
+    def _restorePositions(self, mDagPath, vertices, positions):
+        """writes the given positions onto the vertices of the mesh with a
+        single bulk write
+
+        Args:\n
+            mDagPath (om.MDagPath): path to the DAG node of the mesh
+            vertices (np.ndarray): vertex id's which will be changed
+            positions (np.ndarray): (n, 3) positions in the order of the
+                vertices
+
+        Returns:\n
+            None
+        """
+        pointBuffer = MeshPointBuffer(mDagPath)
+        pointBuffer.scatter(vertices, positions)
+        pointBuffer.commit()
+
+    def _calculateTransforms(self, topology, points, orderedVerts, midPoint,
+                             degree, radius, circleNormal,
                              firstInnerVerticesLoop):
         """calculates new points for a circle
 
         Args:\n
-            mVertIter (om.MItMeshVertex): iteration object which contains at least
-                the vertices which are selected
-            circleVerts (List[om.MVector]): list of vertices which defines a circle
-                and y is 0
+            topology (MeshTopology): neighbourhood index of the mesh
+            points (np.ndarray): (n, 3) positions of all mesh vertices
             orderedVerts (List[int]): list of vertices ids which form a continues
                 row (or circle) every neighbor in the list is a neighbor of one
                 another on the selection
-            midPoint (om.MPoint): middle point of the selection
+            midPoint (np.ndarray): middle point of the selection
+            degree (float): degree of the circle section default (360)
             radius (float): radius for the circle
-            circleNormal (om.MVector): direction the circle face is facing to
-            
+            circleNormal (np.ndarray): direction the circle face is facing to
+            firstInnerVerticesLoop (List[int]): inner neighbours of the ordered
+                vertices which are not taken into account
 
         Returns:\n
-            List[om.MPoint]: a list of transform points which form a circle
+            np.ndarray: (n, 3) points relative to the midPoint which form a
+                circle
         """
 
-        orderedVertsPos = []
-        #+---------------------------------------------------------------------+
-        #| retrieve all positions of the ordered vertices (orderedVerts)       |
-        #| and create a new list with all vertices moved to the origin         |
-        #+---------------------------------------------------------------------+
-        for vert in orderedVerts:
-            mVertIter.setIndex(vert)
-            orderedVertsPos.append(om.MPoint(mVertIter.position() - midPoint))
-
         #+---------------------------------------------------------------------+
         #| 1. get all surroundedVerts                                          |
         #| 2. move them to the origin                                          |
-        #| 3. rotate them                                                      |
+        #| 3. let the kernel rotate and align the circle onto them             |
         #+---------------------------------------------------------------------+
 
-        # first we will get the rotation for all of the verts
-        rotationToPlane = circleNormal.rotateTo(om.MVector.kYaxisVector)
-
-        # create a list of verts which will hold all surrounded vertices.
-        # Including outer and inner Vertices
-        surroundedVerts = []
-        for vert in orderedVerts:
-            mVertIter.setIndex(vert)
-            # If a vertex has to or more connected neighbors which aren't
-            # in the selection list it will calculates an average point.
-            surroundedNeighbours = []
-            #print("[DEBUG] vert = ({0})".format(vert))
-            #print("[DEBUG] neighbours = ")
-            for neighbour in mVertIter.getConnectedVertices():
-                # if a neighbour isn't inside the list and not in the inner list
-                # its an outer vertex
-                #print("[DEBUG] n: {0} f: {1}".format(neighbour, firstInnerVerticesLoop))
-                if neighbour not in orderedVerts and neighbour not in firstInnerVerticesLoop:
-                    #print(neighbour)
-                    mVertIter.setIndex(neighbour)
-                    position = mVertIter.position()
-                    # move to origin
-                    position = position - midPoint
-                    # append to list and rotate
-                    surroundedNeighbours.append(
-                        position.rotateBy(rotationToPlane))
-            #print("\n")
-
-            # if we find more then one surrounded neighbour at one vertex
-            # we have to calculate the average of them
-            newVert = om.MVector()
-            surroundedNeighboursLen = len(surroundedNeighbours)
-
-            #print("[DEBUG] vertex = ({0}) neighbours = {1}".format(orderedVertsPos, surroundedNeighbours))
-            if surroundedNeighboursLen > 1:
-                for vert in surroundedNeighbours:
-                    newVert += vert
-                newVert /= surroundedNeighboursLen
-            elif surroundedNeighbours != []:
-                newVert = surroundedNeighbours[0]
-            else:
-                # if there isnt any surrounded vert it is an true border vert
-                # so we just use it as the surrounded vert
-                newVert = om.MVector(mVertIter.position())
-
-            # normalize the vector to apply our radius (inplace)
-            newVert.normalize()
-            newVert *= radius
-            surroundedVerts.append(om.MPoint(newVert))
-
-        #+---------------------------------------------------------------------+
-        #| calculate average of rotation angle                                 |
-        #+---------------------------------------------------------------------+
-        avgAngle = 0
-        #print(_createGeogebraPointString("surroundedVerts", surroundedVerts))
-        #print(_createGeogebraPointString("circleVerts", circleVerts))
-        for surroundedVert,circleVert  in zip(surroundedVerts, circleVerts):
-            #print("[DEBUG] surrounded = ({0:>8.3f}, {1:>8.3f}, {2:>8.3f}) circleVert = ({3:>8.3f}, {4:>8.3f}, {5:>8.3f})".format(
-            #    surroundedVert.x, surroundedVert.y, surroundedVert.z, circleVert.x, circleVert.y, circleVert.z))
-            angle = m.atan2(surroundedVert.z,
-                            surroundedVert.x) - m.atan2(circleVert.z,
-                                                        circleVert.x)
-            # It can happen that an really small value accours which should be
-            # zero
-            if angle < 0.0001 and angle > -0.0001:
-                angle = 0.0
-
-            if angle < 0:
-                angle += 2*m.pi
-
-            avgAngle += angle
-
-        avgAngle /= len(circleVerts)
-
-        #print("[DEBUG] avgAngle = {0}".format(avgAngle))
-
-        # apply the rotation (YAW)
-        rotation = om.MQuaternion(-avgAngle, om.MVector.kYaxisVector)
-        #print("[DEBUG] rotation = {0}".format(rotation))
-
-        rotatedCircleVerts = []
-        for circleVert in circleVerts:
-            rotatedVert = om.MVector(circleVert).rotateBy(rotation)
-            # and now it can savely rerotated
-            rotatedVert = rotatedVert.rotateBy(rotationToPlane.conjugate())
-            rotatedCircleVerts.append(om.MPoint(rotatedVert))
-
-        return rotatedCircleVerts
-
-    @usingIterator_c
-    def _getPositions(self, mVertIter, orderedVerts):
-        """retrieves all positions from the mVertIter
+        orderedVerts = np.asarray(orderedVerts, dtype=np.intp)
+        # if a neighbour isn't inside the ordered list and not in the inner
+        # list its an outer vertex
+        excludedMask = topology.mask(orderedVerts)
+        excludedMask[np.asarray(firstInnerVerticesLoop, dtype=np.intp)] = True
+        rows, neighbours = topology.gatherNeighbours(orderedVerts)
+        isOuter = ~excludedMask[neighbours]
+        rows = rows[isOuter]
+        neighbours = neighbours[isOuter]
+
+        # If a vertex has to or more connected neighbors which aren't in the
+        # selection list it will calculates an average point.
+        count = np.bincount(rows, minlength=len(orderedVerts))
+        surroundedVerts = np.empty((len(orderedVerts), 3))
+        for axis in range(3):
+            surroundedVerts[:, axis] = np.bincount(
+                rows, weights=points[neighbours, axis],
+                minlength=len(orderedVerts))
+        hasNeighbours = count > 0
+        surroundedVerts[hasNeighbours] /= count[hasNeighbours, np.newaxis]
+        # if there isnt any surrounded vert it is an true border vert
+        # so we just use it as the surrounded vert
+        surroundedVerts[~hasNeighbours] = points[orderedVerts[~hasNeighbours]]
+
+        # move to origin
+        surroundedVerts -= midPoint
+
+        return circleKernel.calculateTransforms(surroundedVerts, degree,
+                                                radius, circleNormal)
+
+    def _getContinuesSelections(self, topology, selectedEdges):
+        """reorders the given edges into continues selections. Every chain of
+        edges becomes its own selection
         
         Args:\n
-            mVertIter (om.MItMeshVertex): iteration object which contains at least
-                the vertices which are selected
-            orderedVerts (List[int]): list of vertices ids which form a continues
-                row (or circle) every neighbor in the list is a neighbor of one
-                another on the selection
+            topology (MeshTopology): neighbourhood index of the mesh
+            selectedEdges (Set[int]): edge id's of the selected edges
 
         Returns:\n
-            List[om.MPoint]: list of position from the ordered vertices
-        """
-        positions = []
-        for vert in orderedVerts:
-            mVertIter.setIndex(vert)
-            positions.append(mVertIter.position())
-
-        return positions
-
-    @usingIterator_c
-    def _edgesToVerts(self, mItMeshEdgeComponent):
-        """converts an edge selection into an vertices selection
-
-        Args:\n
-            mItMeshEdgeComponent (om.MItMeshEdge): iterator of edge
-                components to be converted into vertices
+            List[np.ndarray]: for every chain the vertices id's which form a
+                continues row (or circle) every neighbor in the list is a
+                neighbor of one another one the selection
 
-        Returns:\n
-            Set[int]: list of vertex id's        
+        Raises:\n
+            LoopOrderingError: if the selection is branching or not manifold
         """
 
-        # we create a set because then we dont need to care about if a vertex
-        # was added twice
-        edgeVertices = set()
-        # iterate over every edge and add the new verts into the vertex list
-        while not mItMeshEdgeComponent.isDone():
-            edgeVertices.add(mItMeshEdgeComponent.vertexId(0))
-            edgeVertices.add(mItMeshEdgeComponent.vertexId(1))
-            mItMeshEdgeComponent.next()
-
-        return edgeVertices
+        loops = orderLoops(topology.edgeVertices, selectedEdges)
+        if loops == []:
+            raise LoopOrderingError("the selection does not contain edges")
 
-    @usingIterator_c
-    def _facesToVerts(self, mItMeshPolygonComponent):
-        """converts a face selection into a vertex selection
-
-        Args:\n
-            mItMeshPolygonComponent (om.MItMeshPolygon): iterator of polygon
-                components to be converted into vertices
-
-        Returns:\n
-            Set[int]: list of vertex id's
-        """
+        return [loop.vertices for loop in loops]
 
-        # we create a set because then we dont need to care about if a vertex
-        # was added twice
-        faceVertices = set()
-        # iterate over every face and add the new verts into the vertex list
-        while not mItMeshPolygonComponent.isDone():
-            verts = mItMeshPolygonComponent.getVertices()
-            faceVertices.update(verts)
-            if is_version_2020:
-                mItMeshPolygonComponent.next()
-            else:
-                mItMeshPolygonComponent.next(None)
-
-        return faceVertices
-
-    @usingIterator_c
-    def _transformVerts(self, mVertIter, calcedVerts, orderedVerts, midPoint):
-        """applies the calculated new points onto the real points
+    def _getSelectedGroups(self):
+        """returns every component of the current selection as edges which
+        can be ordered into loops. Every selected object is taken into account
         
         Args:\n
-            mVertIter (om.MItMeshVertex): iteration object which contains at least
-                the vertices which are selected
-            calcedVerts (List[om.MPoint]): a list of transform points which form a circle
-            orderedVerts (List[int]): list of vertices ids which form a continues
-                row (or circle) every neighbor in the list is a neighbor of one
-                another on the selection
-            midPoint (om.MPoint): middle point of the selection
-
-        Returns:\n
             None
-        """
-        # tempory: set midPoint to zero if projectOnMesh is activated
-        # because it was already applied
-        if self.projectOnMesh:
-            midPoint = om.MPoint()
-
-        # save the calculated points for redo function
-        self.calculatedPoints = []
-        for orderedVert, calcedVert in zip(orderedVerts, calcedVerts):
-            mVertIter.setIndex(orderedVert)
-            # because we rotated always at the origin we need to move
-            # the vertex to the correct position via midPoint
-            calcedVert += om.MVector(midPoint)
-            self.calculatedPoints.append(calcedVert)
-            mVertIter.setPosition(calcedVert)
-
-    # TODO: check whether really the whole mVertIter object should be traversed and not \
-    # only the orderedVerts same for radius
-    @usingIterator_c
-    def _avgMidPoint(self, mVertIter):
-        """calculates the average point of all selected vertices
-        
-        Args:\n
-            mVertIter (om.MItMeshVertex): iteration object which contains at least
-                the vertices which are selected
 
         Returns:\n
-            om.MPoint: middle point from the points of the mVertIter object
+            List[(om.MDagPath, MeshTopology, Set[int], List[int])]: for every
+                selected component the path of the shape node, its topology
+                index, the edge id's of the loops and the vertex id's of the
+                region the loops are the border of
         """
+        # get current component selection as a list
+        mSelList = om.MGlobal.getActiveSelectionList()
 
-        numVertices = mVertIter.count()
-        avgMidPoint = om.MPoint()
-
-        while not mVertIter.isDone():
-            position = mVertIter.position()
-            avgMidPoint += position
-            mVertIter.next()
-
-        return avgMidPoint/float(numVertices)
-
-    @usingIterator_c
-    def _avgRadius(self, mVertIter, avgMidPoint):
-        """calculates the average radius of all selected vertices
-        
-        Args:\n
-            mVertIter (om.MItMeshVertex): iteration object which contains at least
-                the vertices which are selected
+        # throw an error message if no component was selected
+        if mSelList.isEmpty():
+            self._showMessage(MESSAGE_INFORMATION,
+                              MESSAGE_INFORMATION_NOCOMPONENT)
+            return None
 
-        Returns:\n
-            float: average radius of the selection
-        """
+        components = []
+        for index in range(mSelList.length()):
+            try:
+                mDagPath, mObj = mSelList.getComponent(index)
+            except (RuntimeError, TypeError):
+                # the item is not a DAG node
+                continue
+            # objects without a polygon component selection are ignored
+            if mObj.isNull() or mObj.apiType() not in MESH_COMPONENT_TYPES:
+                continue
+            components.append((getShapePath(mDagPath), mObj))
 
-        radius = 0.0
-        while not mVertIter.isDone():
-            radius += mVertIter.position().distanceTo(avgMidPoint)
-            mVertIter.next()
+        groups = self._getComponentGroups(components)
+        if groups == []:
+            self._showMessage(MESSAGE_INFORMATION,
+                              MESSAGE_INFORMATION_NOCOMPONENT)
+            return None
 
-        return radius/float(mVertIter.count())
+        return groups
 
-    @usingIterator_c
-    def _avgNormal(self, mVertIter):
-        """calculates the average normal of all points from the mVertIter
-    
-        Args:\n
-            mVertIter (om.MItMeshVertex): iteration object which contains at least
-                the vertices which are selected
+    def _getTargetGroups(self):
+        """returns the components of the mesh and component flags as edges
+        which can be ordered into loops, see _getSelectedGroups. The
+        selection is left untouched
 
         Returns:\n
-            om.MVector: average normal (vector) from the mVertIter object
-        """
-
-        avgNormal = om.MVector()
-        while not mVertIter.isDone():
-            avgNormal += mVertIter.getNormal()
-            mVertIter.next()
-
-        return avgNormal/mVertIter.count()
+            List[(om.MDagPath, MeshTopology, Set[int], List[int])]: for every
+                component flag the path of the shape node, its topology
+                index, the edge id's of the loops and the vertex id's of the
+                region the loops are the border of
 
-    @usingIterator_c
-    def _getContinuesSelection(self, mVertIter, mDagPath, selectedVerts,
-                               selectedEdges):
-        """reorders the given vertices into a continues selection.
-        
-        Args:\n
-            mVertIter (om.MItMeshVertex): iteration object which contains at least
-                the vertices which are selected
-            mDagPath (om.MDagPath): path to the DAG node from the selection
-            selectedVerts (List[int]): vertices id's of the selected vertices
-            selectedEdges (List[int]): edge id's of the selected edges
-
-        Returns:\n
-            List[int]: list of vertices id's which form a continues
-                row (or circle) every neighbor in the list is a neighbor of one
-                another one the selection
-            
+        Raises:\n
+            RuntimeError: if the mesh does not exist or an id is out of range
         """
+        if self.mesh is None:
+            raise RuntimeError(MESSAGE_ERROR_TARGETCOMPONENT_WITHOUTMESH)
+        if not any(ids for _, ids in self.targetComponents):
+            raise RuntimeError(MESSAGE_ERROR_NOTARGETCOMPONENT)
 
-        # create a temporary MItMeshEdge component to iterate over the edges
-        mEdgeIter = om.MItMeshEdge(mDagPath)
-
-        orderedVerts = []
-
-        startEdge = selectedEdges.pop()
-        mEdgeIter.setIndex(startEdge)
-        # get a 'random' starting vertex
-        startVert = mEdgeIter.vertexId(1)
-        mVertIter.setIndex(startVert)
-        orderedVerts.append(startVert)
-        nextVert = startVert
-        nextEdge = startEdge
-        foundNoNextEdge = 0
-        while True:
-            # filter out the next edge which is inside the selection loop
-            nextEdge = [edge
-                        for edge in mVertIter.getConnectedEdges()
-                        if edge in selectedEdges]
-            if nextEdge == []:
-                foundNoNextEdge += 1
-            # if there isnt any nextEdges any more exit the loop
-            if nextEdge == [] and selectedEdges != [] and foundNoNextEdge < 2:
-                mEdgeIter.setIndex(startEdge)
-                nextVert = mEdgeIter.vertexId(0)
-                if nextVert not in orderedVerts:
-                    orderedVerts.append(nextVert)
-                mVertIter.setIndex(nextVert)
+        mSelList = om.MSelectionList()
+        try:
+            mSelList.add(self.mesh)
+            mDagPath = getShapePath(mSelList.getDagPath(0))
+        except (RuntimeError, TypeError):
+            raise RuntimeError(MESSAGE_ERROR_NOMESH)
+        if not mDagPath.node().hasFn(om.MFn.kMesh):
+            raise RuntimeError(MESSAGE_ERROR_NOMESH)
+
+        mFnMesh = om.MFnMesh(mDagPath)
+        componentCounts = {om.MFn.kMeshVertComponent: ("vertex",
+                                                       mFnMesh.numVertices),
+                           om.MFn.kMeshEdgeComponent: ("edge",
+                                                       mFnMesh.numEdges),
+                           om.MFn.kMeshPolygonComponent: ("face",
+                                                          mFnMesh.numPolygons)}
+        components = []
+        for componentType, ids in self.targetComponents:
+            if not ids:
                 continue
-            elif nextEdge == []:
-                break
-            # remove it as its already used
-            selectedEdges.remove(nextEdge[0])
-            mEdgeIter.setIndex(nextEdge[0])
-            # get the two connected vertecies of the edge
-            # and filter out the vertex which was not previous selected
-            connectedVerts = [mEdgeIter.vertexId(0), mEdgeIter.vertexId(1)]
-            if nextVert == connectedVerts[0]:
-                nextVert = connectedVerts[1]
-            else:
-                nextVert = connectedVerts[0]
-            # choose if the vertex will be appanded at the beginning or at the
-            # end
-            if nextVert not in orderedVerts:
-                orderedVerts.append(nextVert)
-
-            mVertIter.setIndex(nextVert)
-
-        return orderedVerts
-
-    def _extractBorderVerts(self, mDagPath, selectedVerts):
-        """extracts all border vertices from a given list of vertices
-        
-        Args:\n
-            mDagPath (om.MDagPath): path to the DAG node from the selection
-            selectedVerts (List[int]): vertices id's of the selected vertices
+            componentName, count = componentCounts[componentType]
+            for componentId in (min(ids), max(ids)):
+                if not 0 <= componentId < count:
+                    raise RuntimeError(MESSAGE_ERROR_COMPONENT_OUTOFRANGE.format(
+                        componentName, componentId, self.mesh))
+            components.append((mDagPath, createComponent(componentType,
+                                                         ids).object()))
 
-        Returns:\n
-            Set[int]: collection of vertex id's which are forming the border
-                of the selection (have neighbours which aren't inside the selection)
-        """
+        groups = self._getComponentGroups(components)
+        if groups == []:
+            raise RuntimeError(MESSAGE_ERROR_NOTARGETCOMPONENT)
+
+        return groups
+
+    def _getComponentGroups(self, components):
+        """converts every component into the edges of its loops
 
-        # create a new MItMeshVertex object to get the neighbours of the
-        # vertex and only add those vertices which arent inside the
-        # selectedVerts list
-        vertComponent = createComponent(om.MFn.kMeshVertComponent,
-                                        selectedVerts)
-        mVertIter = om.MItMeshVertex(mDagPath, vertComponent.object())
-        borderVertices = set()
-        # vertices which are probably also a border vertex
-        borderVerticesCandidates = set()
-
-        while not mVertIter.isDone():
-            # If a vertex is a true (end of surface) border vertex it can
-            # be already added
-            if mVertIter.onBoundary():
-                borderVertices.add(mVertIter.index())
-            else:
-                for neighbour in mVertIter.getConnectedVertices():
-                    if not neighbour in selectedVerts:
-                        borderVertices.add(mVertIter.index())
-                    else:
-                        # if a vertex is surrounded by vertices which are all
-                        # inside the selection it is possible that its a 
-                        # corner vertex
-                        #               +-+
-                        #               +-o-+
-                        #               +-+-+
-                        # the o would be a corner vertex which does not have
-                        # outer neighbours but is a border
-                        #
-                        # so we need to check whether a vertex which is not
-                        # supposed to be a border vertex has at least two
-                        # neighbours which are inside the border list
-                        borderVerticesCandidates.add(neighbour)
-            mVertIter.next()
-
-        # now investigate the candidates if they are border vertices too
-        for borderCandidate in borderVerticesCandidates:
-            mVertIter.setIndex(borderCandidate)
-            borderNeighbours = [neighbour
-                                for neighbour in mVertIter.getConnectedVertices()
-                                if neighbour in borderVertices]
-            if len(borderNeighbours) > 1:
-                # a vertex which has more than 2 border neighbours
-                # it might be that this is also a border vertex
-                # to check that we iterate over the vertices neighbours and
-                # if they have both one neighbour match its a border vertex
-                borderNeighbourSet = set()
-                for borderNeighbour in borderNeighbours:
-                    mVertIter.setIndex(borderNeighbour)
-                    for neighbour in mVertIter.getConnectedVertices():
-                        if neighbour not in selectedVerts:
-                            if neighbour not in borderNeighbourSet:
-                                borderNeighbourSet.add(neighbour)
-                            else:
-                                borderVertices.add(borderCandidate)
-                                #print("[DEBUG] added " + borderCandidate)
-        return borderVertices
-
-    def _isClockwiseOrder(self, mVertIter, orderedVerts, avgNormal):
-        """determines whether the given ordered list of verts is in a clockwise
-        order or in an anti clockwise order
-        
         Args:\n
-            mVertIter (om.MItMeshVertex): iteration object which contains at least
-                the vertices which are selected
-            orderedVerts (List[int]): list of vertices ids which form a continues
-                row (or circle) every neighbor in the list is a neighbor of one
-                another on the selection
-            avgNormal (om.MVector): normal of the circle face facing direction
+            components (List[(om.MDagPath, om.MObject)]): the shape paths and
+                their vertex, edge or face components
 
         Returns:\n
-            bool: true if the circle is in clockwise order, false if not
+            List[(om.MDagPath, MeshTopology, Set[int], List[int])]: see
+                _getSelectedGroups, components without edges are left out
         """
-
-        orderedVertsLen = len(orderedVerts)
-        # sum the determinants of all edges variable
-        detSum = 0
-
-        # because the equation only works for 2D we need to rotate the points
-        # to a plane. I choosed the Y axis for that
-        rotator = avgNormal.rotateTo(om.MVector.kYaxisVector)
-
-        # go through all verts and first apply the rotation and then
-        # calculate the determintante of the next 3 Verts till its again
-        # at the start vert
-        for i in range(orderedVertsLen):
-            mVertIter.setIndex(orderedVerts[i])
-            a = mVertIter.position()
-            mVertIter.setIndex(orderedVerts[(i+1) % orderedVertsLen])
-            b = mVertIter.position()
-            mVertIter.setIndex(orderedVerts[(i+2) % orderedVertsLen])
-            c = mVertIter.position()
-
-            # before we can build the matrix we need to rotate the vertices
-            aRot = om.MVector(a).rotateBy(rotator)
-            bRot = om.MVector(b).rotateBy(rotator)
-            cRot = om.MVector(c).rotateBy(rotator)
-
-            matrix = om.MMatrix([[1, aRot.x, aRot.z, 0],
-                                 [1, bRot.x, bRot.z, 0],
-                                 [1, cRot.x, cRot.z, 0],
-                                 [0,      0,      0, 0]])
-
-            detSum += matrix.det3x3()
-
-        if detSum < 0:
-            return True
-        else:
-            return False
-
-    def _getSelectedVertices(self):
-        """returns the current selection as vertices and as loop. It only takes
-        1 object into account
+        groups = []
+        for mDagPath, mObj in components:
+            with self.commandProfile.stage("topology"):
+                topology = topologyCache.get(mDagPath)
+            with self.commandProfile.stage("selection"):
+                selectedEdges, regionVerts = self._getSelectedEdges(
+                    mDagPath, mObj, topology)
+            if selectedEdges:
+                groups.append((mDagPath, topology, selectedEdges,
+                               regionVerts))
+
+        return groups
+
+    def _getSelectedEdges(self, mDagPath, mObj, topology):
+        """returns the selected component as loop edges. A selection which
+        forms a region is reduced to its border
         
         Args:\n
-            None
+            mDagPath (om.MDagPath): path to the DAG node of the component
+            mObj (om.MObject): the selected vertex, edge or face component
+            topology (MeshTopology): neighbourhood index of the mesh
 
         Returns:\n
-            (om.MDagPath, Set[int], Set[int]): path of the DAG node, collection of all selected
-                vertices id's and edge id's
+            (Set[int], List[int]): edge id's of the loops and the selected
+                vertex id's if the selection forms a region (empty if not)
         """
-        # get current component selection as a list
-        mSelList = om.MGlobal.getActiveSelectionList()
-
-        # throw an error message if no component was selected or to many
-        if mSelList.isEmpty():
-            error = QMessageDialog(MESSAGE_INFORMATION,
-                                   MESSAGE_INFORMATION_NOCOMPONENT)
-            error.exec_()
-            return None
-
-        # TODO: this is the function which will be adjusted to work for multiple
-        # selections (getComponent(n))?
-        # gets the first component in the list, the others are ignored
-        mDagPath, mObj = mSelList.getComponent(0)
-
-        # check which method for the specific type has to be used
+        # the component is converted with the cached arrays of the topology,
+        # so neither the selection nor the MEL conversion commands are needed
         mObjType = mObj.apiType()
-        selectedVerts = None
-        selectedEdges = set()
+        componentIds = np.asarray(
+            om.MFnSingleIndexedComponent(mObj).getElements(), dtype=np.intp)
+        selectedFaces = None
         if mObjType == om.MFn.kMeshVertComponent:
-            mVertIter = om.MItMeshVertex(mDagPath, mObj)
-            selectedVerts = convertMIterToList(mVertIter)
+            selectedVerts = np.unique(componentIds)
 
         elif mObjType == om.MFn.kMeshEdgeComponent:
-            mEdgeIter = om.MItMeshEdge(mDagPath, mObj)
             # convert edges to vertices
-            selectedVerts = self._edgesToVerts(mEdgeIter)
+            selectedVerts = np.unique(topology.edgeVertices[componentIds])
 
         elif mObjType == om.MFn.kMeshPolygonComponent:
-            mFaceIter = om.MItMeshPolygon(mDagPath, mObj)
-            selectedVerts = self._facesToVerts(mFaceIter)
+            selectedVerts = topology.faceVertices(componentIds)
+            selectedFaces = topology.faceMask(componentIds)
 
         # +--------------------------------------------------------------------+
         # | Determine if the current selection is a loop or not                |
         # +--------------------------------------------------------------------+
-        extractBorder = False
-        realBorderEdges = set()
-        realBorderVerts = set()
-        # create an temp iteration object
-        vertComponent = createComponent(om.MFn.kMeshVertComponent,
-                                        selectedVerts)
-        mVertIter = om.MItMeshVertex(mDagPath, vertComponent.object())
-        mEdgeIter = om.MItMeshEdge(mDagPath, vertComponent.object())
-
-        # get all real border edges
-        while not mEdgeIter.isDone():
-            if mEdgeIter.onBoundary():
-                vtx1 = mEdgeIter.vertexId(0)
-                vtx2 = mEdgeIter.vertexId(1)
-                if vtx1 in selectedVerts and vtx2 in selectedVerts:
-                    realBorderEdges.add(mEdgeIter.index())
-                    realBorderVerts.add(vtx1)
-                    realBorderVerts.add(vtx2)
-            mEdgeIter.next()
-
-        # add the found border edges onto the empty set
-        selectedEdges = realBorderEdges
-
-        while not mVertIter.isDone():
-            # get all neighbours of the selected verts which are also in the
-            # selection list. If there are more than 2 verts its a loop
-            selectedNeighbours = [neighbour
-                                  for neighbour in mVertIter.getConnectedVertices()
-                                  if neighbour in selectedVerts]
-
-            if len(selectedNeighbours) > 2:
-                extractBorder = True
-                break
-
-            mVertIter.next()
-
-        if extractBorder:
-            # use a shortcut function from cmds to extract the border edges
-            cmds.ConvertSelectionToEdgePerimeter()
-        else:
-            # use a shortcut function from cmds to convert the vertices
-            # selection into an edge selection
-            cmds.ConvertSelectionToContainedEdges()
-
-        # get the new selection
-        mSelList = om.MGlobal.getActiveSelectionList()
+        # a region is reduced to the perimeter of its faces like maya's edge
+        # perimeter, vertex and edge selections are using the faces they
+        # contain. The real border edges are added in both cases
+        convertedEdges, extractBorder = regionEdges(topology, selectedVerts,
+                                                    selectedFaces)
+        selectedEdges = set(convertedEdges.tolist())
 
-        if not mSelList.isEmpty():
-            # gets the first component in the list, the others are ignored
-            mDagPath, mObj = mSelList.getComponent(0)
+        regionVerts = selectedVerts.tolist() if extractBorder else []
+        return selectedEdges, regionVerts
 
-            mEdgeIter = om.MItMeshEdge(mDagPath, mObj)
-
-            # get all edges for determine the ordered selection later
-            while not mEdgeIter.isDone():
-                selectedEdges.add(mEdgeIter.index())
-                mEdgeIter.next()
-
-            # convert the edge selection into verts selection
-            selectedVerts = set.union(self._edgesToVerts(mEdgeIter), realBorderVerts)
-        else:
-            selectedVerts = realBorderVerts
-
-        return mDagPath, selectedVerts, selectedEdges
-
-    @usingIterator_c
-    def _getInnerOuterVertices(self, mVertIter, orderedVerts, midpoint):
+    def _getInnerOuterVertices(self, topology, points, orderedVerts, midpoint):
         """iterate over all ordered verts and for each vertex check which neighbours are closer than the ordered vertex
         
         Args:\n
-            mVertIter (om.MItMeshVertex): iteration object which contains at least
-                the vertices which are selected
+            topology (MeshTopology): neighbourhood index of the mesh
+            points (np.ndarray): (n, 3) positions of all mesh vertices
             orderedVerts (List[int]): list of vertices ids which form a continues
                 row (or circle) every neighbor in the list is a neighbor of one
                 another on the selection
-            midPoint (om.MVector): middle point of the selection
+            midPoint (np.ndarray): middle point of the selection
 
         Returns:\n
-            (List[int], List[int]): list of inner vertices and outer vertices id's
+            (np.ndarray, np.ndarray): inner vertices and outer vertices id's
         """
         # FIXME: so this only works if the mesh does not have overlapping geometry inside the selection (eventually  it can be checked with isPlanar
         # so check if the selection has planar faces) 
-        innerVertices = []
-        outerVertices = []
-        for vertex in orderedVerts:
-            mVertIter.setIndex(vertex)
-            # get vertex position
-            vertexPosition = mVertIter.position()
-            # get vertex distance to midpoint
-            vertexDistanceToMid = vertexPosition.distanceTo(midpoint)
-            # iterate over each neighbour and check the distance to the midpoint
-            for neighbour in mVertIter.getConnectedVertices():
-                mVertIter.setIndex(neighbour)
-                neighbourPosition = mVertIter.position()
-                neighbourDistanceToMid = neighbourPosition.distanceTo(midpoint)
-                if (neighbour not in innerVertices and neighbour not in orderedVerts and neighbourDistanceToMid <= vertexDistanceToMid):
-                    innerVertices.append(neighbour)
-                else:
-                    outerVertices.append(neighbour)
+        orderedVerts = np.asarray(orderedVerts, dtype=np.intp)
+        orderedMask = topology.mask(orderedVerts)
+        # distance of every vertex to the midpoint
+        distanceToMid = np.linalg.norm(points - midpoint, axis=1)
+
+        # check for each neighbour whether it is closer to the midpoint than
+        # its ordered vertex
+        rows, neighbours = topology.gatherNeighbours(orderedVerts)
+        isCandidate = ~orderedMask[neighbours]
+        rows = rows[isCandidate]
+        neighbours = neighbours[isCandidate]
+        isInner = distanceToMid[neighbours] <= distanceToMid[orderedVerts[rows]]
+
+        innerVertices = np.unique(neighbours[isInner])
+        outerVertices = np.setdiff1d(neighbours, innerVertices)
 
         return (innerVertices, outerVertices)
 
-    def _calculateCircle(self, orderedVerts, margin, radius):
-        """calculates each section and creates a circle out of that
-        
+    def _projectVertsOnMeshSurface(self, mDagPath, circleVerts, avgNormal):
+        """project the vertices onto the surface so calculate the circle in place
+
         Args:\n
-            orderedVerts (List[int]): list of vertices ids which form a continues
-                row (or circle) every neighbor in the list is a neighbor of one
-                another on the selection
-            margin (float): degree of the circle section default (360)
-            radius (float): radius of the circle
+            mDagPath (om.MDagPath): path to the DAG node from the selection
+            circleVerts (np.ndarray): (n, 3) positions of the circle points
+            avgNormal (np.ndarray): normal of the circle
 
         Returns:\n
-            List[om.MPoint]: a list of transform points which form a circle
+            np.ndarray: (n, 3) projected points positions
         """
+        meshToProjectOn = om.MFnMesh(mDagPath)
+        # the uniform grid is built by maya on the first ray and kept until
+        # the mesh changes, so the same parameters are reused for every call
+        accelParams = topologyCache.extra(mDagPath, "intersectAccelParams",
+                                          self._createAccelParams)
+        maxDistance = self._projectionDistance(meshToProjectOn, circleVerts)
+        rayDirection = om.MFloatVector(*avgNormal)
+        projectedVerts = np.array(circleVerts, dtype=np.float64)
+        for row, startPoint in enumerate(circleVerts):
+            # the closest hit in both directions is the one we want, so there
+            # is no need to collect every intersection along the ray
+            rayHit = meshToProjectOn.closestIntersection(
+                om.MFloatPoint(*startPoint), rayDirection, om.MSpace.kObject,
+                maxDistance, True, None, None, False, accelParams)
+            # without a hit the point stays on the circle
+            if rayHit[2] != -1:
+                projectedVerts[row] = tuple(rayHit[0])[:3]
+        return projectedVerts
 
-        phi = 0.0
-        alpha = float(margin)/float(len(orderedVerts))
-        sectionDegree = 0
+    def _projectLoopsOnMeshSurface(self, mDagPath, points, loopPositions,
+                                   circleNormals):
+        """projects the circle points of every loop onto the surface at once
+        with the numpy ray caster. The rays are split onto the threads
 
-        calcedPoints = []
+        Args:\n
+            mDagPath (om.MDagPath): path to the DAG node from the selection
+            points (np.ndarray): (n, 3) positions of all mesh vertices
+            loopPositions (List[np.ndarray]): (n, 3) circle points of every
+                loop
+            circleNormals (List[np.ndarray]): normal of every circle
 
-        #print("[DEBUG] calculate circle:")
-        for n in range(len(orderedVerts)):
-            # convert degree in radiant
-            phi = sectionDegree * (m.pi/180.0)
+        Returns:\n
+            List[np.ndarray]: (n, 3) projected points of every loop
+        """
+        # the tree only depends on the topology and is refitted onto the
+        # current positions
+        bvh = topologyCache.extra(
+            mDagPath, "triangleBVH",
+            lambda meshPath: TriangleBVH(points, getTriangles(meshPath)))
+        if bvh.points is not points:
+            bvh.refit(points)
+
+        origins = np.concatenate(loopPositions)
+        directions = np.repeat(np.asarray(circleNormals, dtype=np.float64),
+                               [len(positions) for positions in loopPositions],
+                               axis=0)
+        maxDistance = self._projectionDistance(om.MFnMesh(mDagPath), origins)
+
+        chunks = np.array_split(np.arange(len(origins)), self.threads)
+        results = parallelFitting.mapOrdered(
+            lambda rows: bvh.intersect(origins[rows], directions[rows],
+                                       maxDistance, True)[1],
+            [rows for rows in chunks if len(rows)], self.threads)
+
+        # rays without a hit are keeping their circle point
+        projectedVerts = np.concatenate(results)
+        sizes = np.cumsum([len(positions) for positions in loopPositions])
+        return np.split(projectedVerts, sizes[:-1])
+
+    def _snapVertsToMeshSurface(self, mDagPath, circleVerts):
+        """moves every vertex onto the closest point of the surface. Unlike
+        the ray projection this never misses the mesh
+
+        Args:\n
+            mDagPath (om.MDagPath): path to the DAG node from the selection
+            circleVerts (np.ndarray): (n, 3) positions of the circle points
 
-            # calculate points
-            x = radius * m.cos(phi)
-            z = radius * m.sin(phi)
-            #print("[DEBUG] ({0:>8.3f}, {1:>8.3f}, {2:>8.3f})".format(x, 0, z))
-            calcedPoints.append(om.MVector(x, 0, z))
+        Returns:\n
+            np.ndarray: (n, 3) snapped points positions
+        """
+        # the intersector is built once and reused until the mesh is deformed
+        intersector = topologyCache.shapeExtra(mDagPath, "meshIntersector",
+                                               self._createMeshIntersector)
+        snappedVerts = np.empty_like(circleVerts)
+        for row, point in enumerate(circleVerts):
+            pointOnMesh = intersector.getClosestPoint(om.MPoint(*point))
+            snappedVerts[row] = tuple(pointOnMesh.point)[:3]
+        return snappedVerts
 
-            sectionDegree += alpha
+    @staticmethod
+    def _createMeshIntersector(mDagPath):
+        # the identity matrix keeps every query in object space like the
+        # point buffer
+        intersector = om.MMeshIntersector()
+        intersector.create(getShapePath(mDagPath).node(), om.MMatrix())
+        return intersector
 
-        return calcedPoints
+    @staticmethod
+    def _createAccelParams(mDagPath):
+        return om.MFnMesh(mDagPath).autoUniformGridParams()
 
-    def _projectVertsOnMeshSurface(self, mDagPath, orderedVerts, avgNormal,
-                                   midPoint):
-        """project the vertices onto the surface so calculate the circle in place
+    @staticmethod
+    def _projectionDistance(mFnMesh, circleVerts):
+        """calculates the maximal ray distance which still reaches every part
+        of the mesh from the circle points
 
         Args:\n
-            mDagPath (om.MDagPath): path to the DAG node from the selection
-            orderedVerts (List[int]): list of vertices ids which form a continues
-                row (or circle) every neighbor in the list is a neighbor of one
-                another on the selection
-            avgNormal (om.MVector): normal of the circle
-            midPoint (om.MPoint): middle point of the circle
+            mFnMesh (om.MFnMesh): mesh the points are projected on
+            circleVerts (np.ndarray): (n, 3) positions of the circle points
 
         Returns:\n
-            List[om.MPoint]: list of all projected points positions
+            float: maximal distance of the rays
         """
-        meshToProjectOn = om.MFnMesh(mDagPath)
-        projectedVerts = []
-        for startPoint in orderedVerts:
-            tranformedCirclePoint = om.MFloatPoint(startPoint +
-                                                   om.MVector(midPoint))
-            rayHit = meshToProjectOn.closestIntersection(tranformedCirclePoint,
-                                                         om.MFloatVector(avgNormal),
-                                                         om.MSpace.kObject, 100.0,
-                                                         True)
-            projectedVerts.append(om.MPoint(rayHit[0]))
-        return projectedVerts
+        boundingBox = mFnMesh.boundingBox
+        center = np.array(tuple(boundingBox.center)[:3])
+        diagonal = np.linalg.norm([boundingBox.width, boundingBox.height,
+                                   boundingBox.depth])
+        # points outside of the bounding box need the distance to it as well
+        outside = np.linalg.norm(circleVerts - center, axis=1).max()
 
-# +----------------------------------------------------------------------------+
-# |             Graphical User Interface QTDialog (info/about) Qt Class        |
-# +----------------------------------------------------------------------------+
-class CirclelizerInfoInterfaceClass(qw.QDialog):
-    TEXT_AREA_HEIGHT = 400
-    TEXT_AREA_WIDTH = 400
+        return float(diagonal + outside)
 
-    def __init__(self, stylelize):
-        qw.QDialog.__init__(self)
-        
-        self.setWindowIcon(qg.QIcon(resources_path + "help.png"))
-        self.setWindowTitle("Circlelizer Help")
-        if stylelize: self.setStyleSheet(styleSheet)
-        self.setWindowFlags(qc.Qt.WindowStaysOnTopHint)
-        self.initMainWidget()
-
-    def initMainWidget(self):
-        self.mainLayout = qw.QVBoxLayout()
-        self.tabWidget = qw.QTabWidget()
-        self.tabWidget.addTab(self.initTabHelp(),
-                            qg.QIcon(resources_path + "help.png"),
-                            "Help")
-        self.tabWidget.addTab(self.initTabAbout(),
-                            qg.QIcon(resources_path + "about.png"),
-                            "About")
-        
-        self.mainLayout.addWidget(self.tabWidget)
+#+-----------------------------------------------------------------------------+
+#|                               Preview Session                               |
+#+-----------------------------------------------------------------------------+
 
-        self.setLayout(self.mainLayout)
+# the state of one mesh while it is previewed
+PreviewMesh = namedtuple("PreviewMesh", ["pointBuffer", "originalPoints",
+                                         "preparedLoops"])
 
-    def initTabHelp(self):
-        self.tabHelp = qw.QWidget()
-        self.tabHelp.setObjectName("tab-help")
+class CirclelizerPreviewSession(object):
+    """interactive preview of the circlelize command. The selection is
+    converted, ordered and prepared only once when the session starts, every
+    change of the circle parameters just places the circles again and writes
+    the changed points of every mesh at once. The preview itself is not put
+    onto the undo queue, accept restores the original points and runs the
+    circlelize command, so the whole session is a single undo step.
+    Projection and interior fill are only applied on accept"""
 
-        layout = qw.QVBoxLayout()
+    def __init__(self):
+        self.selection = None
+        self.meshes = []
+        self.active = False
 
-        self.te_help = qw.QTextBrowser()
-        self.te_help.setReadOnly(True)
-        self.te_help.setHtml(helpHTML)
-        self.te_help.setFixedSize(self.TEXT_AREA_HEIGHT, self.TEXT_AREA_WIDTH)
-        layout.addWidget(self.te_help)
+    def start(self):
+        """grabs the current selection and prepares its loops
 
-        self.tabHelp.setLayout(layout)
+        Returns:\n
+            bool: false if nothing can be previewed
+        """
+        self.selection = om.MGlobal.getActiveSelectionList()
+        circlelizer = Circlelizer()
+        groups = circlelizer._getSelectedGroups()
+        if groups == None:
+            return False
 
-        return self.tabHelp
+        try:
+            meshes = circlelizer._groupLoopsByMesh(groups)
+        except LoopOrderingError as orderingError:
+            error = getQMessageDialog()(MESSAGE_ERROR, str(orderingError))
+            error.exec_()
+            return False
 
-    def initTabAbout(self):
-        self.tabAbout = qw.QWidget()
-        self.tabAbout.setObjectName("tab-about")
+        self.meshes = []
+        for mDagPath, topology, loops, regionVerts in meshes.values():
+            pointBuffer = MeshPointBuffer(mDagPath)
+            preparedLoops = loopFitting.prepareLoops(topology,
+                                                     pointBuffer.points,
+                                                     pointBuffer.normals(),
+                                                     loops)
+            self.meshes.append(PreviewMesh(pointBuffer,
+                                           pointBuffer.points.copy(),
+                                           preparedLoops))
+
+        self.active = True
+        return True
 
-        layout = qw.QHBoxLayout()
+    def update(self, radius=None, degree=360, midPoint=None,
+               circleNormal=None):
+        """places the circles for the given parameters and shows them on the
+        meshes, see Circlelizer for the parameters"""
 
-        self.te_about = qw.QTextBrowser()
-        self.te_about.setReadOnly(True)
-        self.te_about.setHtml(aboutHTML)
-        self.te_about.setMaximumSize(self.TEXT_AREA_HEIGHT,
-                                     self.TEXT_AREA_WIDTH)
-        layout.addWidget(self.te_about)
+        if not self.active:
+            return
 
-        self.tabAbout.setLayout(layout)
+        for previewMesh in self.meshes:
+            fittedVerts, fittedPositions, _ = loopFitting.placeLoops(
+                previewMesh.preparedLoops, degree, radius, midPoint,
+                circleNormal)
+            if not fittedVerts:
+                continue
+            vertices = np.concatenate(fittedVerts)
+            previewMesh.pointBuffer.scatter(vertices,
+                                            np.concatenate(fittedPositions))
+            previewMesh.pointBuffer.commit(vertices)
 
-        return self.tabAbout
+    def accept(self, circlelize):
+        """ends the session and applies the circles as one undo step
 
-#+-----------------------------------------------------------------------------+
-#|                      Graphical User Interface QT Class                      |
-#+-----------------------------------------------------------------------------+
+        Args:\n
+            circlelize (Callable): calls the circlelize command with the
+                current parameters
+        """
+        if not self.active:
+            return
 
-class CirclelizerInterfaceClass(qw.QWidget):
-    # Widgets Variables
-    WIDGET_HEIGHT = 20
-    SI_WIDTH = 50
-    SI_NORMAL_XYZ_WIDTH = 25
-    SI_MIDPOINT_XYZ_WIDTH = 50
-
-    B_NORMAL_WIDTH = 25
-
-    def __init__(self, slideInput, stylelize, logo):
-        qw.QWidget.__init__(self)
-        self.infoDialog = CirclelizerInfoInterfaceClass(stylelize)
-
-        self.input = QSlideInput if slideInput else partial(qw.QLineEdit, "0.0")
-
-        self.setWindowIcon(qg.QIcon(resources_path+"icon.png"))
-        self.setWindowTitle("Circlelizer {0}".format(VERSION))
-        self.setObjectName("body")
-        self.setWindowFlags(qc.Qt.WindowStaysOnTopHint)
-        if stylelize: self.setStyleSheet(styleSheet)
-
-        self.initMainWidget(logo)
-
-    def initMainWidget(self, logo):
-        layout = qw.QGridLayout()
-
-        # Header Label
-        if logo:
-            self.l_header = qw.QLabel()
-            self.l_header.setPixmap(qg.QPixmap(resources_path+"header_70.png"))
-            self.l_header.setAlignment(qc.Qt.AlignCenter)
-            layout.addWidget(self.l_header, 0, 0)
-
-        # Help Button
-        icoHelp = qg.QIcon(resources_path + "help.png")
-        self.b_help = qw.QPushButton()
-        self.b_help.setObjectName("b_help")
-        self.b_help.setIcon(icoHelp)
-        self.b_help.setFixedSize(self.WIDGET_HEIGHT, self.WIDGET_HEIGHT)
-        self.b_help.setIconSize(qc.QSize(self.WIDGET_HEIGHT,self.WIDGET_HEIGHT))
-        self.b_help.setLayoutDirection(qc.Qt.RightToLeft)
-        self.b_help.clicked.connect(self.On_HelpButton_Pressed)
-        layout.addWidget(self.b_help, 0, 0, qc.Qt.AlignTop)
-
-        # Tab Widgets
-        self.t_basic = qw.QTabWidget()
-        self.initTabBasic()
-        layout.addWidget(self.t_basic, 1, 0)
-
-        self.t_advanced = qw.QTabWidget()
-        self.initTabAdvanced()
-        layout.addWidget(self.t_advanced, 2, 0)
-
-        # Circlelize Button
-        self.b_circlize = qw.QPushButton("Circlelize")
-        self.b_circlize.setFixedHeight(self.WIDGET_HEIGHT)
-        self.b_circlize.clicked.connect(self.On_CirclizeButton_Pressed)
-        layout.addWidget(self.b_circlize, 3, 0)
-
-        self.setLayout(layout)
-
-    def initTabBasic(self):
-        self.tabBasic = qw.QWidget()
-        self.tabBasic.setObjectName("tab-basic")
-        self.t_basic.addTab(self.tabBasic,
-                            qg.QIcon(resources_path + "tool.png"),
-                            "Basic")
-        # Widgets
-        layout = qw.QGridLayout()
-        # 0 0 Radius Checkbox
-        self.cb_radius = qw.QCheckBox("Smart Radius")
-        self.cb_radius.setFixedHeight(self.WIDGET_HEIGHT)
-        self.cb_radius.setChecked(True)
-        self.cb_radius.stateChanged.connect(
-            lambda value:
-            self.On_SmartCheckBox_StateChanged(value,[self.si_radius,
-                                                      self.l_radius]))
-        layout.addWidget(self.cb_radius, 0, 0)
-
-        # 1 0 MidPoint CheckBox
-        self.cb_midPoint = qw.QCheckBox("Smart MidPoint")
-        self.cb_midPoint.setFixedHeight(self.WIDGET_HEIGHT)
-        self.cb_midPoint.setChecked(True)
-        self.cb_midPoint.stateChanged.connect(
-            lambda value:
-            self.On_SmartCheckBox_StateChanged(value, [self.si_midPointX,
-                                                       self.si_midPointY,
-                                                       self.si_midPointZ,
-                                                       self.l_midPoint]))
-        layout.addWidget(self.cb_midPoint, 1, 0)
-
-        # 0 1 Normal Checkbox
-        self.cb_normal = qw.QCheckBox("Smart Normal")
-        self.cb_normal.setFixedHeight(self.WIDGET_HEIGHT)
-        self.cb_normal.setChecked(True)
-        self.cb_normal.stateChanged.connect(
-            lambda value:
-            self.On_SmartCheckBox_StateChanged(value, [self.si_normalX,
-                                                       self.si_normalY,
-                                                       self.si_normalZ,
-                                                       self.b_normalX,
-                                                       self.b_normalY,
-                                                       self.b_normalZ,
-                                                       self.l_normal]))
-        layout.addWidget(self.cb_normal, 0, 1)
-
-        # 1 1 Project on Mesh
-        self.cb_projectOnMesh = qw.QCheckBox("project on mesh")
-        self.cb_projectOnMesh.setFixedHeight(self.WIDGET_HEIGHT)
-        self.cb_projectOnMesh.setChecked(False)
-        layout.addWidget(self.cb_projectOnMesh, 1, 1)
-
-        self.tabBasic.setLayout(layout)
-
-    def initTabAdvanced(self):
-        self.tabAdvanced = qw.QWidget()
-        self.tabAdvanced.setObjectName("tab-advanced")
-        self.t_advanced.addTab(self.tabAdvanced,
-                               qg.QIcon(resources_path + "advanced.png"),
-                               "Advanced")
-
-        # Widgets
-        layout = qw.QGridLayout()
-
-        # +--------+
-        # | Radius |
-        # +--------+
-
-        # 0 1 Radius Label
-        self.l_radius = qw.QLabel("Radius: ")
-        self.l_radius.setFixedHeight(self.WIDGET_HEIGHT)
-        layout.addWidget(self.l_radius, 0, 0)
-
-        # 0 2 Radius SlideInput
-        self.si_radius = self.input()
-        self.si_radius.setFixedSize(self.SI_WIDTH, self.WIDGET_HEIGHT)
-        layout.addWidget(self.si_radius, 0, 1)
-
-        # +--------+
-        # | Degree |
-        # +--------+
-
-        self.l_degree = qw.QLabel("Degree:")
-        self.l_degree.setFixedHeight(self.WIDGET_HEIGHT)
-        self.l_degree.setFixedWidth(45)
-        layout.addWidget(self.l_degree, 0, 2)
-
-        self.si_degree = self.input()
-        self.si_degree.setText("360.0")
-        self.si_degree.setFixedSize(self.SI_WIDTH, self.WIDGET_HEIGHT)
-        self.si_degree.setToolTip("does not 100% works with my calculations you"\
-                                  "\nhave to manual adjust "\
-                                  "the rotation and scale.")
-        layout.addWidget(self.si_degree, 0, 3)
-
-        # +----------+
-        # | MidPoint |
-        # +----------+
-
-        # 2 1 MidPoint Label
-        self.l_midPoint = qw.QLabel("MidPoint: ")
-        self.l_midPoint.setFixedHeight(self.WIDGET_HEIGHT)
-        layout.addWidget(self.l_midPoint, 1, 0)
-
-        # 2 2 MidPoint SlideInput X
-        self.si_midPointX = self.input()
-        self.si_midPointX.setFixedWidth(self.SI_MIDPOINT_XYZ_WIDTH)
-        self.si_midPointX.setFixedHeight(self.WIDGET_HEIGHT)
-        layout.addWidget(self.si_midPointX, 1, 1)
-
-        # 2 3 MidPoint SlideInput Y
-        self.si_midPointY = self.input()
-        self.si_midPointY.setFixedWidth(self.SI_MIDPOINT_XYZ_WIDTH)
-        self.si_midPointY.setFixedHeight(self.WIDGET_HEIGHT)
-        layout.addWidget(self.si_midPointY, 1, 2)
-
-        # 2 4 MidPoint SlideInput Z
-        self.si_midPointZ = self.input()
-        self.si_midPointZ.setFixedWidth(self.SI_MIDPOINT_XYZ_WIDTH)
-        self.si_midPointZ.setFixedHeight(self.WIDGET_HEIGHT)
-        layout.addWidget(self.si_midPointZ, 1, 3)
-
-        # +--------+
-        # | Normal |
-        # +--------+
-
-        # 2 0 Normal Label
-        self.l_normal = qw.QLabel("Circle Normal:")
-        self.l_normal.setFixedHeight(self.WIDGET_HEIGHT)
-        layout.addWidget(self.l_normal, 2, 0)
-
-        # 2 1 Child Normal X HBoxLayout
-        # -----------------------------
-        childNormalXLayout = qw.QHBoxLayout()
-
-        # 0 0 Normal SlideInput X
-        self.si_normalX = self.input()
-        self.si_normalX.setFixedWidth(self.SI_NORMAL_XYZ_WIDTH)
-        self.si_normalX.setFixedHeight(self.WIDGET_HEIGHT)
-        childNormalXLayout.addWidget(self.si_normalX)
-
-        # 0 1 Normal Button X 
-        self.b_normalX = qw.QPushButton("X")
-        self.b_normalX.setFixedWidth(self.B_NORMAL_WIDTH)
-        self.b_normalX.setFixedHeight(self.WIDGET_HEIGHT)
-        self.b_normalX.setObjectName("xyz")
-        self.b_normalX.pressed.connect(lambda:self.On_AxisButton_Pressed("X"))
-        childNormalXLayout.addWidget(self.b_normalX)
-
-        layout.addItem(childNormalXLayout, 2, 1)
-
-        # 2 2 Child Normal Y HBoxLayout
-        # -----------------------------
-        childNormalYLayout = qw.QHBoxLayout()
-
-        # 0 0 Normal SlideInput Y
-        self.si_normalY = self.input()
-        self.si_normalY.setFixedWidth(self.SI_NORMAL_XYZ_WIDTH)
-        self.si_normalY.setFixedHeight(self.WIDGET_HEIGHT)
-        childNormalYLayout.addWidget(self.si_normalY)
-
-        # 0 1 Normal Button Y
-        self.b_normalY = qw.QPushButton("Y")
-        self.b_normalY.setFixedWidth(self.B_NORMAL_WIDTH)
-        self.b_normalY.setFixedHeight(self.WIDGET_HEIGHT)
-        self.b_normalY.setObjectName("xyz")
-        self.b_normalY.pressed.connect(lambda:self.On_AxisButton_Pressed("Y"))
-        childNormalYLayout.addWidget(self.b_normalY)
-
-        layout.addItem(childNormalYLayout, 2, 2)
-
-        # 2 3 Child Normal Z HBoxLayout
-        # -----------------------------
-        childNormalZLayout = qw.QHBoxLayout()
-
-        # 0 0 Normal SlideInput Z
-        self.si_normalZ = self.input()
-        self.si_normalZ.setFixedWidth(self.SI_NORMAL_XYZ_WIDTH)
-        self.si_normalZ.setFixedHeight(self.WIDGET_HEIGHT)
-        childNormalZLayout.addWidget(self.si_normalZ)
-
-        # 0 1 Normal Button Z
-        self.b_normalZ = qw.QPushButton("Z")
-        self.b_normalZ.setFixedWidth(self.B_NORMAL_WIDTH)
-        self.b_normalZ.setFixedHeight(self.WIDGET_HEIGHT)
-        self.b_normalZ.pressed.connect(lambda:self.On_AxisButton_Pressed("Z"))
-        childNormalZLayout.addWidget(self.b_normalZ)
-
-        layout.addItem(childNormalZLayout, 2, 3)
-
-        # Call events
-        self.cb_radius.stateChanged.emit(2)
-        self.cb_midPoint.stateChanged.emit(2)
-        self.cb_normal.stateChanged.emit(2)
-
-        self.tabAdvanced.setLayout(layout)
-
-    def On_SmartCheckBox_StateChanged(self, value, instances):
-        if value == 2:
-            for instance in instances:
-                instance.setDisabled(1)
-        elif value == 0:
-            for instance in instances:
-                instance.setDisabled(0)
-
-    def On_HelpButton_Pressed(self):
-        self.infoDialog.show()
-
-    def On_AxisButton_Pressed(self, axis):
-        if axis == "X":
-            self.si_normalX.setText("1.0")
-            self.si_normalY.setText("0.0")
-            self.si_normalZ.setText("0.0")
-        elif axis == "Y":
-            self.si_normalX.setText("0.0")
-            self.si_normalY.setText("1.0")
-            self.si_normalZ.setText("0.0")
-        elif axis == "Z":
-            self.si_normalX.setText("0.0")
-            self.si_normalY.setText("0.0")
-            self.si_normalZ.setText("1.0")
-
-    def On_CirclizeButton_Pressed(self):
-        partialCirclelize = None
-
-        if isVersion2017:
-            partialCirclelize = partial(cmds.circlelize)
-        else:
-            # this version of python does not fully support partial.keywords
-            # if its empty it returns None
-            # so we use a little trick here: initialize the function 
-            # with a dummy variable
-            partialCirclelize = partial(cmds.circlelize, dummy = None)
-
-        if not self.cb_radius.isChecked():
-            radius = float(self.si_radius.text())
-
-            if radius == 0:
-                error = QMessageDialog(MESSAGE_ERROR,
-                                       MESSAGE_ERROR_ZERO_RADIUS)
-                error.exec_()
-                return
-            elif radius < 0:
-                error = QMessageDialog(MESSAGE_ERROR,
-                                       MESSAGE_ERROR_NEGATIVE_RADIUS)
-                error.exec_()
-                return
-                            
-            partialCirclelize.keywords["r"] = radius
-
-        if not self.cb_midPoint.isChecked():
-            midPoint = (float(self.si_midPointX.text()),
-                        float(self.si_midPointY.text()),
-                        float(self.si_midPointZ.text()))
-
-            partialCirclelize.keywords["m"] = midPoint
-
-        if not self.cb_normal.isChecked():
-            normal = (float(self.si_normalX.text()),
-                      float(self.si_normalY.text()),
-                      float(self.si_normalZ.text()))
-            partialCirclelize.keywords["cn"] = normal
-
-        degree = float(self.si_degree.text())
-        partialCirclelize.keywords["d"] = degree
-
-        projectOnMesh = self.cb_projectOnMesh.isChecked()
-        partialCirclelize.keywords["p"] = projectOnMesh
-
-        if not isVersion2017:
-            # remove our dummy arg
-            partialCirclelize.keywords.pop("dummy")
-
-        partialCirclelize()
+        self._restore()
+        om.MGlobal.setActiveSelectionList(self.selection)
+        circlelize()
+
+    def cancel(self):
+        """ends the session and restores the original points"""
+
+        if self.active:
+            self._restore()
+
+    def _restore(self):
+        for previewMesh in self.meshes:
+            previewMesh.pointBuffer.points[:] = previewMesh.originalPoints
+            previewMesh.pointBuffer.commit()
+        self.meshes = []
+        self.active = False
 
 #+-----------------------------------------------------------------------------+
 #|                      Plug-in Graphical User Interface                       |
@@ -1476,10 +1193,8 @@ class CirclelizerInterface(om.MPxCommand):
 
     def initDefaultValues(self):
         self.stylize = True
-        if isVersion2017:
-            self.slideInput = True
-        else:
-            self.slideInput = False
+        # the slide input does not work with pyside
+        self.slideInput = None
         self.logo = True
 
     @staticmethod
@@ -1532,9 +1247,15 @@ class CirclelizerInterface(om.MPxCommand):
     def doIt(self, args):
         self.argumentParser(args)
 
+        from circlelizerWindow import CirclelizerInterfaceClass, isVersion2017
+
+        if self.slideInput is None:
+            self.slideInput = isVersion2017
         self.cuiClass = CirclelizerInterfaceClass(self.slideInput,
                                                   self.stylize,
-                                                  self.logo)
+                                                  self.logo,
+                                                  CirclelizerPreviewSession(),
+                                                  VERSION)
         self.cuiClass.show()
 
 #+-----------------------------------------------------------------------------+
@@ -1557,12 +1278,35 @@ def initializePlugin(mObject):
             sys.stderr.write("Failed to register command: {0}".format(
                 command.kPluginCmdName))
 
+    try:
+        mPlugin.registerNode(CirclelizeDeformer.kNodeName,
+                             CirclelizeDeformer.kNodeId,
+                             CirclelizeDeformer.creator,
+                             CirclelizeDeformer.initialize,
+                             om.MPxNode.kDeformerNode)
+        cmds.makePaintable(CirclelizeDeformer.kNodeName, "weights",
+                           attrType="multiFloat", shapeMode="deformer")
+    except:
+        sys.stderr.write("Failed to register node: {0}".format(
+            CirclelizeDeformer.kNodeName))
+
+    topologyCache.install()
+
 def uninitializePlugin(mObject):
     mPlugin = om.MFnPlugin(mObject)
 
+    topologyCache.uninstall()
+    parallelFitting.shutdown()
+
     for command in commands:
         try:
             mPlugin.deregisterCommand(command.kPluginCmdName)
         except:
             sys.stderr.write("Failed to unregister command: {0}".format(
                 command.kPluginCmdName))
+
+    try:
+        mPlugin.deregisterNode(CirclelizeDeformer.kNodeId)
+    except:
+        sys.stderr.write("Failed to unregister node: {0}".format(
+            CirclelizeDeformer.kNodeName))
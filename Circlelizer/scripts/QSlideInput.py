@@ -1,17 +1,7 @@
-#+----------------------------------------------+
-#| Version Selection use 2017 or 2016 and below |
-#+----------------------------------------------+
-# try load load pyside2 which is used in 2017 and above
-try:
-    import PySide2.QtCore as qc 
-    import PySide2.QtGui as qg
-    import PySide2.QtWidgets as qw
-except ImportError:
-    import PySide.QtCore as qc
-    import PySide.QtGui as qg
-    # importing twice because under pyside2 a new submodule
-    # was named QWidgets
-    import PySide.QtGui as qw
+from circlelizerResources import loadQt
+
+# the slide input is only imported by the interface
+qc, qg, qw, _ = loadQt()
 
 #+---------------------------------------------------------------------------+
 #|                           QSlideInput Widget                              |
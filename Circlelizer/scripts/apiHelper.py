@@ -1,4 +1,7 @@
 import maya.api.OpenMaya as om
+import numpy as np
+
+from meshTopology import MeshTopology
 
 #+---------------------------------------------------------------------------+
 #|                         Maya Api Helper Functions                         |
@@ -11,53 +14,6 @@ def getPath(path, resolveMethod):
     fileObject.setRawPath(path)
     return fileObject.resolvedPath()
 
-def convertMIterToList(mVertIter):
-    """
-    if everything would function as it should, this function wouldnt be
-    necessary. It only accepts mItMeshVertex objects and returns a list of
-    vertices"""
-
-    vertices = []
-    while not mVertIter.isDone():
-        vertices.append(int(mVertIter.index()))
-        mVertIter.next()
-
-    return vertices
-
-def usingIterator(function):
-    """
-    use this as an decorator if you are using a mMeshVertexIterator or
-    something similarly. Before it calls the actual function its resets
-    the iterator and if the function is completed it resets the iterator again.
-
-    The iterator must be in the first place of the parameter list.
-    
-    ! only use this method if you DOESN'T want to call it inside a class !"""
-    def wrapper(*args, **kwargs):
-        args[0].reset()
-        result = function(*args, **kwargs)
-        args[0].reset()
-
-        return result
-    return wrapper
-
-def usingIterator_c(function):
-    """
-    use this as an decorator if you are using a mMeshVertexIterator or
-    something similarly. Before it calls the actual function its resets
-    the iterator and if the function is completed it resets the iterator again.
-
-    The iterator must be in the first place after self of the parameter list.
-    
-    ! only use this method if you want to call it inside a class !"""
-    def wrapper(*args, **kwargs):
-        args[1].reset()
-        result = function(*args, **kwargs)
-        args[1].reset()
-
-        return result
-    return wrapper
-
 def createComponent(MfnMeshComponentType, data):
     """
     creates a new component with given data.
@@ -71,4 +27,53 @@ def createComponent(MfnMeshComponentType, data):
     # and adding the data
     component.addElements(data)
 
-    return component
\ No newline at end of file
+    return component
+
+def pointArrayToNumpy(mPointArray):
+    """converts an om.MPointArray or om.MFloatVectorArray into a contiguous
+    (n, 3) float64 numpy array. The w component of points is dropped"""
+
+    if len(mPointArray) == 0:
+        return np.zeros((0, 3))
+
+    return np.ascontiguousarray(np.array(mPointArray, dtype=np.float64)[:, :3])
+
+def numpyToPointArray(points):
+    """converts a (n, 3) numpy array into an om.MPointArray"""
+
+    return om.MPointArray(np.asarray(points, dtype=np.float64).tolist())
+
+def getShapePath(mDagPath):
+    """returns a copy of the mDagPath which points to the shape node. Paths
+    to a transform are extended to their shape"""
+
+    shapePath = om.MDagPath(mDagPath)
+    if shapePath.node().hasFn(om.MFn.kTransform):
+        shapePath.extendToShape()
+
+    return shapePath
+
+def buildTopology(mDagPath):
+    """builds the MeshTopology index of the mesh the mDagPath points to. The
+    face arrays are read at once, the edge vertices with one pass over the
+    edges"""
+
+    mFnMesh = om.MFnMesh(mDagPath)
+    faceCounts, faceConnects = mFnMesh.getVertices()
+
+    edgeVertices = np.empty((mFnMesh.numEdges, 2), dtype=np.intp)
+    mEdgeIter = om.MItMeshEdge(mDagPath)
+    while not mEdgeIter.isDone():
+        edgeVertices[mEdgeIter.index()] = (mEdgeIter.vertexId(0),
+                                           mEdgeIter.vertexId(1))
+        mEdgeIter.next()
+
+    return MeshTopology(mFnMesh.numVertices, faceCounts, faceConnects,
+                        edgeVertices)
+
+def getTriangles(mDagPath):
+    """returns the (t, 3) vertex ids of every triangle of the mesh the way
+    maya triangulates it"""
+
+    triangleCounts, triangleVertices = om.MFnMesh(mDagPath).getTriangles()
+    return np.array(triangleVertices, dtype=np.intp).reshape(-1, 3)
@@ -0,0 +1,428 @@
+import math as m
+
+import numpy as np
+
+#+---------------------------------------------------------------------------+
+#|                         Circle Geometry Kernel                            |
+#|                                                                           |
+#| -> the math behind the circlelize command. Every function works on        |
+#|    contiguous (n, 3) float64 arrays so the whole loop is processed at     |
+#|    once. It does not depend on maya and can be used standalone           |
+#+---------------------------------------------------------------------------+
+
+# the y axis is used as the plane normal on which the circle is calculated
+Y_AXIS = np.array([0.0, 1.0, 0.0])
+
+# angles smaller than this are treated as zero while aligning the circle
+ANGLE_TOLERANCE = 0.0001
+
+# area vectors shorter than this (relative) are treated as degenerated loops
+NORMAL_TOLERANCE = 1e-9
+
+def asPoints(points):
+    """converts the given points into a contiguous (n, 3) float64 array
+
+    Args:\n
+        points (Sequence): anything numpy can convert into a (n, 3) array
+
+    Returns:\n
+        np.ndarray: contiguous (n, 3) float64 array
+    """
+    return np.ascontiguousarray(np.asarray(points, dtype=np.float64)
+                                .reshape(-1, 3))
+
+def newellTerms(centeredPoints, nextPoints):
+    """returns the cross product of every polygon edge. Their sum is twice
+    the area vector of the polygon (newell normal) which does not average out
+    on saddle shaped or thin loops like vertex normals do"""
+
+    return np.cross(centeredPoints, nextPoints)
+
+def orientNormals(areaVectors, scales, referenceNormals=None):
+    """normalizes the area vectors and flips them onto the side of the
+    reference normals. Degenerated loops (all points on a line) fall back to
+    the reference normal or the y axis
+
+    Args:\n
+        areaVectors (np.ndarray): (k, 3) newell normal of every loop
+        scales (np.ndarray): (k,) sum of the squared radii of every loop
+        referenceNormals (np.ndarray): (k, 3) rough facing direction of every
+            loop or None
+
+    Returns:\n
+        np.ndarray: (k, 3) unit normals
+    """
+
+    areaVectors = asPoints(areaVectors)
+    lengths = np.linalg.norm(areaVectors, axis=1)
+    normals = np.tile(Y_AXIS, (len(areaVectors), 1))
+    if referenceNormals is not None:
+        referenceNormals = asPoints(referenceNormals)
+        hasReference = np.linalg.norm(referenceNormals, axis=1) > 0.0
+        normals[hasReference] = referenceNormals[hasReference]
+        flip = np.einsum("ij,ij->i", areaVectors, referenceNormals) < 0
+        areaVectors = np.where(flip[:, np.newaxis], -areaVectors, areaVectors)
+
+    valid = lengths > NORMAL_TOLERANCE * np.asarray(scales, dtype=np.float64)
+    normals[valid] = areaVectors[valid] / lengths[valid, np.newaxis]
+    normals /= np.linalg.norm(normals, axis=1)[:, np.newaxis]
+
+    return normals
+
+def loopStatistics(orderedPoints, circleNormal=None, referenceNormal=None):
+    """calculates the midPoint, the average radius, the normal and the
+    winding of an ordered loop in one go. The normal is the newell normal of
+    the polygon the loop forms
+
+    Args:\n
+        orderedPoints (np.ndarray): (n, 3) positions of the ordered vertices
+        circleNormal (np.ndarray): (3,) normal the winding is measured
+            against, None for the newell normal
+        referenceNormal (np.ndarray): (3,) rough facing direction (e.g. the
+            average vertex normal) which decides the side of the newell
+            normal
+
+    Returns:\n
+        (np.ndarray, float, np.ndarray, bool): (3,) midPoint, average radius,
+            (3,) normal and true if the loop is in clockwise order if viewed
+            along the normal
+    """
+    orderedPoints = asPoints(orderedPoints)
+    midPoint = orderedPoints.mean(axis=0)
+    centered = orderedPoints - midPoint
+    squaredRadii = np.einsum("ij,ij->i", centered, centered)
+    radius = float(np.sqrt(squaredRadii).mean())
+    areaVector = newellTerms(centered, np.roll(centered, -1, axis=0)).sum(
+        axis=0)
+
+    if circleNormal is None:
+        if referenceNormal is not None:
+            referenceNormal = np.asarray(referenceNormal, dtype=np.float64)[
+                np.newaxis]
+        circleNormal = orientNormals(areaVector[np.newaxis],
+                                     [squaredRadii.sum()],
+                                     referenceNormal)[0]
+
+    # the circle is generated anti clockwise around the -y axis, so a loop
+    # whose area vector points along the normal is clockwise on that plane
+    isClockwise = bool(np.dot(areaVector, circleNormal) > 0)
+
+    return midPoint, radius, circleNormal, isClockwise
+
+def rotationTo(source, target=Y_AXIS):
+    """calculates the rotation matrix of the shortest arc between two vectors.
+    It matches the behaviour of om.MVector.rotateTo
+
+    Args:\n
+        source (np.ndarray): (3,) vector which will be rotated
+        target (np.ndarray): (3,) vector the source will be rotated to
+
+    Returns:\n
+        np.ndarray: (3, 3) rotation matrix, apply it with points.dot(matrix.T)
+    """
+    source = np.asarray(source, dtype=np.float64)
+    target = np.asarray(target, dtype=np.float64)
+    sourceLength = np.linalg.norm(source)
+    targetLength = np.linalg.norm(target)
+    if sourceLength == 0.0 or targetLength == 0.0:
+        return np.identity(3)
+
+    source = source / sourceLength
+    target = target / targetLength
+    axis = np.cross(source, target)
+    sinAngle = np.linalg.norm(axis)
+    cosAngle = float(np.dot(source, target))
+
+    if sinAngle < 1e-12:
+        if cosAngle > 0.0:
+            return np.identity(3)
+        # the vectors are opposite of each other so every perpendicular axis
+        # is a valid rotation axis
+        axis = np.cross(source, [1.0, 0.0, 0.0])
+        if np.linalg.norm(axis) < 1e-6:
+            axis = np.cross(source, [0.0, 0.0, 1.0])
+        sinAngle = 0.0
+
+    axis = axis / np.linalg.norm(axis)
+    # rodrigues' rotation formula
+    cross = np.array([[0.0, -axis[2], axis[1]],
+                      [axis[2], 0.0, -axis[0]],
+                      [-axis[1], axis[0], 0.0]])
+    return (np.identity(3) + sinAngle * cross +
+            (1.0 - cosAngle) * cross.dot(cross))
+
+def calculateCircle(count, degree, radius, offset=0.0):
+    """calculates count points of a circle section on the xz plane
+
+    Args:\n
+        count (int): number of points
+        degree (float): degree of the circle section default (360)
+        radius (float): radius of the circle
+        offset (float): angle in radians the first point starts at
+
+    Returns:\n
+        np.ndarray: (count, 3) points which form a circle
+    """
+    phi = np.arange(count, dtype=np.float64) * (float(degree) / count)
+    phi = np.radians(phi) + offset
+
+    circle = np.zeros((count, 3))
+    circle[:, 0] = radius * np.cos(phi)
+    circle[:, 2] = radius * np.sin(phi)
+
+    return circle
+
+def alignmentAngle(guidePoints, circlePoints):
+    """calculates the average yaw angle between the guide points and the
+    circle points on the xz plane
+
+    Args:\n
+        guidePoints (np.ndarray): (n, 3) rotated points the circle should
+            follow
+        circlePoints (np.ndarray): (n, 3) points of the not aligned circle
+
+    Returns:\n
+        float: average angle in radians
+    """
+    angles = (np.arctan2(guidePoints[:, 2], guidePoints[:, 0]) -
+              np.arctan2(circlePoints[:, 2], circlePoints[:, 0]))
+    # It can happen that an really small value accours which should be zero
+    angles[np.abs(angles) < ANGLE_TOLERANCE] = 0.0
+    angles[angles < 0] += 2 * m.pi
+
+    return float(angles.mean())
+
+def calculateTransforms(guidePoints, degree, radius, normal):
+    """calculates the new points of the circle. The guide points are rotated
+    onto the xz plane, a circle is generated and aligned to them and at the
+    end everything is rotated back onto the plane of the normal
+
+    Args:\n
+        guidePoints (np.ndarray): (n, 3) ordered points relative to the
+            midPoint which decide the rotation of the circle
+        degree (float): degree of the circle section default (360)
+        radius (float): radius of the circle
+        normal (np.ndarray): (3,) direction the circle face is facing to
+
+    Returns:\n
+        np.ndarray: (n, 3) points of the circle relative to the midPoint
+    """
+    guidePoints = asPoints(guidePoints)
+    rotationToPlane = rotationTo(normal)
+
+    rotatedGuides = guidePoints.dot(rotationToPlane.T)
+    circle = calculateCircle(len(guidePoints), degree, radius)
+    avgAngle = alignmentAngle(rotatedGuides, circle)
+
+    # generate the aligned circle directly instead of rotating it (YAW)
+    circle = calculateCircle(len(guidePoints), degree, radius, avgAngle)
+
+    # and now it can savely rerotated (the inverse of a rotation matrix is
+    # its transpose)
+    return np.ascontiguousarray(circle.dot(rotationToPlane))
+
+#+---------------------------------------------------------------------------+
+#|                          Batched (Ragged) Kernel                          |
+#|                                                                           |
+#| -> the same math for many loops at once. All loops are packed into one    |
+#|    flat (n, 3) array, offsets (k + 1) mark where every loop starts. The   |
+#|    statistics are calculated with segment reductions                      |
+#+---------------------------------------------------------------------------+
+
+def segmentIds(offsets):
+    """returns for every entry of the flat array the id of its loop"""
+
+    offsets = np.asarray(offsets, dtype=np.intp)
+    return np.repeat(np.arange(len(offsets) - 1, dtype=np.intp),
+                     np.diff(offsets))
+
+def segmentNext(offsets, shift=1):
+    """returns for every entry of the flat array the index of the entry which
+    comes shift positions later inside the same loop (wrapping around)"""
+
+    offsets = np.asarray(offsets, dtype=np.intp)
+    segments = segmentIds(offsets)
+    starts = offsets[segments]
+    counts = np.diff(offsets)[segments]
+    local = np.arange(len(segments), dtype=np.intp) - starts
+
+    return starts + (local + shift) % counts
+
+def segmentReversed(offsets, reverse):
+    """returns the indices which reverse the order of the flagged loops
+
+    Args:\n
+        offsets (np.ndarray): (k + 1) start of every loop
+        reverse (np.ndarray): (k,) bool flag for every loop
+
+    Returns:\n
+        np.ndarray: (n,) index array into the flat array
+    """
+    offsets = np.asarray(offsets, dtype=np.intp)
+    segments = segmentIds(offsets)
+    starts = offsets[segments]
+    ends = offsets[segments + 1]
+    indices = np.arange(len(segments), dtype=np.intp)
+
+    return np.where(np.asarray(reverse)[segments],
+                    starts + ends - 1 - indices, indices)
+
+def segmentMean(values, offsets):
+    """calculates the mean of every loop of the flat values"""
+
+    offsets = np.asarray(offsets, dtype=np.intp)
+    counts = np.diff(offsets).astype(np.float64)
+    sums = np.add.reduceat(values, offsets[:-1], axis=0)
+
+    return sums / counts.reshape((-1,) + (1,) * (sums.ndim - 1))
+
+def batchedLoopStatistics(points, offsets, circleNormals=None,
+                          referenceNormals=None):
+    """calculates the midPoint, radius, normal and winding of every loop, see
+    loopStatistics
+
+    Args:\n
+        points (np.ndarray): (n, 3) flat positions of all ordered loops
+        offsets (np.ndarray): (k + 1) start of every loop
+        circleNormals (np.ndarray): (k, 3) normal every winding is measured
+            against, None for the newell normals
+        referenceNormals (np.ndarray): (k, 3) rough facing direction of every
+            loop which decides the side of its newell normal
+
+    Returns:\n
+        (np.ndarray, np.ndarray, np.ndarray, np.ndarray): (k, 3) midPoints,
+            (k,) radii, (k, 3) normals and (k,) true for every loop in
+            clockwise order
+    """
+    points = asPoints(points)
+    offsets = np.asarray(offsets, dtype=np.intp)
+    midPoints = segmentMean(points, offsets)
+    centered = points - midPoints[segmentIds(offsets)]
+    squaredRadii = np.einsum("ij,ij->i", centered, centered)
+    radii = segmentMean(np.sqrt(squaredRadii), offsets)
+    areaVectors = np.add.reduceat(
+        newellTerms(centered, centered[segmentNext(offsets)]), offsets[:-1],
+        axis=0)
+
+    if circleNormals is None:
+        circleNormals = orientNormals(
+            areaVectors, np.add.reduceat(squaredRadii, offsets[:-1]),
+            referenceNormals)
+    circleNormals = asPoints(circleNormals)
+    isClockwise = np.einsum("ij,ij->i", areaVectors, circleNormals) > 0
+
+    return midPoints, radii, circleNormals, isClockwise
+
+def batchedRotationsTo(sources, target=Y_AXIS):
+    """calculates the rotation matrices of the shortest arc between every
+    source vector and the target, see rotationTo
+
+    Args:\n
+        sources (np.ndarray): (k, 3) vectors which will be rotated
+        target (np.ndarray): (3,) vector the sources will be rotated to
+
+    Returns:\n
+        np.ndarray: (k, 3, 3) rotation matrices
+    """
+    sources = asPoints(sources)
+    target = np.asarray(target, dtype=np.float64)
+    target = target / np.linalg.norm(target)
+    lengths = np.linalg.norm(sources, axis=1)
+    valid = lengths > 0.0
+    sources = sources / np.where(valid, lengths, 1.0)[:, np.newaxis]
+
+    axes = np.cross(sources, target)
+    sinAngles = np.linalg.norm(axes, axis=1)
+    cosAngles = sources.dot(target)
+
+    parallel = sinAngles < 1e-12
+    # opposite vectors can use every perpendicular axis
+    opposite = parallel & (cosAngles < 0.0)
+    if opposite.any():
+        fallback = np.cross(sources[opposite], [1.0, 0.0, 0.0])
+        small = np.linalg.norm(fallback, axis=1) < 1e-6
+        fallback[small] = np.cross(sources[opposite][small], [0.0, 0.0, 1.0])
+        axes[opposite] = fallback
+        sinAngles[opposite] = 0.0
+    axes[parallel & ~opposite] = [1.0, 0.0, 0.0]
+    axes /= np.linalg.norm(axes, axis=1)[:, np.newaxis]
+
+    # rodrigues' rotation formula for every axis
+    cross = np.zeros((len(sources), 3, 3))
+    cross[:, 0, 1] = -axes[:, 2]
+    cross[:, 0, 2] = axes[:, 1]
+    cross[:, 1, 0] = axes[:, 2]
+    cross[:, 1, 2] = -axes[:, 0]
+    cross[:, 2, 0] = -axes[:, 1]
+    cross[:, 2, 1] = axes[:, 0]
+    rotations = (np.identity(3) + sinAngles[:, np.newaxis, np.newaxis] * cross +
+                 (1.0 - cosAngles)[:, np.newaxis, np.newaxis] *
+                 np.einsum("kij,kjl->kil", cross, cross))
+    rotations[~valid | (parallel & ~opposite)] = np.identity(3)
+
+    return rotations
+
+def batchedCalculateCircles(offsets, degree, radii, angleOffsets):
+    """calculates the circle points of every loop on the xz plane, see
+    calculateCircle
+
+    Args:\n
+        offsets (np.ndarray): (k + 1) start of every loop
+        degree (float): degree of the circle sections default (360)
+        radii (np.ndarray): (k,) radius of every circle
+        angleOffsets (np.ndarray): (k,) angle in radians every first point
+            starts at
+
+    Returns:\n
+        np.ndarray: (n, 3) flat points of all circles
+    """
+    offsets = np.asarray(offsets, dtype=np.intp)
+    segments = segmentIds(offsets)
+    counts = np.diff(offsets)[segments]
+    local = np.arange(len(segments)) - offsets[segments]
+
+    phi = (np.radians(local * (float(degree) / counts)) +
+           np.asarray(angleOffsets, dtype=np.float64)[segments])
+    radii = np.asarray(radii, dtype=np.float64)[segments]
+
+    circles = np.zeros((len(segments), 3))
+    circles[:, 0] = radii * np.cos(phi)
+    circles[:, 2] = radii * np.sin(phi)
+
+    return circles
+
+def batchedCalculateTransforms(guidePoints, offsets, degree, radii, normals):
+    """calculates the new points of every circle at once, see
+    calculateTransforms
+
+    Args:\n
+        guidePoints (np.ndarray): (n, 3) flat ordered points relative to the
+            midPoint of their loop
+        offsets (np.ndarray): (k + 1) start of every loop
+        degree (float): degree of the circle sections default (360)
+        radii (np.ndarray): (k,) radius of every circle
+        normals (np.ndarray): (k, 3) direction every circle face is facing to
+
+    Returns:\n
+        np.ndarray: (n, 3) flat points of the circles relative to the
+            midPoint of their loop
+    """
+    offsets = np.asarray(offsets, dtype=np.intp)
+    segments = segmentIds(offsets)
+    rotations = batchedRotationsTo(normals)[segments]
+
+    rotatedGuides = np.einsum("nij,nj->ni", rotations, asPoints(guidePoints))
+    zeros = np.zeros(len(offsets) - 1)
+    circles = batchedCalculateCircles(offsets, degree, radii, zeros)
+
+    angles = (np.arctan2(rotatedGuides[:, 2], rotatedGuides[:, 0]) -
+              np.arctan2(circles[:, 2], circles[:, 0]))
+    # It can happen that an really small value accours which should be zero
+    angles[np.abs(angles) < ANGLE_TOLERANCE] = 0.0
+    angles[angles < 0] += 2 * m.pi
+
+    circles = batchedCalculateCircles(offsets, degree, radii,
+                                      segmentMean(angles, offsets))
+
+    # rerotate every point with the transposed rotation of its loop
+    return np.ascontiguousarray(np.einsum("nji,nj->ni", rotations, circles))
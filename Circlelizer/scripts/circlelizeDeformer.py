@@ -0,0 +1,275 @@
+import threading
+
+import maya.api.OpenMaya as om
+import maya.api.OpenMayaAnim as oma
+import maya.utils
+import numpy as np
+
+from apiHelper import buildTopology, pointArrayToNumpy, numpyToPointArray
+from loopOrdering import regionLoops, LoopOrderingError
+import loopFitting
+
+#+---------------------------------------------------------------------------+
+#|                           Circlelize Deformer                             |
+#|                                                                           |
+#| -> deformer node which circlelizes its member vertices on every           |
+#|    evaluation, so upstream deformations and animated parameters stay      |
+#|    live. The topology and the ordered loops are cached on the node and    |
+#|    only rebuilt if the connectivity or the membership changes. The cache  |
+#|    is derived from the inputs only, which keeps the node safe for         |
+#|    parallel evaluation and cached playback. Errors are never shown from   |
+#|    the evaluation, they are handed to the main thread once                |
+#+---------------------------------------------------------------------------+
+
+# id from the range maya reserves for local plug-ins (0x00000 - 0x7ffff)
+CIRCLELIZE_DEFORMER_ID = om.MTypeId(0x0007F7C1)
+
+# if more than this fraction of the mesh is needed the points are read at once
+BULK_READ_RATIO = 0.125
+
+class LoopState(object):
+    """everything cached for one input geometry of the deformer
+
+    Attributes:\n
+        counts (Tuple[int, int, int]): number of vertices, edges and faces the
+            topology was built with
+        topology (MeshTopology): neighbourhood index of the mesh
+        members (np.ndarray): vertex id's of the deformer set
+        loops (List[np.ndarray]): ordered vertex id's of every loop
+        neededVerts (np.ndarray): loop vertices and their neighbours, the
+            only points the fit reads
+        error (str): why the members could not be ordered, None if they
+            could
+        errorReported (bool): the error was already handed to the main
+            thread
+    """
+
+    def __init__(self, counts, topology):
+        self.counts = counts
+        self.topology = topology
+        self.members = None
+        self.loops = []
+        self.neededVerts = np.zeros(0, dtype=np.intp)
+        self.error = None
+        self.errorReported = False
+
+    def matches(self, counts, faceCounts, faceConnects):
+        """checks if the topology was built from the same connectivity. The
+        counts alone stay the same e.g. for a spun edge
+
+        Args:\n
+            counts (Tuple[int, int, int]): number of vertices, edges and faces
+            faceCounts (np.ndarray): number of vertices of every face
+            faceConnects (np.ndarray): vertex ids of all faces
+
+        Returns:\n
+            bool: True if the cached topology is still valid
+        """
+        return (self.counts == counts and
+                np.array_equal(self.topology.faceCounts, faceCounts) and
+                np.array_equal(self.topology.faceConnects, faceConnects))
+
+    def setMembers(self, members):
+        self.members = members
+        self.error = None
+        self.errorReported = False
+        try:
+            loops, _ = regionLoops(self.topology, members)
+        except LoopOrderingError as orderingError:
+            # a deformer can not stop the evaluation, the mesh just stays
+            # unchanged till the membership is fixed
+            self.error = str(orderingError)
+            loops = []
+        self.loops = [loop.vertices for loop in loops]
+        if self.loops:
+            loopVerts = np.concatenate(self.loops)
+            _, neighbours = self.topology.gatherNeighbours(loopVerts)
+            self.neededVerts = np.unique(np.concatenate((loopVerts,
+                                                         neighbours)))
+        else:
+            self.neededVerts = np.zeros(0, dtype=np.intp)
+
+class CirclelizeDeformer(oma.MPxDeformerNode):
+    kNodeName = "circlelizeDeformer"
+    kNodeId = CIRCLELIZE_DEFORMER_ID
+
+    # attributes
+    aSmartRadius = None
+    aRadius = None
+    aDegree = None
+    aSmartMidPoint = None
+    aMidPoint = None
+    aSmartNormal = None
+    aCircleNormal = None
+
+    def __init__(self):
+        oma.MPxDeformerNode.__init__(self)
+        # loop state of every input geometry (multi index)
+        self._states = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def creator():
+        return CirclelizeDeformer()
+
+    @staticmethod
+    def initialize():
+        nAttr = om.MFnNumericAttribute()
+        cls = CirclelizeDeformer
+
+        cls.aSmartRadius = nAttr.create("smartRadius", "sr",
+                                        om.MFnNumericData.kBoolean, True)
+        nAttr.keyable = True
+        cls.aRadius = nAttr.create("radius", "r",
+                                   om.MFnNumericData.kDouble, 1.0)
+        nAttr.keyable = True
+        nAttr.setMin(0.0)
+        cls.aDegree = nAttr.create("degree", "d",
+                                   om.MFnNumericData.kDouble, 360.0)
+        nAttr.keyable = True
+        cls.aSmartMidPoint = nAttr.create("smartMidPoint", "smp",
+                                          om.MFnNumericData.kBoolean, True)
+        nAttr.keyable = True
+        cls.aMidPoint = nAttr.create("midPoint", "m",
+                                     om.MFnNumericData.k3Double)
+        nAttr.keyable = True
+        cls.aSmartNormal = nAttr.create("smartNormal", "sn",
+                                        om.MFnNumericData.kBoolean, True)
+        nAttr.keyable = True
+        cls.aCircleNormal = nAttr.create("circleNormal", "cn",
+                                         om.MFnNumericData.k3Double)
+        nAttr.default = (0.0, 1.0, 0.0)
+        nAttr.keyable = True
+
+        outputGeom = oma.MPxDeformerNode.outputGeom
+        for attribute in (cls.aSmartRadius, cls.aRadius, cls.aDegree,
+                          cls.aSmartMidPoint, cls.aMidPoint,
+                          cls.aSmartNormal, cls.aCircleNormal):
+            cls.addAttribute(attribute)
+            cls.attributeAffects(attribute, outputGeom)
+
+    def schedulingType(self):
+        # every evaluation only works on its own inputs and the node cache
+        return om.MPxNode.kParallel
+
+    def deform(self, dataBlock, geoIterator, matrix, multiIndex):
+        envelope = dataBlock.inputValue(oma.MPxDeformerNode.envelope).asFloat()
+        if envelope == 0.0:
+            return
+
+        # the members and their weights in the order of the iterator
+        members = []
+        weights = []
+        geoIterator.reset()
+        while not geoIterator.isDone():
+            index = geoIterator.index()
+            members.append(index)
+            weights.append(self.weightValue(dataBlock, multiIndex, index))
+            geoIterator.next()
+        if not members:
+            return
+        members = np.array(members, dtype=np.intp)
+
+        inputArray = dataBlock.outputArrayValue(oma.MPxDeformerNode.input)
+        inputArray.jumpToLogicalElement(multiIndex)
+        meshObject = inputArray.outputValue().child(
+            oma.MPxDeformerNode.inputGeom).asMesh()
+        mFnMesh = om.MFnMesh(meshObject)
+
+        state = self._loopState(multiIndex, meshObject, mFnMesh, members)
+        if state.error is not None:
+            self._reportError(state)
+        if not state.loops:
+            return
+
+        points, normals = self._readPoints(mFnMesh, state)
+        fittedVerts, fittedPositions, _ = loopFitting.fitLoops(
+            state.topology, points, normals, state.loops,
+            *self._circleParameters(dataBlock))
+
+        # blend the members towards their circle positions
+        positions = pointArrayToNumpy(geoIterator.allPositions())
+        targets = positions.copy()
+        local = np.full(state.topology.numVertices, -1, dtype=np.intp)
+        local[members] = np.arange(len(members))
+        fittedVerts = np.concatenate(fittedVerts)
+        isMember = local[fittedVerts] != -1
+        targets[local[fittedVerts[isMember]]] = \
+            np.concatenate(fittedPositions)[isMember]
+
+        influence = envelope * np.array(weights)[:, np.newaxis]
+        positions += influence * (targets - positions)
+        geoIterator.setAllPositions(numpyToPointArray(positions))
+
+    def _circleParameters(self, dataBlock):
+        """returns degree, radius, midPoint and circleNormal like the flags
+        of the circlelize command, None for the smart values"""
+
+        degree = dataBlock.inputValue(self.aDegree).asDouble()
+        radius = None
+        if not dataBlock.inputValue(self.aSmartRadius).asBool():
+            radius = dataBlock.inputValue(self.aRadius).asDouble()
+        midPoint = None
+        if not dataBlock.inputValue(self.aSmartMidPoint).asBool():
+            midPoint = np.array(dataBlock.inputValue(
+                self.aMidPoint).asDouble3())
+        circleNormal = None
+        if not dataBlock.inputValue(self.aSmartNormal).asBool():
+            circleNormal = np.array(dataBlock.inputValue(
+                self.aCircleNormal).asDouble3())
+
+        return degree, radius, midPoint, circleNormal
+
+    def _loopState(self, multiIndex, meshObject, mFnMesh, members):
+        """returns the cached loop state of the input geometry and rebuilds
+        the parts which are outdated"""
+
+        counts = (mFnMesh.numVertices, mFnMesh.numEdges, mFnMesh.numPolygons)
+        faceCounts, faceConnects = mFnMesh.getVertices()
+        faceCounts = np.asarray(faceCounts, dtype=np.intp)
+        faceConnects = np.asarray(faceConnects, dtype=np.intp)
+        with self._lock:
+            state = self._states.get(multiIndex)
+            if state is None or not state.matches(counts, faceCounts,
+                                                  faceConnects):
+                state = LoopState(counts, buildTopology(meshObject))
+                self._states[multiIndex] = state
+            if state.members is None or not np.array_equal(state.members,
+                                                           members):
+                state.setMembers(members)
+
+        return state
+
+    def _reportError(self, state):
+        """shows the ordering error of the state once. The evaluation may
+        run on a worker thread, so the warning is deferred to the main
+        thread"""
+
+        with self._lock:
+            if state.errorReported:
+                return
+            state.errorReported = True
+
+        maya.utils.executeDeferred(om.MGlobal.displayWarning,
+                                   "circlelizeDeformer: {0}".format(
+                                       state.error))
+
+    @staticmethod
+    def _readPoints(mFnMesh, state):
+        """reads the positions and normals of the needed vertices. Vertices
+        which are not needed by the fit stay zero"""
+
+        numVertices = state.topology.numVertices
+        if len(state.neededVerts) > BULK_READ_RATIO * numVertices:
+            return (pointArrayToNumpy(mFnMesh.getPoints()),
+                    pointArrayToNumpy(mFnMesh.getVertexNormals(False)))
+
+        points = np.zeros((numVertices, 3))
+        normals = np.zeros((numVertices, 3))
+        for vertex in state.neededVerts.tolist():
+            point = mFnMesh.getPoint(vertex)
+            normal = mFnMesh.getVertexNormal(vertex, False)
+            points[vertex] = (point.x, point.y, point.z)
+            normals[vertex] = (normal.x, normal.y, normal.z)
+
+        return points, normals
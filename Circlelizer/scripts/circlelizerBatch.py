@@ -0,0 +1,544 @@
+"""
+runs circlelize over a manifest of scenes with a pool of mayapy workers.
+Every worker loads the plug-in once and processes whole scenes: it opens the
+scene, circlelizes every item of it with the mesh and component flags, saves
+the scene and streams a result line for every item and scene:
+
+    mayapy circlelizerBatch.py manifest.json --results results.jsonl -w 8
+
+The manifest is a json list (or {"items": [...]}) of items:
+
+    {"id": "rock_hole_1", "scene": "/assets/rock.mb", "mesh": "rockShape",
+     "faces": [10, 11, 12], "parameters": {"fillInterior": true},
+     "output": "/cleaned/rock.mb"}
+
+or a csv file with the columns id, scene, output, mesh, vertices, edges and
+faces (id's separated by spaces). Every other csv column is a circlelize flag
+whose value is read as json if possible. Items without output are only
+processed with --overwrite, otherwise they are recorded as error. A scene is
+saved with every item which succeeded, the failed items are tried again by
+the next run on the saved output, so a stopped batch resumes where it
+stopped. A scene which takes longer than --timeout seconds is stopped by
+killing its worker.
+"""
+
+from __future__ import print_function
+
+import argparse
+import csv
+import io
+import json
+import os
+import subprocess
+import sys
+import threading
+from collections import OrderedDict
+from multiprocessing import cpu_count
+from timeit import default_timer
+
+try:
+    import Queue as queue
+except ImportError:
+    import queue
+
+#+---------------------------------------------------------------------------+
+#|                          Circlelizer Batch Driver                         |
+#|                                                                           |
+#| -> reads the manifest, hands every scene to the next free worker and      |
+#|    appends the streamed results of the workers to the results file        |
+#+---------------------------------------------------------------------------+
+
+PLUGIN_PATH = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), "plug-ins", "Circlelizer.py")
+
+# result lines of the workers start with this prefix, everything else maya
+# prints is passed through
+RESULT_PREFIX = "circlelizerBatch: "
+
+COMPONENT_FLAGS = ("vertices", "edges", "faces")
+
+# columns of a csv manifest which are not a circlelize flag
+CSV_COLUMNS = ("id", "scene", "output", "mesh") + COMPONENT_FLAGS
+
+# file types of maya's save by extension
+SCENE_TYPES = {".ma": "mayaAscii", ".mb": "mayaBinary"}
+
+def _parseValue(text):
+    """reads a csv cell as json value, plain text stays a string"""
+
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+def _normalizeItem(item, index):
+    """returns a copy of a manifest item with all keys set
+
+    Raises:\n
+        ValueError: if the scene, mesh or components are missing
+    """
+    normalized = OrderedDict()
+    normalized["id"] = str(item.get("id", index))
+    for key in ("scene", "mesh"):
+        if not item.get(key):
+            raise ValueError("manifest item {0} has no {1}".format(
+                normalized["id"], key))
+        normalized[key] = item[key]
+    normalized["output"] = item.get("output") or None
+    for flag in COMPONENT_FLAGS:
+        normalized[flag] = [int(componentId)
+                            for componentId in item.get(flag) or []]
+    if not any(normalized[flag] for flag in COMPONENT_FLAGS):
+        raise ValueError("manifest item {0} has no vertices, edges or "
+                         "faces".format(normalized["id"]))
+    normalized["parameters"] = dict(item.get("parameters") or {})
+
+    return normalized
+
+def readManifest(path):
+    """reads a json or csv manifest
+
+    Args:\n
+        path (str): path of the manifest, .csv files are read as csv
+
+    Returns:\n
+        List[OrderedDict]: items with id, scene, output, mesh, vertices,
+            edges, faces and the parameters of circlelize
+    """
+    if os.path.splitext(path)[1].lower() == ".csv":
+        items = []
+        # the csv module of python 2 reads bytes
+        if sys.version_info[0] < 3:
+            manifestFile = open(path, "rb")
+        else:
+            manifestFile = io.open(path, "r", newline="")
+        with manifestFile:
+            for row in csv.DictReader(manifestFile):
+                item = dict((key, row[key]) for key in CSV_COLUMNS
+                            if row.get(key))
+                for flag in COMPONENT_FLAGS:
+                    if flag in item:
+                        item[flag] = item[flag].split()
+                item["parameters"] = dict(
+                    (key, _parseValue(value)) for key, value in row.items()
+                    if key not in CSV_COLUMNS and value not in (None, ""))
+                items.append(item)
+    else:
+        with io.open(path, "r") as manifestFile:
+            items = json.load(manifestFile)
+        if isinstance(items, dict):
+            items = items["items"]
+
+    return [_normalizeItem(item, index) for index, item in enumerate(items)]
+
+def readFinishedItems(path):
+    """returns the id's of the items whose scene was processed and saved by
+    an earlier run. An item only counts if its own record was ok too, the
+    failed items of a partly saved scene are not finished
+
+    Args:\n
+        path (str): path of the results file
+
+    Returns:\n
+        Set[str]: id's of the finished items
+    """
+    finished = set()
+    itemStatus = {}
+    if not os.path.isfile(path):
+        return finished
+
+    with io.open(path, "r") as resultsFile:
+        for line in resultsFile:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # the last line of a stopped run can be incomplete
+                continue
+            # the item records of a scene are written before its scene
+            # record
+            if record.get("type") == "item":
+                itemStatus[record.get("id")] = record.get("status")
+            elif (record.get("type") == "scene" and
+                  record.get("status") in ("ok", "partial")):
+                finished.update(itemId for itemId in record["items"]
+                                if itemStatus.get(itemId) == "ok")
+
+    return finished
+
+def sceneTasks(items, overwrite=False, finished=()):
+    """groups the items by their scene and output, every group is opened
+    and saved once by a worker. Items without output are rejected unless
+    their scene is overwritten, their work could not be saved. A group with
+    finished items opens its saved output, so their work is kept
+
+    Args:\n
+        items (List[OrderedDict]): items of readManifest
+        overwrite (bool): saves the scenes without output in place
+        finished (Set[str]): id's of the items of readFinishedItems
+
+    Returns:\n
+        (List[OrderedDict], List[OrderedDict]): tasks with scene, the file to
+            open, output and the unfinished items and the rejected items
+    """
+    tasks = OrderedDict()
+    rejected = []
+    for item in items:
+        output = item["output"] or (item["scene"] if overwrite else None)
+        if item["id"] in finished:
+            if output is None:
+                continue
+        elif output is None:
+            rejected.append(item)
+            continue
+        key = (item["scene"], output)
+        if key not in tasks:
+            tasks[key] = OrderedDict((("scene", item["scene"]),
+                                      ("open", item["scene"]),
+                                      ("output", output), ("items", [])))
+        if item["id"] not in finished:
+            tasks[key]["items"].append(item)
+        elif os.path.isfile(output):
+            tasks[key]["open"] = output
+
+    return [task for task in tasks.values() if task["items"]], rejected
+
+class ResultWriter(object):
+    """appends the records of all workers to the results file, every line is
+    written at once and flushed"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = io.open(path, "a")
+        self.errors = 0
+
+    def write(self, record):
+        line = json.dumps(record)
+        with self._lock:
+            if record.get("status") != "ok":
+                self.errors += 1
+            self._file.write(u"{0}\n".format(line))
+            self._file.flush()
+            if record.get("type") == "scene":
+                # a finished scene must survive a crash of the driver
+                os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+class WorkerProcess(object):
+    """one mayapy process running runWorker"""
+
+    def __init__(self, mayapy, pluginPath, threads):
+        self.command = [mayapy, os.path.abspath(__file__), "--worker",
+                        "--plugin", pluginPath, "--threads", str(threads)]
+        self.process = None
+
+    def start(self):
+        self.process = subprocess.Popen(self.command, stdin=subprocess.PIPE,
+                                        stdout=subprocess.PIPE,
+                                        universal_newlines=True, bufsize=1)
+
+    def run(self, task, writer, timeout=None):
+        """sends the task to the worker and writes its records till the scene
+        record arrives. A worker which exits before or takes longer than the
+        timeout is started again on the next task
+
+        Args:\n
+            task (OrderedDict): task of sceneTasks
+            writer (ResultWriter): writer of the records
+            timeout (float): seconds after which the worker is killed, no
+                limit if None
+
+        Returns:\n
+            bool: false if the worker exited
+        """
+        if self.process is None or self.process.poll() is not None:
+            self.start()
+
+        # the stdout of the worker can not be read with a timeout, so a hung
+        # worker is killed which ends its stdout
+        timedOut = threading.Event()
+        timer = None
+        if timeout is not None:
+            timer = threading.Timer(timeout, _killProcess,
+                                    (self.process, timedOut))
+            timer.daemon = True
+            timer.start()
+
+        start = default_timer()
+        try:
+            self.process.stdin.write(json.dumps(task) + "\n")
+            self.process.stdin.flush()
+            for line in iter(self.process.stdout.readline, ""):
+                if not line.startswith(RESULT_PREFIX):
+                    sys.stdout.write(line)
+                    continue
+                record = json.loads(line[len(RESULT_PREFIX):])
+                writer.write(record)
+                if record["type"] == "scene":
+                    return True
+        except (IOError, OSError):
+            # the pipe broke because the worker crashed
+            pass
+        finally:
+            if timer is not None:
+                timer.cancel()
+
+        returnCode = self.process.wait()
+        self.process = None
+        if timedOut.is_set():
+            error = "worker timed out after {0}s and was killed".format(
+                timeout)
+        else:
+            error = "worker exited with code {0}".format(returnCode)
+        writer.write(_sceneRecord(task, "error", default_timer() - start,
+                                  error))
+        return False
+
+    def stop(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.stdin.close()
+            self.process.wait()
+        self.process = None
+
+def _killProcess(process, timedOut):
+    timedOut.set()
+    try:
+        process.kill()
+    except OSError:
+        # the process exited in the meantime
+        pass
+
+def _sceneRecord(task, status, seconds, error=None):
+    record = OrderedDict((("type", "scene"), ("scene", task["scene"]),
+                          ("output", task["output"]), ("status", status),
+                          ("seconds", seconds),
+                          ("items", [item["id"] for item in task["items"]])))
+    if error is not None:
+        record["error"] = error
+    return record
+
+def run(manifestPath, resultsPath, workers=None, mayapy=None,
+        pluginPath=PLUGIN_PATH, overwrite=False, timeout=None,
+        verbose=True):
+    """circlelizes every unfinished item of the manifest
+
+    Args:\n
+        manifestPath (str): path of the json or csv manifest
+        resultsPath (str): json lines file the records are appended to, the
+            finished items of it are skipped
+        workers (int): number of mayapy processes, the number of cores if
+            None
+        mayapy (str): python executable of maya, the current interpreter if
+            None
+        pluginPath (str): path of Circlelizer.py
+        overwrite (bool): saves the scenes without output in place
+        timeout (float): seconds a worker may take for one scene before it
+            is killed, no limit if None
+        verbose (bool): prints a line for every finished scene
+
+    Returns:\n
+        (int, int): number of processed scenes and failed records
+    """
+    finished = readFinishedItems(resultsPath)
+    tasks, rejected = sceneTasks(readManifest(manifestPath), overwrite,
+                                 finished)
+    if not tasks and not rejected:
+        return 0, 0
+
+    writer = ResultWriter(resultsPath)
+    # rejected items are recorded as errors, so they are tried again by the
+    # next run
+    for item in rejected:
+        writer.write(OrderedDict((
+            ("type", "item"), ("id", item["id"]), ("scene", item["scene"]),
+            ("mesh", item["mesh"]), ("status", "error"),
+            ("error", "the item has no output, use --overwrite to save "
+                      "its scene in place"))))
+    if not tasks:
+        writer.close()
+        return 0, writer.errors
+
+    workers = max(1, min(workers or cpu_count(), len(tasks)))
+    # the cores are split between the workers instead of every worker
+    # fitting on all of them
+    threads = max(1, cpu_count() // workers)
+    taskQueue = queue.Queue()
+    for task in tasks:
+        taskQueue.put(task)
+
+    printLock = threading.Lock()
+    processed = [0]
+
+    def drive():
+        worker = WorkerProcess(mayapy or sys.executable, pluginPath, threads)
+        try:
+            while True:
+                try:
+                    task = taskQueue.get_nowait()
+                except queue.Empty:
+                    return
+                succeeded = worker.run(task, writer, timeout)
+                with printLock:
+                    processed[0] += 1
+                    if verbose:
+                        print("[{0}/{1}] {2} ({3} items){4}".format(
+                            processed[0], len(tasks), task["scene"],
+                            len(task["items"]),
+                            "" if succeeded else " worker exited"))
+        finally:
+            worker.stop()
+
+    threadPool = [threading.Thread(target=drive) for _ in range(workers)]
+    for thread in threadPool:
+        thread.start()
+    for thread in threadPool:
+        thread.join()
+    writer.close()
+
+    return len(tasks), writer.errors
+
+#+---------------------------------------------------------------------------+
+#|                                   Worker                                  |
+#+---------------------------------------------------------------------------+
+
+def _emit(record):
+    sys.stdout.write(RESULT_PREFIX + json.dumps(record) + "\n")
+    sys.stdout.flush()
+
+def _runItem(cmds, item, threads):
+    flags = dict(item["parameters"])
+    flags.setdefault("threads", threads)
+    flags["mesh"] = item["mesh"]
+    for flag in COMPONENT_FLAGS:
+        if item[flag]:
+            flags[flag] = item[flag]
+    # nothing is undone inside of a batch job
+    flags["noUndo"] = True
+    flags["profile"] = True
+
+    record = OrderedDict((("type", "item"), ("id", item["id"]),
+                          ("scene", item["scene"]), ("mesh", item["mesh"])))
+    start = default_timer()
+    try:
+        profile = json.loads(cmds.circlelize(**flags))
+        record["status"] = "ok"
+    except Exception as error:
+        profile = None
+        record["status"] = "error"
+        record["error"] = str(error).strip()
+    record["seconds"] = default_timer() - start
+    record["profile"] = profile
+
+    return record
+
+def _runTask(cmds, task, threads):
+    start = default_timer()
+    try:
+        cmds.file(task["open"], open=True, force=True)
+    except RuntimeError as error:
+        _emit(_sceneRecord(task, "error", default_timer() - start,
+                           str(error).strip()))
+        return
+
+    failed = 0
+    for item in task["items"]:
+        record = _runItem(cmds, item, threads)
+        if record["status"] != "ok":
+            failed += 1
+        _emit(record)
+
+    # nothing to keep, the next run starts again from the unchanged scene
+    if failed == len(task["items"]):
+        _emit(_sceneRecord(task, "error", default_timer() - start,
+                           "all items failed, the scene was not saved"))
+        return
+
+    try:
+        cmds.file(rename=task["output"])
+        sceneType = SCENE_TYPES.get(
+            os.path.splitext(task["output"])[1].lower())
+        if sceneType is None:
+            cmds.file(save=True, force=True)
+        else:
+            cmds.file(save=True, force=True, type=sceneType)
+    except RuntimeError as error:
+        _emit(_sceneRecord(task, "error", default_timer() - start,
+                           str(error).strip()))
+        return
+
+    # the scene keeps the items which succeeded, the next run tries the
+    # failed ones again on the saved output
+    if failed:
+        _emit(_sceneRecord(task, "partial", default_timer() - start,
+                           "{0} of {1} items failed, the scene was saved "
+                           "without them".format(failed,
+                                                 len(task["items"]))))
+        return
+
+    _emit(_sceneRecord(task, "ok", default_timer() - start))
+
+def runWorker(pluginPath=PLUGIN_PATH, threads=1):
+    """loads the plug-in once and processes the tasks which are sent as json
+    lines on stdin till it is closed"""
+
+    import maya.standalone
+    maya.standalone.initialize(name="python")
+    import maya.cmds as cmds
+
+    cmds.loadPlugin(pluginPath, quiet=True)
+    cmds.undoInfo(state=False)
+
+    # readline instead of iterating, python 2 would wait for a full buffer
+    for line in iter(sys.stdin.readline, ""):
+        if line.strip():
+            _runTask(cmds, json.loads(line), threads)
+
+    maya.standalone.uninitialize()
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(
+        description="circlelizes the items of a manifest with a pool of "
+                    "mayapy workers")
+    parser.add_argument("manifest", nargs="?",
+                        help="json or csv manifest")
+    parser.add_argument("-r", "--results", default="circlelizerResults.jsonl",
+                        help="json lines file the results are appended to, "
+                             "finished items of it are skipped")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="number of mayapy processes (default: cores)")
+    parser.add_argument("--mayapy", default=None,
+                        help="python executable of maya (default: the "
+                             "current one)")
+    parser.add_argument("--plugin", default=PLUGIN_PATH,
+                        help="path of Circlelizer.py")
+    parser.add_argument("--overwrite", action="store_true",
+                        help="saves scenes without output in place")
+    parser.add_argument("-t", "--timeout", type=float, default=None,
+                        help="seconds a scene may take before its worker "
+                             "is killed (default: no limit)")
+    parser.add_argument("--worker", action="store_true",
+                        help=argparse.SUPPRESS)
+    parser.add_argument("--threads", type=int, default=1,
+                        help=argparse.SUPPRESS)
+    arguments = parser.parse_args(arguments)
+
+    if arguments.worker:
+        runWorker(arguments.plugin, arguments.threads)
+        return 0
+    if arguments.manifest is None:
+        parser.error("the manifest is required")
+
+    start = default_timer()
+    scenes, errors = run(arguments.manifest, arguments.results,
+                         arguments.workers, arguments.mayapy,
+                         arguments.plugin, arguments.overwrite,
+                         arguments.timeout)
+    print("{0} scenes in {1:.1f}s, {2} errors, results: {3}".format(
+        scenes, default_timer() - start, errors, arguments.results))
+
+    return 1 if errors else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,621 @@
+"""
+circlelizes the holes of obj files without maya, e.g. of photogrammetry
+scans. The file is memory mapped and parsed chunk by chunk into flat vertex
+and face arrays, the loops are fitted with the same kernel as the circlelize
+command and only the lines of the changed vertices are rewritten, every other
+byte is copied as it is:
+
+    python circlelizerObj.py scan.obj -o scan_closed.obj --maxLoopVertices 500
+
+Without --vertices every closed boundary loop (hole) is circlelized,
+--skipLargest keeps the outer border of an open scan. --vertices takes the
+obj vertex numbers (starting at 1) and is converted into loops like a vertex
+selection of circlelize, a region is reduced to its perimeter and can be
+relaxed with --fillInterior.
+"""
+
+from __future__ import print_function
+
+import argparse
+import io
+import json
+import mmap
+import os
+import sys
+from collections import namedtuple
+from timeit import default_timer
+
+import numpy as np
+
+import interiorFill
+import loopFitting
+from loopOrdering import LoopOrderingError, orderLoops, regionLoops
+from meshTopology import MeshTopology, edgesFromFaces
+
+#+---------------------------------------------------------------------------+
+#|                             Circlelizer OBJ                               |
+#|                                                                           |
+#| -> every chunk is parsed with byte masks and numpy, only the numbers of   |
+#|    the chunk are split into short lived tokens. So the memory of the      |
+#|    parser is bounded by the chunk size and the mesh itself is kept as     |
+#|    flat arrays. Only the faces around the loops become a topology         |
+#+---------------------------------------------------------------------------+
+
+# bytes which are parsed at once, chunks are always ending at a line break
+CHUNK_SIZE = 8 << 20
+
+NEWLINE = 10
+SPACE = 32
+TAB = 9
+SLASH = 47
+
+# lookup table of the whitespace bytes
+WHITESPACE = np.zeros(256, dtype=bool)
+WHITESPACE[[TAB, NEWLINE, 11, 12, 13, SPACE]] = True
+
+# flat arrays of an obj file, the faces are using zero based vertex id's
+ObjMesh = namedtuple("ObjMesh", ["points", "faceCounts", "faceConnects"])
+
+class ObjError(ValueError):
+    """raised if a line of the obj file can not be read"""
+
+def _chunkRanges(objMap, chunkSize):
+    """yields the (start, end) byte ranges of the chunks, every chunk ends
+    behind a line break or at the end of the file"""
+
+    size = len(objMap)
+    start = 0
+    while start < size:
+        end = min(start + chunkSize, size)
+        if end < size:
+            lineEnd = objMap.rfind(b"\n", start, end)
+            if lineEnd == -1:
+                # a single line is longer than the chunk
+                lineEnd = objMap.find(b"\n", end)
+            end = size if lineEnd == -1 else lineEnd + 1
+        yield start, end
+        start = end
+
+def _readChunk(objMap, start, end):
+    """copies a chunk out of the map. A line break is appended, so the last
+    line of the file is terminated like every other one"""
+
+    data = np.empty(end - start + 1, dtype=np.uint8)
+    data[:-1] = np.frombuffer(objMap, dtype=np.uint8, count=end - start,
+                              offset=start)
+    data[-1] = NEWLINE
+    return data
+
+def _lineTypes(data):
+    """finds the vertex and face lines of a chunk
+
+    Args:\n
+        data (np.ndarray): bytes of the chunk which end with a line break
+
+    Returns:\n
+        (np.ndarray, np.ndarray, np.ndarray, np.ndarray): start and line
+            break of every line and the masks of the vertex and face lines
+    """
+    lineEnds = np.flatnonzero(data == NEWLINE)
+    lineStarts = np.empty_like(lineEnds)
+    lineStarts[0] = 0
+    lineStarts[1:] = lineEnds[:-1] + 1
+
+    first = data[lineStarts]
+    second = data[np.minimum(lineStarts + 1, len(data) - 1)]
+    # "vt" and "vn" lines are skipped by the separator after the key
+    hasSeparator = (second == SPACE) | (second == TAB)
+    isVertex = (first == ord("v")) & hasSeparator
+    isFace = (first == ord("f")) & hasSeparator
+
+    return lineStarts, lineEnds, isVertex, isFace
+
+def _selectLines(data, lineStarts, lineEnds, selected):
+    """returns the bytes of the selected lines one after another and the
+    position of their line breaks inside of it. The lines of one type are
+    usually following each other and are sliced without a copy"""
+
+    lines = np.flatnonzero(selected)
+    if len(lines) == 0:
+        return data[:0], lineEnds[:0]
+    if lines[-1] - lines[0] + 1 == len(lines):
+        start = lineStarts[lines[0]]
+        return data[start:lineEnds[lines[-1]] + 1], lineEnds[lines] - start
+
+    lengths = lineEnds - lineStarts + 1
+    text = data[np.repeat(selected, lengths)]
+    return text, np.cumsum(lengths[lines]) - 1
+
+def _tokenStarts(text):
+    """returns the position of every whitespace separated token, the text
+    starts with a separator"""
+
+    isBlank = WHITESPACE[text]
+    return np.flatnonzero(isBlank[:-1] & ~isBlank[1:]) + 1
+
+def _readNumbers(text, dtype, count):
+    """reads the whitespace separated numbers of the text
+
+    Args:\n
+        text (np.ndarray): bytes of the numbers
+        dtype (type): type of the numbers
+        count (int): number of tokens inside of the text
+
+    Returns:\n
+        np.ndarray: the numbers or None if a token is not a number
+    """
+    try:
+        numbers = np.array(text.tobytes().split(), dtype=dtype)
+    except ValueError:
+        return None
+    return numbers if len(numbers) == count else None
+
+def _parseChunk(data, vertexOffset):
+    """parses the vertex and face lines of a chunk
+
+    Args:\n
+        data (np.ndarray): bytes of the chunk which end with a line break
+        vertexOffset (int): number of vertices in front of the chunk
+
+    Returns:\n
+        (np.ndarray, np.ndarray, np.ndarray): (n, 3) points, vertex count of
+            every face and the zero based vertex id's of the faces
+
+    Raises:\n
+        ObjError: if a vertex or face line is invalid
+    """
+    lineStarts, lineEnds, isVertex, isFace = _lineTypes(data)
+    # the keys become separators, then only numbers are left on the lines
+    data[lineStarts[isVertex | isFace]] = SPACE
+
+    text, textEnds = _selectLines(data, lineStarts, lineEnds, isVertex)
+    counts = np.bincount(np.searchsorted(textEnds, _tokenStarts(text)),
+                         minlength=len(textEnds))
+    values = _readNumbers(text, np.float64, counts.sum())
+    if values is None or (counts < 3).any():
+        raise ObjError("invalid vertex line after vertex {0}".format(
+            vertexOffset))
+    if len(counts) and (counts == counts[0]).all():
+        points = values.reshape(-1, counts[0])[:, :3]
+    else:
+        # x, y and z are followed by w or a color on some lines
+        starts = np.cumsum(counts) - counts
+        points = values[starts[:, np.newaxis] + np.arange(3)]
+
+    text, textEnds = _selectLines(data, lineStarts, lineEnds, isFace)
+    tokenStarts = _tokenStarts(text)
+    faceCounts = np.bincount(np.searchsorted(textEnds, tokenStarts),
+                             minlength=len(textEnds))
+    isSlash = text == SLASH
+    if isSlash.any():
+        # "v/vt/vn" is read as separate numbers, the vertex is the number at
+        # the start of its token. An empty vt of "v//vn" is skipped
+        text[isSlash] = SPACE
+        numberStarts = _tokenStarts(text)
+        indices = _readNumbers(text, np.int64, len(numberStarts))
+        if indices is not None:
+            indices = indices[np.searchsorted(numberStarts, tokenStarts)]
+    else:
+        indices = _readNumbers(text, np.int64, len(tokenStarts))
+    if (indices is None or (faceCounts < 3).any() or
+            (indices == 0).any()):
+        raise ObjError("invalid face line after vertex {0}".format(
+            vertexOffset))
+
+    faceConnects = indices - 1
+    isRelative = indices < 0
+    if isRelative.any():
+        # negative indices are relative to the vertices in front of their
+        # line
+        verticesBefore = vertexOffset + np.cumsum(isVertex) - isVertex
+        verticesBefore = np.repeat(verticesBefore[isFace], faceCounts)
+        faceConnects[isRelative] = (verticesBefore[isRelative] +
+                                    indices[isRelative])
+
+    return points, faceCounts, faceConnects
+
+def readObj(path, chunkSize=CHUNK_SIZE):
+    """reads the vertices and faces of an obj file, every object and group
+    of it becomes part of one mesh
+
+    Args:\n
+        path (str): path of the obj file
+        chunkSize (int): bytes which are parsed at once
+
+    Returns:\n
+        ObjMesh: the flat arrays of the file
+
+    Raises:\n
+        ObjError: if a line is invalid or a face uses a missing vertex
+    """
+    pointChunks, countChunks, connectChunks = [], [], []
+    numVertices = 0
+    with io.open(path, "rb") as objFile:
+        if os.fstat(objFile.fileno()).st_size:
+            objMap = mmap.mmap(objFile.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                for start, end in _chunkRanges(objMap, chunkSize):
+                    points, faceCounts, faceConnects = _parseChunk(
+                        _readChunk(objMap, start, end), numVertices)
+                    numVertices += len(points)
+                    pointChunks.append(points)
+                    countChunks.append(faceCounts)
+                    connectChunks.append(faceConnects)
+            finally:
+                objMap.close()
+
+    mesh = ObjMesh(
+        np.concatenate(pointChunks) if pointChunks else np.zeros((0, 3)),
+        np.concatenate(countChunks).astype(np.intp) if countChunks else
+        np.zeros(0, dtype=np.intp),
+        np.concatenate(connectChunks).astype(np.intp) if connectChunks else
+        np.zeros(0, dtype=np.intp))
+    if len(mesh.faceConnects) and (
+            mesh.faceConnects.min() < 0 or
+            mesh.faceConnects.max() >= numVertices):
+        raise ObjError("a face uses a vertex which does not exist")
+
+    return mesh
+
+def _faceOffsets(faceCounts):
+    faceOffsets = np.zeros(len(faceCounts) + 1, dtype=np.intp)
+    np.cumsum(faceCounts, out=faceOffsets[1:])
+    return faceOffsets
+
+def _nextSlots(faceOffsets):
+    """returns for every face vertex the slot of the next one inside its
+    face, the last vertex is connected with the first one"""
+
+    nextSlots = np.arange(faceOffsets[-1], dtype=np.intp) + 1
+    nextSlots[faceOffsets[1:] - 1] = faceOffsets[:-1]
+    return nextSlots
+
+def boundaryEdges(mesh):
+    """finds the edges which have only one face without building the
+    topology of the whole mesh
+
+    Args:\n
+        mesh (ObjMesh): the flat arrays of the file
+
+    Returns:\n
+        np.ndarray: (b, 2) vertex id's of every boundary edge
+    """
+    numVertices = len(mesh.points)
+    first = mesh.faceConnects
+    second = first[_nextSlots(_faceOffsets(mesh.faceCounts))]
+    keys = (np.minimum(first, second).astype(np.int64) * numVertices +
+            np.maximum(first, second))
+    keys, faceCounts = np.unique(keys, return_counts=True)
+    keys = keys[faceCounts == 1]
+
+    return np.column_stack((keys // numVertices,
+                            keys % numVertices)).astype(np.intp)
+
+def boundaryLoops(mesh, maxLoopVertices=None, skipLargest=False):
+    """orders the boundary edges into the closed loops of the holes
+
+    Args:\n
+        mesh (ObjMesh): the flat arrays of the file
+        maxLoopVertices (int): larger loops are skipped, None for every loop
+        skipLargest (bool): skips the largest loop, the outer border of an
+            open scan
+
+    Returns:\n
+        List[np.ndarray]: ordered vertex id's of every hole
+    """
+    edgeVertices = boundaryEdges(mesh)
+    # holes which are touching each other share a vertex with more than two
+    # boundary edges, they can not be ordered and are skipped
+    vertices, degree = np.unique(edgeVertices, return_counts=True)
+    branching = vertices[degree > 2]
+    isSimple = ~np.isin(edgeVertices, branching).any(axis=1)
+
+    loops = [loop.vertices for loop in
+             orderLoops(edgeVertices, np.flatnonzero(isSimple))
+             if loop.closed]
+    if skipLargest and loops:
+        del loops[int(np.argmax([len(loop) for loop in loops]))]
+    if maxLoopVertices is not None:
+        loops = [loop for loop in loops if len(loop) <= maxLoopVertices]
+
+    return loops
+
+class LocalMesh(object):
+    """topology, points and normals of the faces around some vertices with
+    compact vertex id's. The neighbours of every given vertex are complete,
+    which is everything the fit and the fill are looking at
+
+    Attributes:\n
+        vertices (np.ndarray): mesh vertex id of every local vertex
+        topology (MeshTopology): neighbourhood index of the local faces
+        points (np.ndarray): (n, 3) positions of the local vertices
+        normals (np.ndarray): (n, 3) area weighted normals of the local
+            vertices
+    """
+
+    def __init__(self, mesh, vertices):
+        """
+        Args:\n
+            mesh (ObjMesh): the flat arrays of the file
+            vertices (Sequence[int]): mesh vertex id's which need their
+                neighbours
+        """
+        faceOffsets = _faceOffsets(mesh.faceCounts)
+        vertexMask = np.zeros(len(mesh.points), dtype=bool)
+        vertexMask[np.asarray(vertices, dtype=np.intp)] = True
+        faceMask = np.zeros(len(mesh.faceCounts), dtype=bool)
+        if len(mesh.faceCounts):
+            faceMask = np.logical_or.reduceat(vertexMask[mesh.faceConnects],
+                                              faceOffsets[:-1])
+
+        faceCounts = mesh.faceCounts[faceMask]
+        faceConnects = mesh.faceConnects[np.repeat(faceMask,
+                                                   mesh.faceCounts)]
+        self.vertices, faceConnects = np.unique(faceConnects,
+                                                return_inverse=True)
+        faceConnects = faceConnects.ravel()
+        numVertices = len(self.vertices)
+
+        self.topology = MeshTopology(numVertices, faceCounts, faceConnects,
+                                     edgesFromFaces(numVertices, faceCounts,
+                                                    faceConnects))
+        self.points = mesh.points[self.vertices]
+
+        # newell normal of every face scaled by its area, summed up on its
+        # vertices
+        corners = self.points[faceConnects]
+        following = corners[_nextSlots(self.topology.faceOffsets)]
+        faceNormals = np.add.reduceat(np.cross(corners, following),
+                                      self.topology.faceOffsets[:-1],
+                                      axis=0) if len(faceCounts) else \
+            np.zeros((0, 3))
+        self.normals = np.zeros((numVertices, 3))
+        cornerNormals = np.repeat(faceNormals, faceCounts, axis=0)
+        for axis in range(3):
+            self.normals[:, axis] = np.bincount(
+                faceConnects, weights=cornerNormals[:, axis],
+                minlength=numVertices)
+
+    def localIds(self, vertices):
+        """returns the local id's of mesh vertex id's"""
+
+        return np.searchsorted(self.vertices,
+                               np.asarray(vertices, dtype=np.intp))
+
+def fitLocalLoops(localMesh, loops, degree=360, radius=None, midPoint=None,
+                  circleNormal=None, interior=None):
+    """fits the circles of local loops and relaxes the interior vertices
+
+    Args:\n
+        localMesh (LocalMesh): the faces around the loops
+        loops (List[np.ndarray]): ordered local vertex id's of every loop
+        degree (float): degree of the circle sections default (360)
+        radius (float): radius of every circle, None for the average radius
+        midPoint (np.ndarray): center of every circle, None for the average
+        circleNormal (np.ndarray): normal of every circle, None for the
+            newell normal
+        interior (np.ndarray): local vertex id's which are relaxed with the
+            circles as fixed border or None
+
+    Returns:\n
+        (np.ndarray, np.ndarray): mesh vertex id's and their (n, 3) new
+            positions
+    """
+    fittedVerts, fittedPositions, _ = loopFitting.fitLoops(
+        localMesh.topology, localMesh.points, localMesh.normals, loops,
+        degree, radius, midPoint, circleNormal)
+    if not fittedVerts:
+        return np.zeros(0, dtype=np.intp), np.zeros((0, 3))
+
+    vertices = np.concatenate(fittedVerts)
+    positions = np.concatenate(fittedPositions)
+    if interior is not None:
+        interior = np.setdiff1d(interior, vertices)
+    if interior is not None and len(interior):
+        fillPoints = localMesh.points.copy()
+        fillPoints[vertices] = positions
+        positions = np.concatenate((positions, interiorFill.harmonicFill(
+            localMesh.topology, fillPoints, interior)))
+        vertices = np.concatenate((vertices, interior))
+
+    return localMesh.vertices[vertices], positions
+
+def _vertexLine(line, position):
+    """formats a vertex line with a new position, a w or color behind the
+    position is kept"""
+
+    extra = line.split()[4:]
+    text = "v {0} {1} {2}".format(*[repr(float(value))
+                                    for value in position]).encode("ascii")
+    return b" ".join([text] + extra)
+
+def writeObj(sourcePath, outputPath, vertices, positions,
+             chunkSize=CHUNK_SIZE):
+    """copies the obj file and rewrites the lines of the given vertices
+
+    Args:\n
+        sourcePath (str): path of the read obj file
+        outputPath (str): path of the written obj file
+        vertices (np.ndarray): changed vertex id's
+        positions (np.ndarray): (n, 3) new positions of the vertices
+        chunkSize (int): bytes which are copied at once
+
+    Returns:\n
+        None
+    """
+    order = np.argsort(vertices, kind="mergesort")
+    vertices = np.asarray(vertices, dtype=np.intp)[order]
+    positions = np.asarray(positions, dtype=np.float64)[order]
+
+    with io.open(sourcePath, "rb") as sourceFile, \
+            io.open(outputPath, "wb") as outputFile:
+        if not os.fstat(sourceFile.fileno()).st_size:
+            return
+
+        objMap = mmap.mmap(sourceFile.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            vertexOffset = 0
+            nextChange = 0
+            for start, end in _chunkRanges(objMap, chunkSize):
+                lineStarts, lineEnds, isVertex, _ = _lineTypes(
+                    _readChunk(objMap, start, end))
+                vertexLines = np.flatnonzero(isVertex)
+                lastChange = np.searchsorted(
+                    vertices, vertexOffset + len(vertexLines))
+
+                cursor = start
+                for index in range(nextChange, lastChange):
+                    line = vertexLines[vertices[index] - vertexOffset]
+                    lineStart = start + int(lineStarts[line])
+                    lineEnd = min(start + int(lineEnds[line]), end)
+                    text = objMap[lineStart:lineEnd]
+                    # the line break (and a windows \r) is copied as it is
+                    if text.endswith(b"\r"):
+                        lineEnd -= 1
+                    outputFile.write(objMap[cursor:lineStart])
+                    outputFile.write(_vertexLine(text, positions[index]))
+                    cursor = lineEnd
+                outputFile.write(objMap[cursor:end])
+
+                nextChange = lastChange
+                vertexOffset += len(vertexLines)
+        finally:
+            objMap.close()
+
+def circlelizeObj(sourcePath, outputPath, vertices=None,
+                  maxLoopVertices=None, skipLargest=False, degree=360,
+                  radius=None, midPoint=None, circleNormal=None,
+                  fillInterior=False, chunkSize=CHUNK_SIZE):
+    """circlelizes the holes or the given vertices of an obj file
+
+    Args:\n
+        sourcePath (str): path of the read obj file
+        outputPath (str): path of the written obj file
+        vertices (Sequence[int]): zero based vertex id's which are
+            circlelized like a vertex selection, None for every hole
+        maxLoopVertices (int): holes with more vertices are skipped
+        skipLargest (bool): skips the largest hole
+        degree (float): degree of the circle sections default (360)
+        radius (float): radius of every circle, None for the average radius
+        midPoint (Sequence[float]): center of every circle, None for the
+            average
+        circleNormal (Sequence[float]): normal of every circle, None for the
+            newell normal
+        fillInterior (bool): relaxes the vertices inside of a region
+        chunkSize (int): bytes which are parsed and copied at once
+
+    Returns:\n
+        dict: seconds of every stage and the processed counts
+
+    Raises:\n
+        ObjError: if the file can not be read or the vertices do not exist
+        LoopOrderingError: if the given vertices are branching
+    """
+    profile = {"seconds": {}}
+
+    def stage(name, start):
+        profile["seconds"][name] = default_timer() - start
+        return default_timer()
+
+    start = default_timer()
+    mesh = readObj(sourcePath, chunkSize)
+    start = stage("read", start)
+
+    interior = None
+    if vertices is None:
+        loops = boundaryLoops(mesh, maxLoopVertices, skipLargest)
+        localMesh = LocalMesh(mesh, np.concatenate(loops) if loops else [])
+        loops = [localMesh.localIds(loop) for loop in loops]
+    else:
+        vertices = np.unique(np.asarray(vertices, dtype=np.intp))
+        if len(vertices) and (vertices[0] < 0 or
+                              vertices[-1] >= len(mesh.points)):
+            raise ObjError("the vertices are out of range (1 - {0})".format(
+                len(mesh.points)))
+        localMesh = LocalMesh(mesh, vertices)
+        localVertices = localMesh.localIds(vertices)
+        try:
+            orderedLoops, isRegion = regionLoops(localMesh.topology,
+                                                 localVertices)
+        except LoopOrderingError as error:
+            # report the obj vertex numbers instead of the local id's
+            raise LoopOrderingError(
+                "the vertices are branching or not manifold",
+                (localMesh.vertices[error.vertices] + 1).tolist())
+        loops = [loop.vertices for loop in orderedLoops]
+        if fillInterior and isRegion:
+            interior = localVertices
+    start = stage("loops", start)
+
+    changedVerts, positions = fitLocalLoops(localMesh, loops, degree, radius,
+                                            midPoint, circleNormal, interior)
+    start = stage("fit", start)
+
+    writeObj(sourcePath, outputPath, changedVerts, positions, chunkSize)
+    stage("write", start)
+
+    profile.update(vertices=len(mesh.points), faces=len(mesh.faceCounts),
+                   loops=len(loops), changedVertices=len(changedVerts))
+    return profile
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(
+        description="circlelizes the holes of an obj file without maya")
+    parser.add_argument("obj", help="obj file which is read")
+    parser.add_argument("-o", "--output", required=True,
+                        help="obj file which is written")
+    parser.add_argument("-v", "--vertices", type=int, nargs="+",
+                        help="obj vertex numbers (starting at 1) which are "
+                             "circlelized instead of the holes")
+    parser.add_argument("--maxLoopVertices", type=int, default=None,
+                        help="skips holes with more vertices")
+    parser.add_argument("--skipLargest", action="store_true",
+                        help="skips the largest hole, e.g. the border of an "
+                             "open scan")
+    parser.add_argument("-r", "--radius", type=float, default=None,
+                        help="radius of every circle")
+    parser.add_argument("-d", "--degree", type=float, default=360,
+                        help="degree of the circle sections")
+    parser.add_argument("-m", "--midPoint", type=float, nargs=3,
+                        help="center of every circle")
+    parser.add_argument("-cn", "--circleNormal", type=float, nargs=3,
+                        help="normal of every circle")
+    parser.add_argument("-fi", "--fillInterior", action="store_true",
+                        help="relaxes the vertices inside of a region of "
+                             "--vertices")
+    parser.add_argument("--chunkSize", type=int, default=CHUNK_SIZE >> 20,
+                        help="megabytes which are parsed at once (default: "
+                             "%(default)s)")
+    parser.add_argument("--profile", action="store_true",
+                        help="prints the seconds of every stage as json")
+    arguments = parser.parse_args(arguments)
+
+    if os.path.abspath(arguments.obj) == os.path.abspath(arguments.output):
+        parser.error("the output has to be another file than the obj")
+
+    vertices = None
+    if arguments.vertices:
+        vertices = np.asarray(arguments.vertices, dtype=np.intp) - 1
+
+    try:
+        profile = circlelizeObj(
+            arguments.obj, arguments.output, vertices,
+            arguments.maxLoopVertices, arguments.skipLargest,
+            arguments.degree, arguments.radius, arguments.midPoint,
+            arguments.circleNormal, arguments.fillInterior,
+            max(arguments.chunkSize, 1) << 20)
+    except (ObjError, LoopOrderingError) as error:
+        print("error: {0}".format(error), file=sys.stderr)
+        return 1
+
+    if arguments.profile:
+        print(json.dumps(profile, sort_keys=True))
+    else:
+        print("{0} loops, {1} of {2} vertices changed in {3:.2f}s: {4}".format(
+            profile["loops"], profile["changedVertices"], profile["vertices"],
+            sum(profile["seconds"].values()), arguments.output))
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+import io
+import os
+
+#+---------------------------------------------------------------------------+
+#|                           Circlelizer Resources                           |
+#|                                                                           |
+#| -> qt, the style sheet, the icons and the documents are only loaded when  |
+#|    a window or dialog is created and then kept for every later one. So   |
+#|    the plug-in loads without qt and without the module environment, e.g. |
+#|    in a mayapy -batch job which never opens a window                      |
+#+---------------------------------------------------------------------------+
+
+# the folder which contains the plug-ins, scripts, themes, docs and icons
+CIRCLELIZER_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_cache = {}
+
+def loadQt():
+    """imports pyside2 which is used in 2017 and above or pyside for 2016
+    and below
+
+    Returns:\n
+        (module, module, module, bool): QtCore, QtGui, QtWidgets and whether
+            pyside2 is used
+    """
+    if "qt" not in _cache:
+        try:
+            import PySide2.QtCore as qc
+            import PySide2.QtGui as qg
+            import PySide2.QtWidgets as qw
+            isVersion2017 = True
+        except ImportError:
+            import PySide.QtCore as qc
+            import PySide.QtGui as qg
+            # importing twice because under pyside2 a new submodule
+            # was named QWidgets
+            import PySide.QtGui as qw
+            isVersion2017 = False
+        _cache["qt"] = (qc, qg, qw, isVersion2017)
+
+    return _cache["qt"]
+
+def _environmentPath(name, folder):
+    """returns the path of the environment variable which is defined by the
+    circlelizer.mod file or the folder next to the scripts if the variable
+    is missing"""
+
+    return os.environ.get(name) or os.path.join(CIRCLELIZER_PATH, folder)
+
+def _readFile(name, path):
+    """reads a latin-1 encoded file once. The documents are decoded
+    explicitly instead of relying on the locale and a missing file becomes
+    an empty string, so a window still opens without its style or text"""
+
+    if name not in _cache:
+        try:
+            with io.open(path, "r", encoding="latin-1") as resourceFile:
+                _cache[name] = resourceFile.read()
+        except (IOError, OSError):
+            _cache[name] = u""
+
+    return _cache[name]
+
+def resourcesPath():
+    """resolves the icon folder from the XBMLANGPATH
+
+    Returns:\n
+        str: path of the icons which ends with a separator
+    """
+    if "resources" not in _cache:
+        resourcesPath = None
+        if "XBMLANGPATH" in os.environ:
+            import maya.api.OpenMaya as om
+
+            fileObject = om.MFileObject()
+            fileObject.resolveMethod = om.MFileObject.kExact
+            fileObject.setRawPath(os.environ["XBMLANGPATH"])
+            fileObject.setRawName("header.png")
+            resourcesPath = fileObject.resolvedPath()
+        _cache["resources"] = resourcesPath or os.path.join(CIRCLELIZER_PATH,
+                                                            "icons", "")
+
+    return _cache["resources"]
+
+def styleSheet():
+    """returns the default theme"""
+
+    return _readFile("styleSheet", os.path.join(
+        _environmentPath("CIRCLELIZER_THEMES_PATH", "themes"),
+        "default-theme.qss"))
+
+def aboutHTML():
+    """returns the about page"""
+
+    return _readFile("aboutHTML", os.path.join(
+        _environmentPath("CIRCLELIZER_DOCS_PATH", "docs"), "about.html"))
+
+def helpHTML():
+    """returns the help page"""
+
+    return _readFile("helpHTML", os.path.join(
+        _environmentPath("CIRCLELIZER_DOCS_PATH", "docs"), "help.html"))
@@ -0,0 +1,512 @@
+# B4rtware
+# 2016 - 2020
+# Circlelizer
+
+# the interface is imported by the circlelizerInterface command when it is
+# invoked, so the plug-in itself loads without qt
+import maya.cmds as cmds
+import numpy as np
+
+# used for independent argument assignments
+from functools import partial
+
+from QMessageDialog import getQMessageDialog
+from QMessageDialog import MESSAGE_ERROR
+from QSlideInput import QSlideInput as QSlideInput
+from circlelizerResources import loadQt, resourcesPath, styleSheet
+from circlelizerResources import aboutHTML, helpHTML
+
+qc, qg, qw, isVersion2017 = loadQt()
+
+#+-----------------------------------------------------------------------------+
+#|                           QMessageDialog String                             |
+#+-----------------------------------------------------------------------------+
+
+MESSAGE_ERROR_ZERO_RADIUS = "The radius can not be zero!"
+MESSAGE_ERROR_NEGATIVE_RADIUS = "The radius can not be negative!"
+
+# +----------------------------------------------------------------------------+
+# |             Graphical User Interface QTDialog (info/about) Qt Class        |
+# +----------------------------------------------------------------------------+
+class CirclelizerInfoInterfaceClass(qw.QDialog):
+    TEXT_AREA_HEIGHT = 400
+    TEXT_AREA_WIDTH = 400
+
+    def __init__(self, stylelize):
+        qw.QDialog.__init__(self)
+        
+        self.setWindowIcon(qg.QIcon(resourcesPath() + "help.png"))
+        self.setWindowTitle("Circlelizer Help")
+        if stylelize: self.setStyleSheet(styleSheet())
+        self.setWindowFlags(qc.Qt.WindowStaysOnTopHint)
+        self.initMainWidget()
+
+    def initMainWidget(self):
+        self.mainLayout = qw.QVBoxLayout()
+        self.tabWidget = qw.QTabWidget()
+        self.tabWidget.addTab(self.initTabHelp(),
+                            qg.QIcon(resourcesPath() + "help.png"),
+                            "Help")
+        self.tabWidget.addTab(self.initTabAbout(),
+                            qg.QIcon(resourcesPath() + "about.png"),
+                            "About")
+        
+        self.mainLayout.addWidget(self.tabWidget)
+
+        self.setLayout(self.mainLayout)
+
+    def initTabHelp(self):
+        self.tabHelp = qw.QWidget()
+        self.tabHelp.setObjectName("tab-help")
+
+        layout = qw.QVBoxLayout()
+
+        self.te_help = qw.QTextBrowser()
+        self.te_help.setReadOnly(True)
+        self.te_help.setHtml(helpHTML())
+        self.te_help.setFixedSize(self.TEXT_AREA_HEIGHT, self.TEXT_AREA_WIDTH)
+        layout.addWidget(self.te_help)
+
+        self.tabHelp.setLayout(layout)
+
+        return self.tabHelp
+
+    def initTabAbout(self):
+        self.tabAbout = qw.QWidget()
+        self.tabAbout.setObjectName("tab-about")
+
+        layout = qw.QHBoxLayout()
+
+        self.te_about = qw.QTextBrowser()
+        self.te_about.setReadOnly(True)
+        self.te_about.setHtml(aboutHTML())
+        self.te_about.setMaximumSize(self.TEXT_AREA_HEIGHT,
+                                     self.TEXT_AREA_WIDTH)
+        layout.addWidget(self.te_about)
+
+        self.tabAbout.setLayout(layout)
+
+        return self.tabAbout
+
+#+-----------------------------------------------------------------------------+
+#|                      Graphical User Interface QT Class                      |
+#+-----------------------------------------------------------------------------+
+
+class CirclelizerInterfaceClass(qw.QWidget):
+    # Widgets Variables
+    WIDGET_HEIGHT = 20
+    SI_WIDTH = 50
+    SI_NORMAL_XYZ_WIDTH = 25
+    SI_MIDPOINT_XYZ_WIDTH = 50
+
+    B_NORMAL_WIDTH = 25
+
+    def __init__(self, slideInput, stylelize, logo, previewSession, version):
+        qw.QWidget.__init__(self)
+        self.infoDialog = CirclelizerInfoInterfaceClass(stylelize)
+
+        self.input = QSlideInput if slideInput else partial(qw.QLineEdit, "0.0")
+
+        self.setWindowIcon(qg.QIcon(resourcesPath() + "icon.png"))
+        self.setWindowTitle("Circlelizer {0}".format(version))
+        self.setObjectName("body")
+        self.setWindowFlags(qc.Qt.WindowStaysOnTopHint)
+        if stylelize: self.setStyleSheet(styleSheet())
+
+        self.previewSession = previewSession
+
+        self.initMainWidget(logo)
+        self.initPreview()
+
+    def initMainWidget(self, logo):
+        layout = qw.QGridLayout()
+
+        # Header Label
+        if logo:
+            self.l_header = qw.QLabel()
+            self.l_header.setPixmap(qg.QPixmap(resourcesPath() + "header_70.png"))
+            self.l_header.setAlignment(qc.Qt.AlignCenter)
+            layout.addWidget(self.l_header, 0, 0)
+
+        # Help Button
+        icoHelp = qg.QIcon(resourcesPath() + "help.png")
+        self.b_help = qw.QPushButton()
+        self.b_help.setObjectName("b_help")
+        self.b_help.setIcon(icoHelp)
+        self.b_help.setFixedSize(self.WIDGET_HEIGHT, self.WIDGET_HEIGHT)
+        self.b_help.setIconSize(qc.QSize(self.WIDGET_HEIGHT,self.WIDGET_HEIGHT))
+        self.b_help.setLayoutDirection(qc.Qt.RightToLeft)
+        self.b_help.clicked.connect(self.On_HelpButton_Pressed)
+        layout.addWidget(self.b_help, 0, 0, qc.Qt.AlignTop)
+
+        # Tab Widgets
+        self.t_basic = qw.QTabWidget()
+        self.initTabBasic()
+        layout.addWidget(self.t_basic, 1, 0)
+
+        self.t_advanced = qw.QTabWidget()
+        self.initTabAdvanced()
+        layout.addWidget(self.t_advanced, 2, 0)
+
+        # Circlelize Button
+        self.b_circlize = qw.QPushButton("Circlelize")
+        self.b_circlize.setFixedHeight(self.WIDGET_HEIGHT)
+        self.b_circlize.clicked.connect(self.On_CirclizeButton_Pressed)
+        layout.addWidget(self.b_circlize, 3, 0)
+
+        self.setLayout(layout)
+
+    def initTabBasic(self):
+        self.tabBasic = qw.QWidget()
+        self.tabBasic.setObjectName("tab-basic")
+        self.t_basic.addTab(self.tabBasic,
+                            qg.QIcon(resourcesPath() + "tool.png"),
+                            "Basic")
+        # Widgets
+        layout = qw.QGridLayout()
+        # 0 0 Radius Checkbox
+        self.cb_radius = qw.QCheckBox("Smart Radius")
+        self.cb_radius.setFixedHeight(self.WIDGET_HEIGHT)
+        self.cb_radius.setChecked(True)
+        self.cb_radius.stateChanged.connect(
+            lambda value:
+            self.On_SmartCheckBox_StateChanged(value,[self.si_radius,
+                                                      self.l_radius]))
+        layout.addWidget(self.cb_radius, 0, 0)
+
+        # 1 0 MidPoint CheckBox
+        self.cb_midPoint = qw.QCheckBox("Smart MidPoint")
+        self.cb_midPoint.setFixedHeight(self.WIDGET_HEIGHT)
+        self.cb_midPoint.setChecked(True)
+        self.cb_midPoint.stateChanged.connect(
+            lambda value:
+            self.On_SmartCheckBox_StateChanged(value, [self.si_midPointX,
+                                                       self.si_midPointY,
+                                                       self.si_midPointZ,
+                                                       self.l_midPoint]))
+        layout.addWidget(self.cb_midPoint, 1, 0)
+
+        # 0 1 Normal Checkbox
+        self.cb_normal = qw.QCheckBox("Smart Normal")
+        self.cb_normal.setFixedHeight(self.WIDGET_HEIGHT)
+        self.cb_normal.setChecked(True)
+        self.cb_normal.stateChanged.connect(
+            lambda value:
+            self.On_SmartCheckBox_StateChanged(value, [self.si_normalX,
+                                                       self.si_normalY,
+                                                       self.si_normalZ,
+                                                       self.b_normalX,
+                                                       self.b_normalY,
+                                                       self.b_normalZ,
+                                                       self.l_normal]))
+        layout.addWidget(self.cb_normal, 0, 1)
+
+        # 1 1 Project on Mesh
+        self.cb_projectOnMesh = qw.QCheckBox("project on mesh")
+        self.cb_projectOnMesh.setFixedHeight(self.WIDGET_HEIGHT)
+        self.cb_projectOnMesh.setChecked(False)
+        layout.addWidget(self.cb_projectOnMesh, 1, 1)
+
+        # 2 0 Fill Interior
+        self.cb_fillInterior = qw.QCheckBox("fill interior")
+        self.cb_fillInterior.setFixedHeight(self.WIDGET_HEIGHT)
+        self.cb_fillInterior.setChecked(False)
+        layout.addWidget(self.cb_fillInterior, 2, 0)
+
+        # 2 1 Preview
+        self.cb_preview = qw.QCheckBox("preview")
+        self.cb_preview.setFixedHeight(self.WIDGET_HEIGHT)
+        self.cb_preview.setChecked(False)
+        self.cb_preview.setToolTip("shows the circle while the values are "\
+                                   "changed,\nCirclelize applies it")
+        layout.addWidget(self.cb_preview, 2, 1)
+
+        self.tabBasic.setLayout(layout)
+
+    def initTabAdvanced(self):
+        self.tabAdvanced = qw.QWidget()
+        self.tabAdvanced.setObjectName("tab-advanced")
+        self.t_advanced.addTab(self.tabAdvanced,
+                               qg.QIcon(resourcesPath() + "advanced.png"),
+                               "Advanced")
+
+        # Widgets
+        layout = qw.QGridLayout()
+
+        # +--------+
+        # | Radius |
+        # +--------+
+
+        # 0 1 Radius Label
+        self.l_radius = qw.QLabel("Radius: ")
+        self.l_radius.setFixedHeight(self.WIDGET_HEIGHT)
+        layout.addWidget(self.l_radius, 0, 0)
+
+        # 0 2 Radius SlideInput
+        self.si_radius = self.input()
+        self.si_radius.setFixedSize(self.SI_WIDTH, self.WIDGET_HEIGHT)
+        layout.addWidget(self.si_radius, 0, 1)
+
+        # +--------+
+        # | Degree |
+        # +--------+
+
+        self.l_degree = qw.QLabel("Degree:")
+        self.l_degree.setFixedHeight(self.WIDGET_HEIGHT)
+        self.l_degree.setFixedWidth(45)
+        layout.addWidget(self.l_degree, 0, 2)
+
+        self.si_degree = self.input()
+        self.si_degree.setText("360.0")
+        self.si_degree.setFixedSize(self.SI_WIDTH, self.WIDGET_HEIGHT)
+        self.si_degree.setToolTip("does not 100% works with my calculations you"\
+                                  "\nhave to manual adjust "\
+                                  "the rotation and scale.")
+        layout.addWidget(self.si_degree, 0, 3)
+
+        # +----------+
+        # | MidPoint |
+        # +----------+
+
+        # 2 1 MidPoint Label
+        self.l_midPoint = qw.QLabel("MidPoint: ")
+        self.l_midPoint.setFixedHeight(self.WIDGET_HEIGHT)
+        layout.addWidget(self.l_midPoint, 1, 0)
+
+        # 2 2 MidPoint SlideInput X
+        self.si_midPointX = self.input()
+        self.si_midPointX.setFixedWidth(self.SI_MIDPOINT_XYZ_WIDTH)
+        self.si_midPointX.setFixedHeight(self.WIDGET_HEIGHT)
+        layout.addWidget(self.si_midPointX, 1, 1)
+
+        # 2 3 MidPoint SlideInput Y
+        self.si_midPointY = self.input()
+        self.si_midPointY.setFixedWidth(self.SI_MIDPOINT_XYZ_WIDTH)
+        self.si_midPointY.setFixedHeight(self.WIDGET_HEIGHT)
+        layout.addWidget(self.si_midPointY, 1, 2)
+
+        # 2 4 MidPoint SlideInput Z
+        self.si_midPointZ = self.input()
+        self.si_midPointZ.setFixedWidth(self.SI_MIDPOINT_XYZ_WIDTH)
+        self.si_midPointZ.setFixedHeight(self.WIDGET_HEIGHT)
+        layout.addWidget(self.si_midPointZ, 1, 3)
+
+        # +--------+
+        # | Normal |
+        # +--------+
+
+        # 2 0 Normal Label
+        self.l_normal = qw.QLabel("Circle Normal:")
+        self.l_normal.setFixedHeight(self.WIDGET_HEIGHT)
+        layout.addWidget(self.l_normal, 2, 0)
+
+        # 2 1 Child Normal X HBoxLayout
+        # -----------------------------
+        childNormalXLayout = qw.QHBoxLayout()
+
+        # 0 0 Normal SlideInput X
+        self.si_normalX = self.input()
+        self.si_normalX.setFixedWidth(self.SI_NORMAL_XYZ_WIDTH)
+        self.si_normalX.setFixedHeight(self.WIDGET_HEIGHT)
+        childNormalXLayout.addWidget(self.si_normalX)
+
+        # 0 1 Normal Button X 
+        self.b_normalX = qw.QPushButton("X")
+        self.b_normalX.setFixedWidth(self.B_NORMAL_WIDTH)
+        self.b_normalX.setFixedHeight(self.WIDGET_HEIGHT)
+        self.b_normalX.setObjectName("xyz")
+        self.b_normalX.pressed.connect(lambda:self.On_AxisButton_Pressed("X"))
+        childNormalXLayout.addWidget(self.b_normalX)
+
+        layout.addItem(childNormalXLayout, 2, 1)
+
+        # 2 2 Child Normal Y HBoxLayout
+        # -----------------------------
+        childNormalYLayout = qw.QHBoxLayout()
+
+        # 0 0 Normal SlideInput Y
+        self.si_normalY = self.input()
+        self.si_normalY.setFixedWidth(self.SI_NORMAL_XYZ_WIDTH)
+        self.si_normalY.setFixedHeight(self.WIDGET_HEIGHT)
+        childNormalYLayout.addWidget(self.si_normalY)
+
+        # 0 1 Normal Button Y
+        self.b_normalY = qw.QPushButton("Y")
+        self.b_normalY.setFixedWidth(self.B_NORMAL_WIDTH)
+        self.b_normalY.setFixedHeight(self.WIDGET_HEIGHT)
+        self.b_normalY.setObjectName("xyz")
+        self.b_normalY.pressed.connect(lambda:self.On_AxisButton_Pressed("Y"))
+        childNormalYLayout.addWidget(self.b_normalY)
+
+        layout.addItem(childNormalYLayout, 2, 2)
+
+        # 2 3 Child Normal Z HBoxLayout
+        # -----------------------------
+        childNormalZLayout = qw.QHBoxLayout()
+
+        # 0 0 Normal SlideInput Z
+        self.si_normalZ = self.input()
+        self.si_normalZ.setFixedWidth(self.SI_NORMAL_XYZ_WIDTH)
+        self.si_normalZ.setFixedHeight(self.WIDGET_HEIGHT)
+        childNormalZLayout.addWidget(self.si_normalZ)
+
+        # 0 1 Normal Button Z
+        self.b_normalZ = qw.QPushButton("Z")
+        self.b_normalZ.setFixedWidth(self.B_NORMAL_WIDTH)
+        self.b_normalZ.setFixedHeight(self.WIDGET_HEIGHT)
+        self.b_normalZ.pressed.connect(lambda:self.On_AxisButton_Pressed("Z"))
+        childNormalZLayout.addWidget(self.b_normalZ)
+
+        layout.addItem(childNormalZLayout, 2, 3)
+
+        # Call events
+        self.cb_radius.stateChanged.emit(2)
+        self.cb_midPoint.stateChanged.emit(2)
+        self.cb_normal.stateChanged.emit(2)
+
+        self.tabAdvanced.setLayout(layout)
+
+    def initPreview(self):
+        self.cb_preview.stateChanged.connect(self.On_PreviewCheckBox_StateChanged)
+
+        # every value change only updates the circles of the running session
+        for instance in (self.si_radius, self.si_degree, self.si_midPointX,
+                         self.si_midPointY, self.si_midPointZ,
+                         self.si_normalX, self.si_normalY, self.si_normalZ):
+            if isinstance(instance, QSlideInput):
+                instance.valueChangedEvent.connect(self.On_PreviewValue_Changed)
+            instance.editingFinished.connect(self.On_PreviewValue_Changed)
+
+        for instance in (self.cb_radius, self.cb_midPoint, self.cb_normal):
+            instance.stateChanged.connect(self.On_PreviewValue_Changed)
+
+    def closeEvent(self, event):
+        self.previewSession.cancel()
+        qw.QWidget.closeEvent(self, event)
+
+    def circleParameters(self, showErrors=True):
+        """reads the circle parameters from the widgets
+
+        Args:\n
+            showErrors (bool): whether invalid values open an error message
+
+        Returns:\n
+            Dict[str, object]: the short flags of the circlelize command with
+                their values or None if a value is invalid
+        """
+        parameters = {}
+        try:
+            if not self.cb_radius.isChecked():
+                radius = float(self.si_radius.text())
+
+                if radius <= 0:
+                    if showErrors:
+                        error = getQMessageDialog()(
+                            MESSAGE_ERROR, MESSAGE_ERROR_ZERO_RADIUS
+                            if radius == 0 else MESSAGE_ERROR_NEGATIVE_RADIUS)
+                        error.exec_()
+                    return None
+
+                parameters["r"] = radius
+
+            if not self.cb_midPoint.isChecked():
+                parameters["m"] = (float(self.si_midPointX.text()),
+                                   float(self.si_midPointY.text()),
+                                   float(self.si_midPointZ.text()))
+
+            if not self.cb_normal.isChecked():
+                parameters["cn"] = (float(self.si_normalX.text()),
+                                    float(self.si_normalY.text()),
+                                    float(self.si_normalZ.text()))
+
+            parameters["d"] = float(self.si_degree.text())
+        except ValueError:
+            # the text of an input is not a number (yet)
+            return None
+
+        return parameters
+
+    def On_PreviewCheckBox_StateChanged(self, value):
+        if value == 2:
+            if self.previewSession.start():
+                self.On_PreviewValue_Changed()
+            else:
+                self.cb_preview.setChecked(False)
+        elif value == 0:
+            self.previewSession.cancel()
+
+    def On_PreviewValue_Changed(self, *args):
+        if not self.previewSession.active:
+            return
+
+        parameters = self.circleParameters(showErrors=False)
+        if parameters is None:
+            return
+
+        midPoint = parameters.get("m")
+        circleNormal = parameters.get("cn")
+        self.previewSession.update(
+            parameters.get("r"), parameters["d"],
+            None if midPoint is None else np.array(midPoint),
+            None if circleNormal is None else np.array(circleNormal))
+
+    def On_SmartCheckBox_StateChanged(self, value, instances):
+        if value == 2:
+            for instance in instances:
+                instance.setDisabled(1)
+        elif value == 0:
+            for instance in instances:
+                instance.setDisabled(0)
+
+    def On_HelpButton_Pressed(self):
+        self.infoDialog.show()
+
+    def On_AxisButton_Pressed(self, axis):
+        if axis == "X":
+            self.si_normalX.setText("1.0")
+            self.si_normalY.setText("0.0")
+            self.si_normalZ.setText("0.0")
+        elif axis == "Y":
+            self.si_normalX.setText("0.0")
+            self.si_normalY.setText("1.0")
+            self.si_normalZ.setText("0.0")
+        elif axis == "Z":
+            self.si_normalX.setText("0.0")
+            self.si_normalY.setText("0.0")
+            self.si_normalZ.setText("1.0")
+
+        self.On_PreviewValue_Changed()
+
+    def On_CirclizeButton_Pressed(self):
+        partialCirclelize = None
+
+        if isVersion2017:
+            partialCirclelize = partial(cmds.circlelize)
+        else:
+            # this version of python does not fully support partial.keywords
+            # if its empty it returns None
+            # so we use a little trick here: initialize the function 
+            # with a dummy variable
+            partialCirclelize = partial(cmds.circlelize, dummy = None)
+
+        parameters = self.circleParameters()
+        if parameters is None:
+            return
+        partialCirclelize.keywords.update(parameters)
+
+        projectOnMesh = self.cb_projectOnMesh.isChecked()
+        partialCirclelize.keywords["p"] = projectOnMesh
+
+        fillInterior = self.cb_fillInterior.isChecked()
+        partialCirclelize.keywords["fi"] = fillInterior
+
+        if not isVersion2017:
+            # remove our dummy arg
+            partialCirclelize.keywords.pop("dummy")
+
+        # a running preview is applied as one undo step
+        if self.previewSession.active:
+            self.previewSession.accept(partialCirclelize)
+            self.cb_preview.setChecked(False)
+        else:
+            partialCirclelize()
@@ -0,0 +1,64 @@
+import json
+from collections import OrderedDict
+from contextlib import contextmanager
+from timeit import default_timer
+
+#+---------------------------------------------------------------------------+
+#|                              Command Profile                              |
+#|                                                                           |
+#| -> collects the time of every stage of a command and the number of        |
+#|    processed elements. The result is a json string which is returned by   |
+#|    the command, so it can be sent with a bug report and parsed by scripts |
+#+---------------------------------------------------------------------------+
+
+class CommandProfile(object):
+    """timings and counts of one command call. A disabled profile does not
+    measure anything
+
+    Attributes:\n
+        enabled (bool): false if nothing is measured
+        timings (OrderedDict[str, float]): seconds of every stage in the
+            order the stages were entered first
+        counts (OrderedDict[str, int]): number of processed elements
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.timings = OrderedDict()
+        self.counts = OrderedDict()
+        self._start = default_timer()
+
+    @contextmanager
+    def stage(self, name):
+        """measures the code inside of the with block. A stage which is
+        entered several times sums up its timings"""
+
+        if not self.enabled:
+            yield
+            return
+
+        start = default_timer()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + \
+                default_timer() - start
+
+    def count(self, name, value=1):
+        """adds the value onto the count with the given name"""
+
+        if self.enabled:
+            self.counts[name] = self.counts.get(name, 0) + int(value)
+
+    def asDict(self):
+        """returns the timings, counts and the total seconds since the
+        profile was created"""
+
+        return OrderedDict((("total", default_timer() - self._start),
+                            ("timings", self.timings),
+                            ("counts", self.counts)))
+
+    def asString(self):
+        """returns the profile as json string"""
+
+        return json.dumps(self.asDict())
@@ -0,0 +1,204 @@
+import numpy as np
+
+#+---------------------------------------------------------------------------+
+#|                              Interior Fill                                |
+#|                                                                           |
+#| -> relaxes the vertices inside of a circlelized region as harmonic fill.  |
+#|    Every interior vertex becomes the average of its neighbours, the       |
+#|    circle is the fixed boundary. The linear system is stored as sparse    |
+#|    CSR matrix and solved at once with a preconditioned conjugate gradient |
+#|    instead of averaging the vertices again and again. It does not depend  |
+#|    on maya and can be used standalone                                     |
+#+---------------------------------------------------------------------------+
+
+# relative residual at which the solver stops
+SOLVER_TOLERANCE = 1e-8
+
+# upper limit of solver iterations
+MAX_ITERATIONS = 2000
+
+class SparseMatrix(object):
+    """square sparse matrix in compressed sparse row (CSR) format
+
+    Attributes:\n
+        offsets (np.ndarray): (n + 1) start of every row
+        indices (np.ndarray): column of every entry
+        values (np.ndarray): value of every entry
+    """
+
+    def __init__(self, offsets, indices, values):
+        self.offsets = np.asarray(offsets, dtype=np.intp)
+        self.indices = np.asarray(indices, dtype=np.intp)
+        self.values = np.asarray(values, dtype=np.float64)
+
+    @property
+    def size(self):
+        return len(self.offsets) - 1
+
+    def diagonal(self):
+        """returns the (n,) diagonal entries of the matrix"""
+
+        rows = np.repeat(np.arange(self.size), np.diff(self.offsets))
+        isDiagonal = rows == self.indices
+        diagonal = np.zeros(self.size)
+        diagonal[rows[isDiagonal]] = self.values[isDiagonal]
+        return diagonal
+
+    def dot(self, vectors):
+        """multiplies the matrix with (n,) or (n, k) vectors. Every row needs
+        at least one entry"""
+
+        products = self.values.reshape((-1,) + (1,) * (vectors.ndim - 1)) * \
+            vectors[self.indices]
+        return np.add.reduceat(products, self.offsets[:-1], axis=0)
+
+def conjugateGradient(matrix, rhs, initial=None, tolerance=SOLVER_TOLERANCE,
+                      maxIterations=MAX_ITERATIONS):
+    """solves matrix * x = rhs for a symmetric positive definite matrix with
+    the jacobi preconditioned conjugate gradient method. Every column of a
+    (n, k) rhs is solved independently in the same iterations
+
+    Args:\n
+        matrix (SparseMatrix): symmetric positive definite matrix
+        rhs (np.ndarray): (n,) or (n, k) right hand side
+        initial (np.ndarray): start solution, zeros if None
+        tolerance (float): relative residual at which the solver stops
+        maxIterations (int): upper limit of iterations
+
+    Returns:\n
+        (np.ndarray, int): the solution and the number of iterations
+    """
+    rhs = np.asarray(rhs, dtype=np.float64)
+    solution = np.zeros_like(rhs) if initial is None else \
+        np.array(initial, dtype=np.float64)
+    inverseDiagonal = 1.0 / matrix.diagonal()
+    if rhs.ndim > 1:
+        inverseDiagonal = inverseDiagonal[:, np.newaxis]
+
+    residual = rhs - matrix.dot(solution)
+    preconditioned = inverseDiagonal * residual
+    direction = preconditioned.copy()
+    rho = np.sum(residual * preconditioned, axis=0)
+    limit = tolerance * np.maximum(np.linalg.norm(rhs, axis=0), 1e-300)
+
+    iteration = 0
+    while iteration < maxIterations:
+        if np.all(np.linalg.norm(residual, axis=0) <= limit):
+            break
+        product = matrix.dot(direction)
+        curvature = np.sum(direction * product, axis=0)
+        # converged columns are not changed anymore
+        alpha = np.where(curvature > 0.0, rho / np.where(curvature > 0.0,
+                                                        curvature, 1.0), 0.0)
+        solution += alpha * direction
+        residual -= alpha * product
+        preconditioned = inverseDiagonal * residual
+        nextRho = np.sum(residual * preconditioned, axis=0)
+        beta = np.where(rho > 0.0, nextRho / np.where(rho > 0.0, rho, 1.0),
+                        0.0)
+        direction = preconditioned + beta * direction
+        rho = nextRho
+        iteration += 1
+
+    return solution, iteration
+
+def anchoredVertices(topology, interior):
+    """returns the interior vertices which are connected to at least one
+    fixed vertex through other interior vertices. Parts without a fixed
+    vertex have no unique solution
+
+    Args:\n
+        topology (MeshTopology): neighbourhood index of the mesh
+        interior (np.ndarray): vertex ids which are moved
+
+    Returns:\n
+        np.ndarray: bool mask of the anchored interior vertices
+    """
+    isInterior = topology.mask(interior)
+    rows, neighbours = topology.gatherNeighbours(interior)
+
+    anchored = np.zeros(len(interior), dtype=bool)
+    anchored[np.unique(rows[~isInterior[neighbours]])] = True
+    # the anchor grows ring by ring through the interior
+    local = np.full(topology.numVertices, -1, dtype=np.intp)
+    local[interior] = np.arange(len(interior))
+    inside = isInterior[neighbours]
+    rows = rows[inside]
+    neighbours = local[neighbours[inside]]
+    while True:
+        grown = anchored.copy()
+        grown[rows[anchored[neighbours]]] = True
+        if (grown == anchored).all():
+            return anchored
+        anchored = grown
+
+def laplacianSystem(topology, points, interior):
+    """builds the uniform graph laplacian of the interior vertices. The
+    fixed neighbours are moved onto the right hand side
+
+    Args:\n
+        topology (MeshTopology): neighbourhood index of the mesh
+        points (np.ndarray): (n, 3) positions of all mesh vertices, the
+            fixed vertices at their final positions
+        interior (np.ndarray): vertex ids which are moved
+
+    Returns:\n
+        (SparseMatrix, np.ndarray): (m, m) laplacian and (m, 3) right hand
+            side
+    """
+    local = np.full(topology.numVertices, -1, dtype=np.intp)
+    local[interior] = np.arange(len(interior))
+    rows, neighbours = topology.gatherNeighbours(interior)
+    degrees = np.bincount(rows, minlength=len(interior)).astype(np.float64)
+
+    isFixed = local[neighbours] == -1
+    rhs = np.empty((len(interior), 3))
+    for axis in range(3):
+        rhs[:, axis] = np.bincount(rows[isFixed],
+                                   weights=points[neighbours[isFixed], axis],
+                                   minlength=len(interior))
+
+    # diagonal degree and -1 for every interior neighbour, sorted by row
+    matrixRows = np.concatenate((np.arange(len(interior)), rows[~isFixed]))
+    matrixColumns = np.concatenate((np.arange(len(interior)),
+                                    local[neighbours[~isFixed]]))
+    matrixValues = np.concatenate((degrees,
+                                   -np.ones(np.count_nonzero(~isFixed))))
+    order = np.argsort(matrixRows, kind="mergesort")
+    offsets = np.zeros(len(interior) + 1, dtype=np.intp)
+    np.cumsum(np.bincount(matrixRows, minlength=len(interior)),
+              out=offsets[1:])
+
+    return (SparseMatrix(offsets, matrixColumns[order], matrixValues[order]),
+            rhs)
+
+def harmonicFill(topology, points, interior, tolerance=SOLVER_TOLERANCE,
+                 maxIterations=MAX_ITERATIONS):
+    """calculates the relaxed positions of the interior vertices. Every other
+    vertex stays fixed at its position
+
+    Args:\n
+        topology (MeshTopology): neighbourhood index of the mesh
+        points (np.ndarray): (n, 3) positions of all mesh vertices, the
+            fixed vertices at their final positions
+        interior (np.ndarray): vertex ids which are moved
+        tolerance (float): relative residual at which the solver stops
+        maxIterations (int): upper limit of solver iterations
+
+    Returns:\n
+        np.ndarray: (m, 3) new positions of the interior vertices
+    """
+    interior = np.asarray(interior, dtype=np.intp)
+    positions = np.array(points[interior], dtype=np.float64)
+    anchored = anchoredVertices(topology, interior)
+    if not anchored.any():
+        return positions
+
+    # parts without a fixed neighbour stay where they are and are treated
+    # like fixed vertices
+    solvable = interior[anchored]
+    matrix, rhs = laplacianSystem(topology, points, solvable)
+    positions[anchored], _ = conjugateGradient(matrix, rhs, points[solvable],
+                                               tolerance, maxIterations)
+
+    return positions
@@ -0,0 +1,234 @@
+import numpy as np
+
+import circleKernel
+
+#+---------------------------------------------------------------------------+
+#|                           Batched Loop Fitting                            |
+#|                                                                           |
+#| -> fits circles onto many loops of one mesh in a single vectorized pass.  |
+#|    All loops are packed into one ragged array (offsets + flat vertex      |
+#|    ids) so the cost scales with the number of vertices and not with the   |
+#|    number of loops. It does not depend on maya and can be used standalone |
+#+---------------------------------------------------------------------------+
+
+def packLoops(loops):
+    """packs a list of vertex id arrays into one ragged array
+
+    Args:\n
+        loops (List[np.ndarray]): vertex id's of every loop
+
+    Returns:\n
+        (np.ndarray, np.ndarray): flat vertex id's and (k + 1) offsets
+    """
+    offsets = np.zeros(len(loops) + 1, dtype=np.intp)
+    np.cumsum([len(loop) for loop in loops], out=offsets[1:])
+    if len(loops) == 0:
+        return np.zeros(0, dtype=np.intp), offsets
+
+    return np.concatenate(loops).astype(np.intp), offsets
+
+def unpackLoops(flatValues, offsets):
+    """splits a flat array back into a list with one array per loop"""
+
+    return np.split(flatValues, offsets[1:-1])
+
+def batchedGuidePoints(topology, points, flatVerts, offsets, midPoints):
+    """calculates for every ordered vertex the average of its outer
+    neighbours, the same way Circlelizer._calculateTransforms does it for a
+    single loop. Neighbours which are part of the loop or closer to the
+    midPoint than their loop vertex (inner vertices) are ignored
+
+    Args:\n
+        topology (MeshTopology): neighbourhood index of the mesh
+        points (np.ndarray): (n, 3) positions of all mesh vertices
+        flatVerts (np.ndarray): flat vertex id's of all ordered loops
+        offsets (np.ndarray): (k + 1) start of every loop
+        midPoints (np.ndarray): (k, 3) rotation center of every loop
+
+    Returns:\n
+        np.ndarray: (n, 3) flat guide points relative to their midPoint
+    """
+    segments = circleKernel.segmentIds(offsets)
+    numVertices = topology.numVertices
+
+    # every (loop, vertex) pair gets a unique key, so a vertex can be part of
+    # one loop and the neighbour of another one
+    orderedKeys = segments * numVertices + flatVerts
+    rows, neighbours = topology.gatherNeighbours(flatVerts)
+    neighbourLoops = segments[rows]
+    neighbourKeys = neighbourLoops * numVertices + neighbours
+    isOrdered = np.isin(neighbourKeys, orderedKeys)
+
+    # inner vertices are closer to the midPoint than their ordered vertex
+    neighbourDistance = np.linalg.norm(
+        points[neighbours] - midPoints[neighbourLoops], axis=1)
+    vertexDistance = np.linalg.norm(
+        points[flatVerts[rows]] - midPoints[neighbourLoops], axis=1)
+    innerKeys = np.unique(
+        neighbourKeys[~isOrdered & (neighbourDistance <= vertexDistance)])
+
+    isOuter = ~(isOrdered | np.isin(neighbourKeys, innerKeys))
+    rows = rows[isOuter]
+    neighbours = neighbours[isOuter]
+
+    count = np.bincount(rows, minlength=len(flatVerts))
+    guidePoints = np.empty((len(flatVerts), 3))
+    for axis in range(3):
+        guidePoints[:, axis] = np.bincount(rows,
+                                           weights=points[neighbours, axis],
+                                           minlength=len(flatVerts))
+    hasNeighbours = count > 0
+    guidePoints[hasNeighbours] /= count[hasNeighbours, np.newaxis]
+    # a true border vertex without outer neighbours guides itself
+    guidePoints[~hasNeighbours] = points[flatVerts[~hasNeighbours]]
+
+    return guidePoints - midPoints[segments]
+
+class PreparedLoops(object):
+    """everything of a group of loops which does not depend on the circle
+    parameters. It is calculated once and every new radius, degree, midPoint
+    or normal only needs placeLoops afterwards
+
+    Attributes:\n
+        flatVerts (np.ndarray): flat vertex id's of all loops in their
+            original order
+        offsets (np.ndarray): (k + 1) start of every loop
+        flatPoints (np.ndarray): (n, 3) flat positions of all loops
+        guidePoints (np.ndarray): (n, 3) flat guide points relative to the
+            midPoint of their loop
+        midPoints (np.ndarray): (k, 3) average midPoint of every loop
+        radii (np.ndarray): (k,) average radius of every loop
+        normals (np.ndarray): (k, 3) newell normal of every loop
+        isClockwise (np.ndarray): (k,) winding of every loop along its normal
+    """
+
+    def __init__(self, flatVerts, offsets, flatPoints, guidePoints, midPoints,
+                 radii, normals, isClockwise):
+        self.flatVerts = flatVerts
+        self.offsets = offsets
+        self.flatPoints = flatPoints
+        self.guidePoints = guidePoints
+        self.midPoints = midPoints
+        self.radii = radii
+        self.normals = normals
+        self.isClockwise = isClockwise
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+def prepareLoops(topology, points, normals, loops):
+    """calculates the statistics and guide points of every loop
+
+    Args:\n
+        topology (MeshTopology): neighbourhood index of the mesh
+        points (np.ndarray): (n, 3) positions of all mesh vertices
+        normals (np.ndarray): (n, 3) normals of all mesh vertices which
+            decide the facing side of the circles or None
+        loops (List[np.ndarray]): ordered vertex id's of every loop
+
+    Returns:\n
+        PreparedLoops: the cached state of the loops
+    """
+    flatVerts, offsets = packLoops(loops)
+    flatPoints = points[flatVerts]
+
+    referenceNormals = None
+    if normals is not None and len(loops):
+        referenceNormals = circleKernel.segmentMean(normals[flatVerts],
+                                                    offsets)
+
+    # midPoints, radii, normals and the winding in one pass over the loops
+    midPoints, radii, loopNormals, isClockwise = \
+        circleKernel.batchedLoopStatistics(flatPoints, offsets, None,
+                                           referenceNormals)
+
+    # the guide point of a vertex does not depend on the direction of its
+    # loop, so the guides can be reversed together with the vertices later
+    guidePoints = batchedGuidePoints(topology, points, flatVerts, offsets,
+                                     midPoints)
+
+    return PreparedLoops(flatVerts, offsets, flatPoints, guidePoints,
+                         midPoints, radii, loopNormals, isClockwise)
+
+def placeLoops(prepared, degree=360, radius=None, midPoint=None,
+               circleNormal=None):
+    """calculates the circles of prepared loops for the given parameters
+
+    Args:\n
+        prepared (PreparedLoops): the cached state of the loops
+        degree (float): degree of the circle sections default (360)
+        radius (float): radius of every circle, None for the average radius
+            of every loop
+        midPoint (np.ndarray): center of every circle, None for the average
+            midPoint of every loop
+        circleNormal (np.ndarray): normal of every circle, None for the
+            newell normal of every loop
+
+    Returns:\n
+        (List[np.ndarray], List[np.ndarray], np.ndarray): the ordered vertex
+            id's of every loop in the order of its circle, the new (n, 3)
+            positions of every loop and the (k, 3) normal of every circle
+    """
+    numLoops = len(prepared)
+    if numLoops == 0:
+        return [], [], np.zeros((0, 3))
+
+    offsets = prepared.offsets
+    segments = circleKernel.segmentIds(offsets)
+    loopNormals = prepared.normals
+    isClockwise = prepared.isClockwise
+    if circleNormal is not None:
+        loopNormals = np.tile(np.asarray(circleNormal, dtype=np.float64),
+                              (numLoops, 1))
+        isClockwise = circleKernel.batchedLoopStatistics(
+            prepared.flatPoints, offsets, loopNormals)[3]
+    radii = prepared.radii
+    if radius is not None:
+        radii = np.full(numLoops, float(radius))
+    targets = prepared.midPoints
+    if midPoint is not None:
+        targets = np.tile(np.asarray(midPoint, dtype=np.float64),
+                          (numLoops, 1))
+
+    # reverse every loop in clockwise order because then the calculated
+    # circle points maps to the correct position
+    order = circleKernel.segmentReversed(offsets, isClockwise)
+    flatVerts = prepared.flatVerts[order]
+
+    positions = circleKernel.batchedCalculateTransforms(
+        prepared.guidePoints[order], offsets, degree, radii, loopNormals)
+    # because we rotated always at the origin we need to move the vertices
+    # to the correct position via midPoint
+    positions += targets[segments]
+
+    return (unpackLoops(flatVerts, offsets), unpackLoops(positions, offsets),
+            loopNormals)
+
+def fitLoops(topology, points, normals, loops, degree=360, radius=None,
+             midPoint=None, circleNormal=None):
+    """fits a circle onto every loop in one vectorized pass
+
+    Args:\n
+        topology (MeshTopology): neighbourhood index of the mesh
+        points (np.ndarray): (n, 3) positions of all mesh vertices
+        normals (np.ndarray): (n, 3) normals of all mesh vertices which
+            decide the facing side of the circles or None
+        loops (List[np.ndarray]): ordered vertex id's of every loop
+        degree (float): degree of the circle sections default (360)
+        radius (float): radius of every circle, None for the average radius
+            of every loop
+        midPoint (np.ndarray): center of every circle, None for the average
+            midPoint of every loop
+        circleNormal (np.ndarray): normal of every circle, None for the
+            newell normal of every loop
+
+    Returns:\n
+        (List[np.ndarray], List[np.ndarray], np.ndarray): the ordered vertex
+            id's of every loop in the order of its circle, the new (n, 3)
+            positions of every loop and the (k, 3) normal of every circle
+    """
+    if len(loops) == 0:
+        return [], [], np.zeros((0, 3))
+
+    return placeLoops(prepareLoops(topology, points, normals, loops), degree,
+                      radius, midPoint, circleNormal)
@@ -0,0 +1,150 @@
+from collections import namedtuple
+
+import numpy as np
+
+#+---------------------------------------------------------------------------+
+#|                              Loop Ordering                                |
+#|                                                                           |
+#| -> orders a selection of edges into continues rows of vertices. The       |
+#|    vertex to edge map is built once and every chain is walked in O(n).    |
+#|    It does not depend on maya and can be used standalone                  |
+#+---------------------------------------------------------------------------+
+
+# a continues row of vertices, closed is true if the last vertex is
+# connected with the first one
+OrderedLoop = namedtuple("OrderedLoop", ["vertices", "closed"])
+
+class LoopOrderingError(ValueError):
+    """raised if the selected edges can not be ordered into simple loops
+
+    Attributes:\n
+        vertices (List[int]): vertex id's which are causing the error
+    """
+
+    def __init__(self, message, vertices=()):
+        if vertices:
+            message = "{0} (vertices: {1})".format(
+                message, ", ".join(str(vertex) for vertex in vertices))
+        ValueError.__init__(self, message)
+        self.vertices = list(vertices)
+
+def orderLoops(edgeVertices, selectedEdges):
+    """orders the selected edges into continues rows of vertices. Open chains
+    start at one of their end vertices, closed loops at their smallest vertex
+    id
+
+    Args:\n
+        edgeVertices (np.ndarray): (e, 2) vertex id's of every mesh edge
+        selectedEdges (Iterable[int]): edge id's of the selected edges
+
+    Returns:\n
+        List[OrderedLoop]: every connected chain of the selection with its
+            vertex id's as compact integer array
+
+    Raises:\n
+        LoopOrderingError: if a vertex has more than two selected edges
+            (branching or non manifold selection)
+    """
+    selectedEdges = np.unique(np.fromiter(selectedEdges, dtype=np.intp))
+    if len(selectedEdges) == 0:
+        return []
+
+    # map the vertices of the selected edges onto a compact range
+    pairs = np.asarray(edgeVertices, dtype=np.intp)[selectedEdges]
+    vertices, compact = np.unique(pairs.ravel(), return_inverse=True)
+    compact = compact.reshape(-1, 2)
+
+    sources = np.concatenate((compact[:, 0], compact[:, 1]))
+    targets = np.concatenate((compact[:, 1], compact[:, 0]))
+    degree = np.bincount(sources, minlength=len(vertices))
+    if (degree > 2).any():
+        raise LoopOrderingError("the selection is branching or not manifold",
+                                vertices[degree > 2].tolist())
+
+    # vertex -> selected neighbour map with two slots, -1 marks an end
+    order = np.argsort(sources, kind="mergesort")
+    sources = sources[order]
+    slots = np.arange(len(sources)) - np.searchsorted(sources, sources)
+    neighbours = np.full((len(vertices), 2), -1, dtype=np.intp)
+    neighbours[sources, slots] = targets[order]
+
+    firstNeighbours = neighbours[:, 0].tolist()
+    secondNeighbours = neighbours[:, 1].tolist()
+    visited = bytearray(len(vertices))
+    # open chains have to start at an end vertex, everything which is left
+    # afterwards is a closed loop
+    starts = np.flatnonzero(degree == 1).tolist() + list(range(len(vertices)))
+
+    loops = []
+    for start in starts:
+        if visited[start]:
+            continue
+
+        chain = [start]
+        visited[start] = 1
+        current = start
+        while True:
+            nextVert = firstNeighbours[current]
+            if nextVert == -1 or visited[nextVert]:
+                nextVert = secondNeighbours[current]
+                if nextVert == -1 or visited[nextVert]:
+                    break
+            visited[nextVert] = 1
+            chain.append(nextVert)
+            current = nextVert
+
+        loops.append(OrderedLoop(vertices[chain], bool(degree[start] == 2)))
+
+    return loops
+
+def regionEdges(topology, vertices, faceMask=None):
+    """converts a vertex selection into the edges of its loops. A selection
+    which forms a region (a vertex with more than two selected neighbours) is
+    reduced to the perimeter of its faces, every other selection to its
+    contained edges. The real border edges of the mesh between selected
+    vertices are always part of the loops
+
+    Args:\n
+        topology (MeshTopology): neighbourhood index of the mesh
+        vertices (Sequence[int]): selected vertex id's
+        faceMask (np.ndarray): bool mask of the selected faces of a face
+            selection, None to use the faces the vertices contain
+
+    Returns:\n
+        (np.ndarray, bool): edge id's of the loops and true if the selection
+            is a region
+    """
+    vertices = np.asarray(vertices, dtype=np.intp)
+    mask = topology.mask(vertices)
+    edgeVertices = topology.edgeVertices
+    realBorderEdges = np.flatnonzero(topology.boundaryEdges &
+                                     mask[edgeVertices[:, 0]] &
+                                     mask[edgeVertices[:, 1]])
+
+    isRegion = bool((topology.countNeighboursIn(vertices, mask) > 2).any())
+    if isRegion:
+        if faceMask is None:
+            faceMask = topology.containedFaces(mask)
+        edges = topology.perimeterEdges(faceMask)
+    else:
+        edges = topology.containedEdges(mask)
+
+    return np.union1d(realBorderEdges, edges), isRegion
+
+def regionLoops(topology, vertices):
+    """orders a vertex selection into loops the same way the circlelize
+    command does, see regionEdges
+
+    Args:\n
+        topology (MeshTopology): neighbourhood index of the mesh
+        vertices (Sequence[int]): selected vertex id's
+
+    Returns:\n
+        (List[OrderedLoop], bool): the ordered loops and true if the
+            selection is a region
+
+    Raises:\n
+        LoopOrderingError: if the loops are branching
+    """
+    edges, isRegion = regionEdges(topology, vertices)
+    return orderLoops(topology.edgeVertices, edges), isRegion
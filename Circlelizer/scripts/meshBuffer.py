@@ -0,0 +1,65 @@
+import maya.api.OpenMaya as om
+import numpy as np
+
+from apiHelper import pointArrayToNumpy, numpyToPointArray
+
+#+---------------------------------------------------------------------------+
+#|                            Mesh Point Buffer                              |
+#|                                                                           |
+#| -> reads all points (and normals) of a mesh at once into a numpy array,   |
+#|    collects the changes and writes them back with a single setPoints      |
+#+---------------------------------------------------------------------------+
+
+class MeshPointBuffer(object):
+    """bulk access to the points of a mesh
+
+    The points are read with one MFnMesh.getPoints call. Changes are scattered
+    into the buffer and applied with one MFnMesh.setPoints call on commit."""
+
+    def __init__(self, mDagPath, space=om.MSpace.kObject):
+        self.mDagPath = mDagPath
+        self.space = space
+        self.mFnMesh = om.MFnMesh(mDagPath)
+        self.points = pointArrayToNumpy(self.mFnMesh.getPoints(space))
+        self._normals = None
+        # point array of the last commit, updated in place by later commits
+        self._pointArray = None
+
+    def normals(self):
+        """returns the (n, 3) vertex normals of the mesh. They are only read
+        once from the mesh on the first call"""
+
+        if self._normals is None:
+            self._normals = pointArrayToNumpy(
+                self.mFnMesh.getVertexNormals(False, self.space))
+
+        return self._normals
+
+    def gather(self, vertices):
+        """returns a copy of the (n, 3) positions of the given vertex ids"""
+
+        return self.points[np.asarray(vertices, dtype=np.intp)]
+
+    def scatter(self, vertices, positions):
+        """writes the (n, 3) positions of the given vertex ids into the buffer.
+        The mesh is not changed till commit is called"""
+
+        self.points[np.asarray(vertices, dtype=np.intp)] = positions
+
+    def commit(self, vertices=None):
+        """writes the whole buffer back onto the mesh
+
+        Args:\n
+            vertices (Sequence[int]): if given only these vertices were
+                changed since the last commit, so only their entries of the
+                point array are updated before the single write
+        """
+        if vertices is None or self._pointArray is None:
+            self._pointArray = numpyToPointArray(self.points)
+        else:
+            vertices = np.asarray(vertices, dtype=np.intp)
+            for vertex, position in zip(vertices.tolist(),
+                                        self.points[vertices].tolist()):
+                self._pointArray[vertex] = om.MPoint(*position)
+
+        self.mFnMesh.setPoints(self._pointArray, self.space)
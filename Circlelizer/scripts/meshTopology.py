@@ -0,0 +1,263 @@
+import numpy as np
+
+#+---------------------------------------------------------------------------+
+#|                              Mesh Topology                                |
+#|                                                                           |
+#| -> compressed sparse row (CSR) index of the vertex neighbourhood of a     |
+#|    mesh. It is built once from the flat face and edge arrays of a mesh    |
+#|    and answers every neighbourhood query with array lookups. It does not  |
+#|    depend on maya and can be used standalone                              |
+#+---------------------------------------------------------------------------+
+
+def _buildCSR(sources, targets, count):
+    """groups the targets by their source into a CSR structure
+
+    Args:\n
+        sources (np.ndarray): source id of every entry
+        targets (np.ndarray): target id of every entry
+        count (int): number of sources
+
+    Returns:\n
+        (np.ndarray, np.ndarray): offsets (count + 1) and the targets sorted
+            by their source
+    """
+    order = np.argsort(sources, kind="mergesort")
+    offsets = np.zeros(count + 1, dtype=np.intp)
+    np.cumsum(np.bincount(sources, minlength=count), out=offsets[1:])
+
+    return offsets, np.ascontiguousarray(targets[order], dtype=np.intp)
+
+def segmentIds(offsets):
+    """returns for every entry of a CSR structure the id of its segment"""
+
+    return np.repeat(np.arange(len(offsets) - 1, dtype=np.intp),
+                     np.diff(offsets))
+
+def edgesFromFaces(numVertices, faceCounts, faceConnects):
+    """derives the edges of a mesh which only consists of faces, e.g. an obj
+    file. The edge ids follow the first appearance inside of the faces like
+    the ids of maya
+
+    Args:\n
+        numVertices (int): number of vertices of the mesh
+        faceCounts (Sequence[int]): number of vertices of every face
+        faceConnects (Sequence[int]): vertex ids of all faces one after
+            another
+
+    Returns:\n
+        np.ndarray: (e, 2) vertex ids of every edge
+    """
+    faceCounts = np.asarray(faceCounts, dtype=np.intp)
+    faceConnects = np.asarray(faceConnects, dtype=np.intp)
+    if len(faceConnects) == 0:
+        return np.zeros((0, 2), dtype=np.intp)
+
+    faceOffsets = np.zeros(len(faceCounts) + 1, dtype=np.intp)
+    np.cumsum(faceCounts, out=faceOffsets[1:])
+    nextSlots = np.arange(len(faceConnects), dtype=np.intp) + 1
+    nextSlots[faceOffsets[1:] - 1] = faceOffsets[:-1]
+    first = faceConnects
+    second = faceConnects[nextSlots]
+
+    keys = (np.minimum(first, second).astype(np.int64) * int(numVertices) +
+            np.maximum(first, second))
+    _, firstSlots = np.unique(keys, return_index=True)
+    firstSlots.sort()
+
+    return np.column_stack((first[firstSlots], second[firstSlots]))
+
+class MeshTopology(object):
+    """vertex adjacency, vertex-edge and edge-face index of a mesh
+
+    Attributes:\n
+        numVertices (int): number of vertices of the mesh
+        edgeVertices (np.ndarray): (e, 2) vertex ids of every edge
+        adjacencyOffsets, adjacencyIndices (np.ndarray): CSR of the connected
+            vertices of every vertex
+        vertexEdgeOffsets, vertexEdgeIndices (np.ndarray): CSR of the
+            connected edges of every vertex
+        edgeFaceOffsets, edgeFaceIndices (np.ndarray): CSR of the connected
+            faces of every edge
+        boundaryEdges (np.ndarray): bool mask of the edges with only one face
+        boundaryVertices (np.ndarray): bool mask of the vertices on a boundary
+            edge
+    """
+
+    def __init__(self, numVertices, faceCounts, faceConnects, edgeVertices):
+        """
+        Args:\n
+            numVertices (int): number of vertices of the mesh
+            faceCounts (Sequence[int]): number of vertices of every face
+            faceConnects (Sequence[int]): vertex ids of all faces one after
+                another
+            edgeVertices (Sequence[int]): (e, 2) vertex ids of every edge in
+                the order of the mesh edge ids
+        """
+        self.numVertices = int(numVertices)
+        self.faceCounts = np.asarray(faceCounts, dtype=np.intp)
+        self.faceConnects = np.asarray(faceConnects, dtype=np.intp)
+        self.edgeVertices = np.ascontiguousarray(
+            np.asarray(edgeVertices, dtype=np.intp).reshape(-1, 2))
+
+        self.faceOffsets = np.zeros(len(self.faceCounts) + 1, dtype=np.intp)
+        np.cumsum(self.faceCounts, out=self.faceOffsets[1:])
+
+        self._buildVertexIndex()
+        self._buildEdgeFaceIndex()
+
+    @property
+    def numEdges(self):
+        return len(self.edgeVertices)
+
+    @property
+    def numFaces(self):
+        return len(self.faceCounts)
+
+    def _buildVertexIndex(self):
+        edgeIds = np.arange(self.numEdges, dtype=np.intp)
+        sources = np.concatenate((self.edgeVertices[:, 0],
+                                  self.edgeVertices[:, 1]))
+        targets = np.concatenate((self.edgeVertices[:, 1],
+                                  self.edgeVertices[:, 0]))
+
+        self.adjacencyOffsets, self.adjacencyIndices = _buildCSR(
+            sources, targets, self.numVertices)
+        self.vertexEdgeOffsets, self.vertexEdgeIndices = _buildCSR(
+            sources, np.concatenate((edgeIds, edgeIds)), self.numVertices)
+
+    def _buildEdgeFaceIndex(self):
+        # every face side is a pair of consecutive face vertices, the last
+        # vertex is connected with the first one
+        faceIds = segmentIds(self.faceOffsets)
+        nextSlots = np.arange(len(self.faceConnects), dtype=np.intp) + 1
+        nextSlots[self.faceOffsets[1:] - 1] = self.faceOffsets[:-1]
+        self.faceEdges = self.edgeIds(self.faceConnects,
+                                      self.faceConnects[nextSlots])
+
+        self.edgeFaceOffsets, self.edgeFaceIndices = _buildCSR(
+            self.faceEdges, faceIds, self.numEdges)
+
+        self.boundaryEdges = np.diff(self.edgeFaceOffsets) == 1
+        self.boundaryVertices = self.mask(
+            self.edgeVertices[self.boundaryEdges].ravel())
+
+    def _edgeKeys(self, vertsA, vertsB):
+        vertsA = np.asarray(vertsA, dtype=np.int64)
+        vertsB = np.asarray(vertsB, dtype=np.int64)
+        return (np.minimum(vertsA, vertsB) * self.numVertices +
+                np.maximum(vertsA, vertsB))
+
+    def edgeIds(self, vertsA, vertsB):
+        """returns the edge ids of the given vertex pairs (-1 if the vertices
+        are not connected)"""
+
+        if self.numEdges == 0:
+            return np.full(np.shape(vertsA), -1, dtype=np.intp)
+
+        if not hasattr(self, "_sortedEdgeKeys"):
+            keys = self._edgeKeys(self.edgeVertices[:, 0],
+                                  self.edgeVertices[:, 1])
+            self._edgeKeyOrder = np.argsort(keys)
+            self._sortedEdgeKeys = keys[self._edgeKeyOrder]
+
+        keys = self._edgeKeys(vertsA, vertsB)
+        positions = np.searchsorted(self._sortedEdgeKeys, keys)
+        positions = np.minimum(positions, self.numEdges - 1)
+        found = self._sortedEdgeKeys[positions] == keys
+        return np.where(found, self._edgeKeyOrder[positions], -1)
+
+    def mask(self, vertices):
+        """returns a bool mask over all vertices with the given ids set"""
+
+        mask = np.zeros(self.numVertices, dtype=bool)
+        mask[np.asarray(vertices, dtype=np.intp)] = True
+        return mask
+
+    def edgeMask(self, edges):
+        """returns a bool mask over all edges with the given ids set"""
+
+        mask = np.zeros(self.numEdges, dtype=bool)
+        mask[np.asarray(edges, dtype=np.intp)] = True
+        return mask
+
+    def faceMask(self, faces):
+        """returns a bool mask over all faces with the given ids set"""
+
+        mask = np.zeros(self.numFaces, dtype=bool)
+        mask[np.asarray(faces, dtype=np.intp)] = True
+        return mask
+
+    def faceVertices(self, faces):
+        """returns the unique vertices of the given faces"""
+
+        faces = np.asarray(faces, dtype=np.intp)
+        starts = self.faceOffsets[faces]
+        counts = self.faceCounts[faces]
+        # position of every entry inside its own face
+        local = np.arange(counts.sum(), dtype=np.intp) - np.repeat(
+            np.cumsum(counts) - counts, counts)
+
+        return np.unique(self.faceConnects[np.repeat(starts, counts) + local])
+
+    def neighbours(self, vertex):
+        """returns the connected vertices of a vertex"""
+
+        return self.adjacencyIndices[self.adjacencyOffsets[vertex]:
+                                     self.adjacencyOffsets[vertex + 1]]
+
+    def connectedEdges(self, vertex):
+        """returns the connected edges of a vertex"""
+
+        return self.vertexEdgeIndices[self.vertexEdgeOffsets[vertex]:
+                                      self.vertexEdgeOffsets[vertex + 1]]
+
+    def gatherNeighbours(self, vertices):
+        """returns the neighbours of all given vertices at once
+
+        Args:\n
+            vertices (Sequence[int]): vertex ids
+
+        Returns:\n
+            (np.ndarray, np.ndarray): for every neighbour the position of its
+                vertex inside vertices and the neighbour id
+        """
+        vertices = np.asarray(vertices, dtype=np.intp)
+        starts = self.adjacencyOffsets[vertices]
+        counts = self.adjacencyOffsets[vertices + 1] - starts
+        rows = np.repeat(np.arange(len(vertices), dtype=np.intp), counts)
+        # position of every entry inside its own segment
+        local = np.arange(len(rows), dtype=np.intp) - np.repeat(
+            np.cumsum(counts) - counts, counts)
+
+        return rows, self.adjacencyIndices[np.repeat(starts, counts) + local]
+
+    def countNeighboursIn(self, vertices, mask):
+        """counts for every given vertex the neighbours inside the mask"""
+
+        rows, neighbours = self.gatherNeighbours(vertices)
+        return np.bincount(rows, weights=mask[neighbours],
+                           minlength=len(vertices)).astype(np.intp)
+
+    def containedEdges(self, mask):
+        """returns the edges whose both vertices are inside the vertex mask"""
+
+        return np.flatnonzero(mask[self.edgeVertices[:, 0]] &
+                              mask[self.edgeVertices[:, 1]])
+
+    def containedFaces(self, mask):
+        """returns a bool mask of the faces whose vertices are all inside the
+        vertex mask"""
+
+        if self.numFaces == 0:
+            return np.zeros(0, dtype=bool)
+        return np.logical_and.reduceat(mask[self.faceConnects],
+                                       self.faceOffsets[:-1])
+
+    def perimeterEdges(self, faceMask):
+        """returns the edges on the border of the faces inside the face mask,
+        an edge is on the border if exactly one of its faces is inside"""
+
+        insideFaces = np.bincount(segmentIds(self.edgeFaceOffsets),
+                                  weights=faceMask[self.edgeFaceIndices],
+                                  minlength=self.numEdges)
+        return np.flatnonzero(insideFaces == 1)
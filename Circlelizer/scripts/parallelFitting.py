@@ -0,0 +1,95 @@
+import multiprocessing
+from multiprocessing.pool import ThreadPool
+
+import numpy as np
+
+#+---------------------------------------------------------------------------+
+#|                            Parallel Fitting                               |
+#|                                                                           |
+#| -> fans out pure array work (the circle fitting of independent loops)     |
+#|    over a pool of threads. numpy releases the GIL inside its array        |
+#|    operations, so the fits of different loops run on several cores. The   |
+#|    maya api must only be used before and after the parallel stage on the  |
+#|    main thread                                                            |
+#+---------------------------------------------------------------------------+
+
+# number of threads which are used if nothing else is defined
+DEFAULT_THREADS = multiprocessing.cpu_count()
+
+# loops with less vertices are not split any further into own tasks
+MIN_TASK_VERTICES = 2048
+
+_pool = None
+_poolSize = 0
+
+def _getPool(threads):
+    """returns the pool with the configured number of threads. It is only
+    recreated if the configured number changes, calls with less tasks than
+    threads are using the same pool"""
+
+    global _pool, _poolSize
+
+    if _pool is None or _poolSize != threads:
+        shutdown()
+        _pool = ThreadPool(threads)
+        _poolSize = threads
+
+    return _pool
+
+def shutdown():
+    """closes the thread pool, called on plug-in uninitialization"""
+
+    global _pool, _poolSize
+
+    if _pool is not None:
+        _pool.close()
+        _pool.join()
+    _pool = None
+    _poolSize = 0
+
+def mapOrdered(function, tasks, threads=DEFAULT_THREADS):
+    """calls function for every task, in parallel if more than one thread
+    is allowed. The results are always returned in the order of the tasks,
+    so the result does not depend on the scheduling
+
+    Args:\n
+        function (Callable): pure function without maya api calls
+        tasks (List[object]): the argument of every call
+        threads (int): maximum number of threads
+
+    Returns:\n
+        List[object]: result of every task
+    """
+    if min(threads, len(tasks)) <= 1:
+        return [function(task) for task in tasks]
+
+    # every task is its own job, so less tasks than threads are still
+    # running in parallel
+    return _getPool(threads).map(function, tasks, chunksize=1)
+
+def chunkLoops(loops, chunks):
+    """splits the loops into continues chunks with roughly the same number of
+    vertices
+
+    Args:\n
+        loops (List[np.ndarray]): vertex id's of every loop
+        chunks (int): maximum number of chunks
+
+    Returns:\n
+        List[List[np.ndarray]]: the loops of every chunk in their original
+            order
+    """
+    sizes = np.array([len(loop) for loop in loops])
+    total = sizes.sum()
+    chunks = max(1, min(chunks, len(loops), total // MIN_TASK_VERTICES))
+    if chunks == 1:
+        return [list(loops)]
+
+    # every chunk ends as soon as its share of the vertices is reached
+    bounds = np.searchsorted(np.cumsum(sizes),
+                             np.arange(1, chunks) * (total / float(chunks)))
+    bounds = np.unique(np.concatenate(([0], bounds + 1, [len(loops)])))
+    bounds = bounds[bounds <= len(loops)]
+
+    return [list(loops[start:end])
+            for start, end in zip(bounds[:-1], bounds[1:]) if end > start]
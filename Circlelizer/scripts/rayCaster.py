@@ -0,0 +1,324 @@
+import numpy as np
+
+#+---------------------------------------------------------------------------+
+#|                               Ray Caster                                  |
+#|                                                                           |
+#| -> bounding volume hierarchy (BVH) over the triangles of a mesh which     |
+#|    intersects many rays in one vectorized call. The triangles are sorted  |
+#|    along a morton curve and grouped into leaves of a complete binary      |
+#|    tree, so the tree only depends on the topology and is refitted to new  |
+#|    positions in O(n). It does not depend on maya and can be used          |
+#|    standalone                                                             |
+#+---------------------------------------------------------------------------+
+
+# number of triangles in every leaf of the tree
+LEAF_SIZE = 4
+
+# rays are intersected in chunks of this size to bound the memory usage
+RAY_CHUNK_SIZE = 4096
+
+# the first search distance as fraction of the mesh size and the factor it
+# grows with for the rays which did not hit anything yet
+INITIAL_SEARCH_DISTANCE = 1.0 / 64.0
+SEARCH_DISTANCE_GROWTH = 8.0
+
+# triangles which are nearly parallel to the ray are not hit. The
+# determinant is compared relative to the lengths of the triangle edges and
+# the direction, so the tolerance does not depend on the size of the mesh
+DETERMINANT_TOLERANCE = 1e-12
+
+# replaces zero direction components in the bounding box test
+PARALLEL_DIRECTION = 1e-30
+
+# bits per axis of the morton codes
+MORTON_BITS = 10
+
+def fanTriangles(faceCounts, faceConnects):
+    """triangulates every face as a fan around its first vertex
+
+    Args:\n
+        faceCounts (Sequence[int]): number of vertices of every face
+        faceConnects (Sequence[int]): vertex ids of all faces one after
+            another
+
+    Returns:\n
+        np.ndarray: (t, 3) vertex ids of every triangle
+    """
+    faceCounts = np.asarray(faceCounts, dtype=np.intp)
+    faceConnects = np.asarray(faceConnects, dtype=np.intp)
+    faceOffsets = np.zeros(len(faceCounts) + 1, dtype=np.intp)
+    np.cumsum(faceCounts, out=faceOffsets[1:])
+
+    triangleCounts = np.maximum(faceCounts - 2, 0)
+    faces = np.repeat(np.arange(len(faceCounts)), triangleCounts)
+    triangleStarts = np.zeros(len(faceCounts), dtype=np.intp)
+    np.cumsum(triangleCounts[:-1], out=triangleStarts[1:])
+    local = np.arange(len(faces)) - triangleStarts[faces]
+
+    starts = faceOffsets[faces]
+    return np.column_stack((faceConnects[starts],
+                            faceConnects[starts + local + 1],
+                            faceConnects[starts + local + 2]))
+
+def _spreadBits(values):
+    # inserts two zero bits between every bit of the 10 bit values
+    values = values.astype(np.uint64)
+    values = (values | (values << np.uint64(16))) & np.uint64(0x030000FF)
+    values = (values | (values << np.uint64(8))) & np.uint64(0x0300F00F)
+    values = (values | (values << np.uint64(4))) & np.uint64(0x030C30C3)
+    values = (values | (values << np.uint64(2))) & np.uint64(0x09249249)
+    return values
+
+def mortonOrder(positions):
+    """returns the indices which sort the positions along a morton curve"""
+
+    positions = np.asarray(positions, dtype=np.float64)
+    if len(positions) == 0:
+        return np.zeros(0, dtype=np.intp)
+
+    lower = positions.min(axis=0)
+    extent = positions.max(axis=0) - lower
+    extent[extent == 0.0] = 1.0
+    scale = (1 << MORTON_BITS) - 1
+    cells = ((positions - lower) / extent * scale).astype(np.int64)
+    codes = (_spreadBits(cells[:, 0]) << np.uint64(2) |
+             _spreadBits(cells[:, 1]) << np.uint64(1) |
+             _spreadBits(cells[:, 2]))
+
+    return np.argsort(codes, kind="mergesort")
+
+class TriangleBVH(object):
+    """bounding volume hierarchy over the triangles of one mesh
+
+    Attributes:\n
+        triangles (np.ndarray): (t, 3) vertex ids of every triangle in the
+            order of the tree
+        triangleIds (np.ndarray): (t,) original id of every sorted triangle
+        depth (int): number of levels below the root
+        levelMins, levelMaxs (List[np.ndarray]): (2^d, 3) bounding boxes of
+            every node for every level d, the last level are the leaves
+    """
+
+    def __init__(self, points, triangles, leafSize=LEAF_SIZE):
+        """
+        Args:\n
+            points (np.ndarray): (n, 3) positions of all mesh vertices
+            triangles (np.ndarray): (t, 3) vertex ids of every triangle
+            leafSize (int): number of triangles in every leaf
+        """
+        points = np.asarray(points, dtype=np.float64)
+        triangles = np.asarray(triangles, dtype=np.intp).reshape(-1, 3)
+
+        # the order only depends on the topology as long as the mesh does
+        # not change completely, refit keeps it for new positions
+        self.triangleIds = mortonOrder(points[triangles].mean(axis=1))
+        self.triangles = np.ascontiguousarray(triangles[self.triangleIds])
+        self.leafSize = int(leafSize)
+
+        numLeaves = max(1, -(-len(self.triangles) // self.leafSize))
+        self.depth = int(np.ceil(np.log2(numLeaves))) if numLeaves > 1 else 0
+
+        self.levelMins = []
+        self.levelMaxs = []
+        self.refit(points)
+
+    @property
+    def numTriangles(self):
+        return len(self.triangles)
+
+    def refit(self, points):
+        """recalculates every bounding box for new vertex positions of the
+        same topology
+
+        Args:\n
+            points (np.ndarray): (n, 3) positions of all mesh vertices
+        """
+        self.points = np.ascontiguousarray(points, dtype=np.float64)
+        corners = self.points[self.triangles]
+
+        # empty slots of the complete tree get inverted boxes which are
+        # never hit by a ray
+        slots = (1 << self.depth) * self.leafSize
+        mins = np.full((slots, 3), np.inf)
+        maxs = np.full((slots, 3), -np.inf)
+        mins[:len(corners)] = corners.min(axis=1)
+        maxs[:len(corners)] = corners.max(axis=1)
+
+        mins = mins.reshape(-1, self.leafSize, 3).min(axis=1)
+        maxs = maxs.reshape(-1, self.leafSize, 3).max(axis=1)
+        self.levelMins = [mins]
+        self.levelMaxs = [maxs]
+        while len(mins) > 1:
+            mins = mins.reshape(-1, 2, 3).min(axis=1)
+            maxs = maxs.reshape(-1, 2, 3).max(axis=1)
+            self.levelMins.insert(0, mins)
+            self.levelMaxs.insert(0, maxs)
+
+    def intersect(self, origins, directions, maxDistance=np.inf,
+                  bothDirections=False):
+        """calculates the closest hit of every ray
+
+        Args:\n
+            origins (np.ndarray): (m, 3) start point of every ray
+            directions (np.ndarray): (m, 3) or (3,) direction of the rays
+            maxDistance (float): maximal distance of a hit in units of the
+                ray directions
+            bothDirections (bool): true if the rays are also cast backwards
+
+        Returns:\n
+            (np.ndarray, np.ndarray, np.ndarray, np.ndarray): (m,) true for
+                every ray with a hit, (m, 3) hit points, (m,) signed ray
+                parameters and (m,) original triangle ids (-1 without a hit)
+        """
+        origins = np.ascontiguousarray(origins, dtype=np.float64).reshape(-1, 3)
+        directions = np.asarray(directions, dtype=np.float64)
+        directions = np.ascontiguousarray(
+            np.broadcast_to(directions.reshape(-1, 3), origins.shape))
+
+        count = len(origins)
+        hitParams = np.full(count, np.inf)
+        hitTriangles = np.full(count, -1, dtype=np.intp)
+        for start in range(0, count, RAY_CHUNK_SIZE):
+            end = min(start + RAY_CHUNK_SIZE, count)
+            params, triangles = self._intersectExpanding(
+                origins[start:end], directions[start:end], float(maxDistance),
+                bothDirections)
+            hitParams[start:end] = params
+            hitTriangles[start:end] = triangles
+
+        isHit = hitTriangles != -1
+        hitPoints = origins.copy()
+        hitPoints[isHit] += hitParams[isHit, np.newaxis] * directions[isHit]
+        hitTriangles[isHit] = self.triangleIds[hitTriangles[isHit]]
+        hitParams[~isHit] = 0.0
+
+        return isHit, hitPoints, hitParams, hitTriangles
+
+    def _intersectExpanding(self, origins, directions, maxDistance,
+                            bothDirections):
+        # rays are first cast with a short distance and only the ones
+        # without a hit are cast again further. A hit inside the short
+        # distance is always the closest one, but most of the tree is skipped
+        hitParams = np.full(len(origins), np.inf)
+        hitTriangles = np.full(len(origins), -1, dtype=np.intp)
+        if self.numTriangles == 0 or len(origins) == 0:
+            return hitParams, hitTriangles
+
+        center = (self.levelMins[0][0] + self.levelMaxs[0][0]) / 2.0
+        diagonal = np.linalg.norm(self.levelMaxs[0][0] - self.levelMins[0][0])
+        lengths = np.linalg.norm(directions, axis=1)
+        lengths[lengths == 0.0] = 1.0
+        # beyond this distance (in units of the directions) no ray can hit
+        # anything anymore
+        reach = ((np.linalg.norm(origins - center, axis=1) + diagonal) /
+                 lengths).max()
+
+        pending = np.arange(len(origins), dtype=np.intp)
+        distance = min(maxDistance, diagonal / lengths.max() *
+                       INITIAL_SEARCH_DISTANCE)
+        if distance <= 0.0:
+            # a mesh without extent (every vertex at one point) can not be
+            # searched with a growing distance
+            distance = maxDistance
+        while len(pending):
+            if distance >= reach:
+                distance = maxDistance
+            params, triangles = self._intersectChunk(
+                origins[pending], directions[pending], distance,
+                bothDirections)
+            isHit = triangles != -1
+            hitParams[pending[isHit]] = params[isHit]
+            hitTriangles[pending[isHit]] = triangles[isHit]
+            if distance >= maxDistance:
+                break
+            pending = pending[~isHit]
+            distance = min(maxDistance, distance * SEARCH_DISTANCE_GROWTH)
+
+        return hitParams, hitTriangles
+
+    def _intersectChunk(self, origins, directions, maxDistance,
+                        bothDirections):
+        minParam = -maxDistance if bothDirections else 0.0
+        # tiny direction components instead of zeros keep the slab test free
+        # of nan values for rays which start on a slab they are parallel to
+        inverseDirections = 1.0 / np.where(directions == 0.0,
+                                           PARALLEL_DIRECTION, directions)
+
+        # walk down the tree level by level with every (ray, node) pair
+        # whose bounding box is hit
+        rays = np.arange(len(origins), dtype=np.intp)
+        nodes = np.zeros(len(origins), dtype=np.intp)
+        for level in range(self.depth + 1):
+            mins = self.levelMins[level][nodes]
+            maxs = self.levelMaxs[level][nodes]
+            near = (mins - origins[rays]) * inverseDirections[rays]
+            far = (maxs - origins[rays]) * inverseDirections[rays]
+            entry = np.minimum(near, far).max(axis=1)
+            leave = np.maximum(near, far).min(axis=1)
+            # empty nodes of the complete tree have inverted boxes
+            isHit = ((entry <= leave) & (leave >= minParam) &
+                     (entry <= maxDistance) & (mins[:, 0] <= maxs[:, 0]))
+            rays = rays[isHit]
+            nodes = nodes[isHit]
+            if level < self.depth:
+                rays = np.repeat(rays, 2)
+                nodes = (np.repeat(nodes, 2) * 2 +
+                         np.tile([0, 1], len(nodes)))
+
+        # test every triangle of the hit leaves
+        rays = np.repeat(rays, self.leafSize)
+        triangles = (np.repeat(nodes, self.leafSize) * self.leafSize +
+                     np.tile(np.arange(self.leafSize), len(nodes)))
+        valid = triangles < len(self.triangles)
+        rays = rays[valid]
+        triangles = triangles[valid]
+        params = self._intersectTriangles(origins[rays], directions[rays],
+                                          triangles)
+        isHit = (params >= minParam) & (params <= maxDistance)
+
+        # keep the hit with the smallest distance of every ray
+        hitParams = np.full(len(origins), np.inf)
+        hitTriangles = np.full(len(origins), -1, dtype=np.intp)
+        rays = rays[isHit]
+        params = params[isHit]
+        triangles = triangles[isHit]
+        if len(rays):
+            order = np.lexsort((np.abs(params), rays))
+            first = np.ones(len(order), dtype=bool)
+            first[1:] = rays[order][1:] != rays[order][:-1]
+            closest = order[first]
+            hitParams[rays[closest]] = params[closest]
+            hitTriangles[rays[closest]] = triangles[closest]
+
+        return hitParams, hitTriangles
+
+    def _intersectTriangles(self, origins, directions, triangles):
+        """moeller trumbore intersection of every ray with its triangle
+
+        Returns:\n
+            np.ndarray: ray parameter of every hit, nan for every miss
+        """
+        corners = self.points[self.triangles[triangles]]
+        edgeA = corners[:, 1] - corners[:, 0]
+        edgeB = corners[:, 2] - corners[:, 0]
+
+        p = np.cross(directions, edgeB)
+        determinants = np.einsum("ij,ij->i", edgeA, p)
+        # squared on both sides to compare without square roots
+        scales = (np.einsum("ij,ij->i", edgeA, edgeA) *
+                  np.einsum("ij,ij->i", edgeB, edgeB) *
+                  np.einsum("ij,ij->i", directions, directions))
+        isValid = determinants ** 2 > DETERMINANT_TOLERANCE ** 2 * scales
+        inverse = np.zeros(len(determinants))
+        inverse[isValid] = 1.0 / determinants[isValid]
+
+        s = origins - corners[:, 0]
+        u = np.einsum("ij,ij->i", s, p) * inverse
+        q = np.cross(s, edgeA)
+        v = np.einsum("ij,ij->i", directions, q) * inverse
+        params = np.einsum("ij,ij->i", edgeB, q) * inverse
+
+        isHit = isValid & (u >= 0.0) & (v >= 0.0) & (u + v <= 1.0)
+        params[~isHit] = np.nan
+
+        return params
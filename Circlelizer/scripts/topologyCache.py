@@ -0,0 +1,249 @@
+from collections import OrderedDict
+
+import maya.api.OpenMaya as om
+import numpy as np
+
+from apiHelper import buildTopology, getShapePath
+
+#+---------------------------------------------------------------------------+
+#|                             Topology Cache                                |
+#|                                                                           |
+#| -> process wide cache of the MeshTopology of every mesh circlelize was    |
+#|    used on. Entries are evicted least recently used first as soon as all  |
+#|    of their arrays are above the memory limit and are invalidated by maya |
+#|    callbacks as soon as the topology changes. Data which depends on the   |
+#|    vertex positions is dropped on every deformation                       |
+#+---------------------------------------------------------------------------+
+
+# bytes of the cached arrays of all meshes, a call on many meshes keeps
+# every one of them as long as they are fitting
+MAX_CACHED_BYTES = 512 << 20
+
+def _arrayBytes(value):
+    """returns the bytes of the numpy arrays of a cached value, which are
+    the array itself, the arrays inside of a tuple or list or the array
+    attributes of an object. Maya objects are counted as zero"""
+
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sum(_arrayBytes(item) for item in value)
+    attributes = getattr(value, "__dict__", None)
+    if attributes is None:
+        return 0
+    return sum(item.nbytes for item in attributes.values()
+               if isinstance(item, np.ndarray))
+
+class TopologyCacheEntry(object):
+    """everything cached for one mesh
+
+    Attributes:\n
+        topology (MeshTopology): neighbourhood index of the mesh
+        counts (Tuple[int, int, int]): number of vertices, edges and faces the
+            topology was built with
+        extras (Dict[str, object]): other data which only depends on the
+            topology
+        shapeExtras (Dict[str, object]): data which also depends on the
+            vertex positions and is dropped as soon as the mesh is deformed
+        callbackIds (List[int]): maya callbacks which watch the mesh
+        valid (bool): false as soon as a callback reported a change
+    """
+
+    def __init__(self, topology, counts):
+        self.topology = topology
+        self.counts = counts
+        self.extras = {}
+        self.shapeExtras = {}
+        self.callbackIds = []
+        self.valid = True
+
+    @property
+    def nbytes(self):
+        """int: bytes of the cached arrays of the mesh"""
+
+        return _arrayBytes(self.topology) + sum(
+            _arrayBytes(value) for value in
+            list(self.extras.values()) + list(self.shapeExtras.values()))
+
+class TopologyCache(object):
+    """memory bounded LRU cache of per mesh topology data keyed by the uuid
+    of the mesh shape"""
+
+    def __init__(self, maxBytes=MAX_CACHED_BYTES):
+        self.maxBytes = maxBytes
+        self._entries = OrderedDict()
+        self._sceneCallbackIds = []
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    @staticmethod
+    def key(mDagPath):
+        """returns the cache key of the mesh shape the mDagPath points to"""
+
+        return om.MFnDependencyNode(
+            getShapePath(mDagPath).node()).uuid().asString()
+
+    @staticmethod
+    def _meshCounts(mDagPath):
+        mFnMesh = om.MFnMesh(mDagPath)
+        return (mFnMesh.numVertices, mFnMesh.numEdges, mFnMesh.numPolygons)
+
+    def entry(self, mDagPath):
+        """returns the cache entry of the mesh and builds it if it is missing
+        or outdated
+
+        Args:\n
+            mDagPath (om.MDagPath): path to the mesh shape
+
+        Returns:\n
+            TopologyCacheEntry: cache entry of the mesh
+        """
+        key = self.key(mDagPath)
+        counts = self._meshCounts(mDagPath)
+
+        entry = self._entries.pop(key, None)
+        # the counts are a cheap safety net for topology changes which did
+        # not trigger a callback
+        if entry is not None and (not entry.valid or entry.counts != counts):
+            self._removeCallbacks(entry)
+            entry = None
+
+        if entry is None:
+            entry = TopologyCacheEntry(buildTopology(mDagPath), counts)
+            self._addCallbacks(key, mDagPath, entry)
+
+        # reinserting marks the entry as the most recently used one
+        self._entries[key] = entry
+        self._evict()
+
+        return entry
+
+    def get(self, mDagPath):
+        """returns the MeshTopology of the mesh the mDagPath points to"""
+
+        return self.entry(mDagPath).topology
+
+    def extra(self, mDagPath, name, build):
+        """returns other cached data of the mesh which only depends on its
+        topology and builds it if it is missing
+
+        Args:\n
+            mDagPath (om.MDagPath): path to the mesh shape
+            name (str): name of the data
+            build (Callable[[om.MDagPath], object]): creates the data
+
+        Returns:\n
+            object: the cached data
+        """
+        extras = self.entry(mDagPath).extras
+        if name not in extras:
+            extras[name] = build(mDagPath)
+            self._evict()
+
+        return extras[name]
+
+    def shapeExtra(self, mDagPath, name, build):
+        """returns cached data of the mesh which depends on its current shape
+        and builds it if it is missing or the mesh was deformed since then
+
+        Args:\n
+            mDagPath (om.MDagPath): path to the mesh shape
+            name (str): name of the data
+            build (Callable[[om.MDagPath], object]): creates the data
+
+        Returns:\n
+            object: the cached data
+        """
+        shapeExtras = self.entry(mDagPath).shapeExtras
+        if name not in shapeExtras:
+            shapeExtras[name] = build(mDagPath)
+            self._evict()
+
+        return shapeExtras[name]
+
+    def invalidate(self, key):
+        """removes the entry with the given key from the cache"""
+
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._removeCallbacks(entry)
+
+    def clear(self):
+        """removes every entry from the cache"""
+
+        for key in list(self._entries.keys()):
+            self.invalidate(key)
+
+    def nbytes(self):
+        """returns the bytes of the cached arrays of every mesh"""
+
+        return sum(entry.nbytes for entry in self._entries.values())
+
+    def _evict(self):
+        # the most recently used mesh stays even if it is larger than the
+        # limit on its own
+        nbytes = self.nbytes()
+        while nbytes > self.maxBytes and len(self._entries) > 1:
+            key = next(iter(self._entries))
+            nbytes -= self._entries[key].nbytes
+            self.invalidate(key)
+
+    def _addCallbacks(self, key, mDagPath, entry):
+        node = getShapePath(mDagPath).node()
+        try:
+            entry.callbackIds.append(
+                om.MPolyMessage.addPolyTopologyChangedCallback(
+                    node, self._onTopologyChanged, key))
+            entry.callbackIds.append(
+                om.MNodeMessage.addNodePreRemovalCallback(
+                    node, self._onTopologyChanged, key))
+            entry.callbackIds.append(
+                om.MNodeMessage.addNodeDirtyPlugCallback(
+                    node, self._onShapeChanged, key))
+        except RuntimeError:
+            # without callbacks the entry still gets validated by its counts
+            pass
+
+    def _removeCallbacks(self, entry):
+        for callbackId in entry.callbackIds:
+            om.MMessage.removeCallback(callbackId)
+        entry.callbackIds = []
+
+    def _onTopologyChanged(self, node, key):
+        # callbacks should not be removed while maya is calling them, so the
+        # entry is only marked and gets replaced on its next lookup
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.valid = False
+
+    def _onShapeChanged(self, node, plug, key):
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.shapeExtras.clear()
+
+    def _onSceneChanged(self, *args):
+        self.clear()
+
+    def install(self):
+        """registers the scene callbacks, called on plug-in initialization"""
+
+        for message in (om.MSceneMessage.kBeforeNew,
+                        om.MSceneMessage.kBeforeOpen):
+            self._sceneCallbackIds.append(
+                om.MSceneMessage.addCallback(message, self._onSceneChanged))
+
+    def uninstall(self):
+        """removes all callbacks and entries, called on plug-in
+        uninitialization"""
+
+        self.clear()
+        for callbackId in self._sceneCallbackIds:
+            om.MMessage.removeCallback(callbackId)
+        self._sceneCallbackIds = []
+
+# the cache which is shared by every command of the plug-in
+topologyCache = TopologyCache()
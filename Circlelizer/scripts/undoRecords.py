@@ -0,0 +1,145 @@
+import weakref
+import zlib
+from itertools import count
+
+import numpy as np
+
+#+---------------------------------------------------------------------------+
+#|                              Undo Records                                 |
+#|                                                                           |
+#| -> maya keeps every undoable command in its undo queue, so everything a   |
+#|    command needs for undo and redo is stored as flat arrays. Large edits  |
+#|    can be compressed, the redo points are then stored as bitwise delta    |
+#|    to the previous points which restores them exactly                     |
+#+---------------------------------------------------------------------------+
+
+# fast zlib level, the arrays are compressed on every command call
+COMPRESSION_LEVEL = 1
+
+def _compress(array):
+    """compresses an array. The bytes are shuffled by their significance
+    before, so the equal sign and exponent bytes of the floats are following
+    each other
+
+    Args:\n
+        array (np.ndarray): array of any shape
+
+    Returns:\n
+        (bytes, np.dtype, tuple): compressed bytes, type and shape
+    """
+    array = np.ascontiguousarray(array)
+    shuffled = array.reshape(-1).view(np.uint8).reshape(-1, array.itemsize).T
+    return (zlib.compress(shuffled.tobytes(), COMPRESSION_LEVEL), array.dtype,
+            array.shape)
+
+def _decompress(packed):
+    """restores an array of _compress"""
+
+    data, dtype, shape = packed
+    shuffled = np.frombuffer(zlib.decompress(data), dtype=np.uint8)
+    return shuffled.reshape(dtype.itemsize, -1).T.copy().view(dtype).reshape(
+        shape)
+
+def _packedBytes(packed):
+    return len(packed[0])
+
+class MeshEdit(object):
+    """everything which is needed to undo and redo the changes on one mesh
+
+    Attributes:\n
+        mDagPath (om.MDagPath): path to the shape node of the mesh
+        compressed (bool): whether the arrays are stored compressed
+    """
+
+    def __init__(self, mDagPath, vertices, previousPositions,
+                 calculatedPoints, compress=False):
+        """
+        Args:\n
+            mDagPath (om.MDagPath): path to the shape node of the mesh
+            vertices (Sequence[int]): changed vertex id's
+            previousPositions (np.ndarray): (n, 3) positions before the change
+            calculatedPoints (np.ndarray): (n, 3) positions after the change
+            compress (bool): stores the arrays compressed
+        """
+        self.mDagPath = mDagPath
+        self.compressed = compress
+
+        # maya's vertex id's are 32 bit
+        vertices = np.asarray(vertices, dtype=np.int32)
+        previousPositions = np.ascontiguousarray(previousPositions,
+                                                 dtype=np.float64)
+        calculatedPoints = np.ascontiguousarray(calculatedPoints,
+                                                dtype=np.float64)
+        if compress:
+            # neighbouring vertices of a loop have close id's
+            self._vertices = _compress(np.diff(vertices, prepend=np.int32(0)))
+            self._previousPositions = _compress(previousPositions)
+            # unchanged coordinates become zero, changed ones are sharing at
+            # least the sign and the exponent
+            self._calculatedPoints = _compress(
+                calculatedPoints.view(np.uint64) ^
+                previousPositions.view(np.uint64))
+        else:
+            self._vertices = vertices
+            self._previousPositions = previousPositions
+            self._calculatedPoints = calculatedPoints
+
+    @property
+    def vertices(self):
+        """np.ndarray: changed vertex id's"""
+
+        if self.compressed:
+            return np.cumsum(_decompress(self._vertices), dtype=np.int32)
+        return self._vertices
+
+    @property
+    def previousPositions(self):
+        """np.ndarray: (n, 3) positions before the change"""
+
+        if self.compressed:
+            return _decompress(self._previousPositions)
+        return self._previousPositions
+
+    @property
+    def calculatedPoints(self):
+        """np.ndarray: (n, 3) positions after the change"""
+
+        if self.compressed:
+            previousPositions = self.previousPositions
+            return (_decompress(self._calculatedPoints) ^
+                    previousPositions.view(np.uint64)).view(np.float64)
+        return self._calculatedPoints
+
+    @property
+    def nbytes(self):
+        """int: bytes of the stored arrays"""
+
+        if self.compressed:
+            return sum(_packedBytes(packed) for packed in (
+                self._vertices, self._previousPositions,
+                self._calculatedPoints))
+        return (self._vertices.nbytes + self._previousPositions.nbytes +
+                self._calculatedPoints.nbytes)
+
+class UndoHistory(object):
+    """keeps track of the commands inside of maya's undo queue without
+    holding them. A command disappears when maya releases it, e.g. if the
+    queue is longer than undoInfo -length or it gets flushed"""
+
+    def __init__(self):
+        self._entries = weakref.WeakValueDictionary()
+        self._order = count()
+
+    def add(self, command):
+        """adds a command which provides undoBytes"""
+
+        self._entries[next(self._order)] = command
+
+    def sizes(self):
+        """returns the bytes of every command still alive, the oldest
+        first"""
+
+        entries = sorted(self._entries.items())
+        return [int(command.undoBytes()) for _, command in entries]
+
+undoHistory = UndoHistory()
@@ -0,0 +1,483 @@
+"""
+benchmarks every stage of the circlelize command on synthetic meshes of
+increasing size. It runs the real plug-in on top of the maya stand-in:
+
+    python circlelizerBenchmark.py --output results.json
+    python circlelizerBenchmark.py --sizes 16 256 4096 --compare results.json
+
+The stages are measured with exclusive times, a stage which calls another
+stage does not include its time. Stages which call into maya (selection,
+read, writeBack) measure the stand-in and not maya itself, their scaling is
+still meaningful. A stage whose time grows faster than n^SCALING_LIMIT is
+reported as superlinear.
+"""
+
+import argparse
+import datetime
+import functools
+import json
+import math
+import platform
+import sys
+import threading
+import time
+
+import numpy as np
+
+import circlelizerStandalone as standalone
+
+# number of loop vertices from 16 up to 1M
+DEFAULT_SIZES = (16, 256, 4096, 65536, 1048576)
+
+# growth exponent of a stage above which it is reported
+SCALING_LIMIT = 1.5
+
+# the slowdown compared to the baseline which is reported as regression
+DEFAULT_TOLERANCE = 1.25
+
+# stages shorter than this are not compared, their timing is mostly noise
+MIN_COMPARED_SECONDS = 0.002
+
+#+---------------------------------------------------------------------------+
+#|                               Stage Timers                                |
+#+---------------------------------------------------------------------------+
+
+class StageProfiler(object):
+    """measures the exclusive time of every stage. The functions of the
+    stages are wrapped in place and restored on uninstall"""
+
+    def __init__(self):
+        self.totals = {}
+        self._local = threading.local()
+        self._patches = []
+
+    def reset(self):
+        self.totals = {}
+
+    def _wrap(self, stage, function):
+        @functools.wraps(function)
+        def timed(*args, **kwargs):
+            stack = getattr(self._local, "stack", None)
+            if stack is None:
+                stack = self._local.stack = []
+            # the time of nested stages is subtracted from the outer stage
+            stack.append(0.0)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                nested = stack.pop()
+                self.totals[stage] = self.totals.get(stage, 0.0) + \
+                    elapsed - nested
+                if stack:
+                    stack[-1] += elapsed
+
+        return timed
+
+    def patch(self, owner, name, stage):
+        original = owner.__dict__[name]
+        function = original
+        if isinstance(original, staticmethod):
+            function = original.__func__
+        wrapped = self._wrap(stage, function)
+        if isinstance(original, staticmethod):
+            wrapped = staticmethod(wrapped)
+        setattr(owner, name, wrapped)
+        self._patches.append((owner, name, original))
+
+    def install(self, plugin):
+        import circleKernel
+        import interiorFill
+        import loopFitting
+        import meshBuffer
+        import topologyCache
+
+        command = plugin.Circlelizer
+        stages = (
+            (command, "_getSelectedGroups", "selection"),
+            (topologyCache, "buildTopology", "topology"),
+            (command, "_getContinuesSelections", "ordering"),
+            (meshBuffer.MeshPointBuffer, "__init__", "read"),
+            (meshBuffer.MeshPointBuffer, "normals", "read"),
+            (circleKernel, "loopStatistics", "statistics"),
+            (command, "_getInnerOuterVertices", "statistics"),
+            (loopFitting, "prepareLoops", "statistics"),
+            (command, "_calculateTransforms", "transforms"),
+            (loopFitting, "placeLoops", "transforms"),
+            (command, "_projectVertsOnMeshSurface", "projection"),
+            (command, "_projectLoopsOnMeshSurface", "projection"),
+            (command, "_snapVertsToMeshSurface", "projection"),
+            (interiorFill, "harmonicFill", "fill"),
+            (meshBuffer.MeshPointBuffer, "commit", "writeBack"))
+        for owner, name, stage in stages:
+            self.patch(owner, name, stage)
+
+    def uninstall(self):
+        for owner, name, original in reversed(self._patches):
+            setattr(owner, name, original)
+        self._patches = []
+
+#+---------------------------------------------------------------------------+
+#|                              Benchmark Cases                              |
+#+---------------------------------------------------------------------------+
+
+def _removeFaces(points, faceCounts, faceConnects, removedFaces):
+    """removes the faces and the vertices which are not used anymore
+
+    Returns:\n
+        (np.ndarray, np.ndarray, np.ndarray, np.ndarray): points, polygon
+            counts, polygon connects and the new id of every old vertex (-1
+            if it was removed)
+    """
+    keepCorners = ~np.repeat(removedFaces, faceCounts)
+    faceConnects = faceConnects[keepCorners]
+    used = np.zeros(len(points), dtype=bool)
+    used[faceConnects] = True
+    remap = np.full(len(points), -1, dtype=np.intp)
+    remap[used] = np.arange(np.count_nonzero(used))
+
+    return (points[used], faceCounts[~removedFaces], remap[faceConnects],
+            remap)
+
+def gridCase(size):
+    """squares of 2 x 2 faces on a grid, every square is a region with a
+    border of 8 vertices"""
+
+    regions = max(1, size // 8)
+    perSide = int(math.ceil(math.sqrt(regions)))
+    subdivisions = 3 * perSide + 1
+    mesh = standalone.gridMesh(subdivisions, float(subdivisions))
+
+    rows, columns = np.divmod(np.arange(regions), perSide)
+    corners = (3 * rows + 1) * subdivisions + 3 * columns + 1
+    faces = (corners[:, np.newaxis] +
+             np.array([0, 1, subdivisions, subdivisions + 1])).ravel()
+
+    return mesh, "f", faces, {}, regions
+
+def cylinderCase(size):
+    """the middle ring of a cylinder, one loop with all vertices"""
+
+    mesh = standalone.cylinderMesh(size, 2, radius=size / (2.0 * math.pi))
+
+    return mesh, "vtx", np.arange(size, 2 * size), {}, 1
+
+def sphereHolesCase(size):
+    """square holes of 4 x 4 faces in a sphere, the border of every hole is
+    a loop of 16 vertices. The circles are projected back onto the sphere"""
+
+    holeSize = 4
+    spacing = holeSize + 2
+    holes = max(1, size // (4 * holeSize))
+    holeColumns = int(math.ceil(math.sqrt(holes)))
+    holeRows = int(math.ceil(holes / float(holeColumns)))
+    axisDivisions = holeColumns * spacing
+    points, faceCounts, faceConnects = standalone.sphereMesh(
+        axisDivisions, holeRows * spacing + 4, radius=axisDivisions / 8.0)
+
+    rows, columns = np.divmod(np.arange(holes), holeColumns)
+    quadRows = rows * spacing + 2
+    quadColumns = columns * spacing + 1
+    # the quads of the sphere are following the top fan
+    offsets = np.arange(holeSize)
+    faceRows = quadRows[:, np.newaxis, np.newaxis] + \
+        offsets[np.newaxis, :, np.newaxis]
+    faceColumns = quadColumns[:, np.newaxis, np.newaxis] + \
+        offsets[np.newaxis, np.newaxis, :]
+    removed = np.zeros(len(faceCounts), dtype=bool)
+    removed[(axisDivisions + faceRows * axisDivisions + faceColumns).ravel()] = \
+        True
+
+    # the border of a hole are the ring vertices around its quads
+    border = np.arange(holeSize + 1)
+    ringRows = np.concatenate((np.zeros(holeSize + 1, dtype=np.intp), border,
+                               np.full(holeSize + 1, holeSize), border))
+    ringColumns = np.concatenate((border, np.zeros(holeSize + 1,
+                                                   dtype=np.intp),
+                                  border, np.full(holeSize + 1, holeSize)))
+    # the ring of quad row r starts at the vertex ring r
+    borderVerts = ((quadRows[:, np.newaxis] + ringRows) * axisDivisions +
+                   quadColumns[:, np.newaxis] + ringColumns).ravel()
+
+    points, faceCounts, faceConnects, remap = _removeFaces(
+        points, faceCounts, faceConnects, removed)
+    mesh = (points, faceCounts, faceConnects)
+    flags = {"projectOnMesh": True, "rayCaster": "numpy"}
+
+    return mesh, "vtx", np.unique(remap[borderVerts]), flags, holes
+
+def noisyLoopsCase(size, seed=0):
+    """every second ring of a cylinder with scan like noise. The radius of
+    the rings wobbles and every vertex is jittered"""
+
+    axisDivisions = min(size, 1024)
+    loops = max(1, size // axisDivisions)
+    points, faceCounts, faceConnects = standalone.cylinderMesh(
+        axisDivisions, 2 * loops, radius=axisDivisions / (2.0 * math.pi),
+        height=4.0 * loops)
+
+    random = np.random.RandomState(seed)
+    angles = np.arctan2(-points[:, 2], points[:, 0])
+    wobble = 1.0 + 0.05 * np.sin(3.0 * angles + points[:, 1])
+    points[:, [0, 2]] *= wobble[:, np.newaxis]
+    points += random.normal(0.0, 0.15, points.shape)
+
+    rings = np.arange(1, 2 * loops, 2)
+    vertices = (rings[:, np.newaxis] * axisDivisions +
+                np.arange(axisDivisions)).ravel()
+
+    return (points, faceCounts, faceConnects), "vtx", vertices, {}, loops
+
+def manyMeshesCase(size, meshes=48):
+    """the middle ring of many small cylinders (bolts) selected together.
+    With --warm every mesh has to stay inside of the topology cache between
+    the runs"""
+
+    axisDivisions = max(3, size // meshes)
+    mesh = standalone.cylinderMesh(axisDivisions, 2,
+                                   radius=axisDivisions / (2.0 * math.pi))
+
+    return ([mesh] * meshes, "vtx",
+            np.arange(axisDivisions, 2 * axisDivisions), {}, meshes)
+
+CASES = {"grid": gridCase,
+         "cylinder": cylinderCase,
+         "sphereHoles": sphereHolesCase,
+         "noisyLoops": noisyLoopsCase,
+         "manyMeshes": manyMeshesCase}
+
+#+---------------------------------------------------------------------------+
+#|                                 Running                                   |
+#+---------------------------------------------------------------------------+
+
+def selectComponents(names, componentName, elements):
+    """selects the same components on every mesh without building
+    strings"""
+
+    import maya.api.OpenMaya as om
+
+    componentTypes = {"vtx": om.MFn.kMeshVertComponent,
+                      "e": om.MFn.kMeshEdgeComponent,
+                      "f": om.MFn.kMeshPolygonComponent}
+    selection = om.MSelectionList()
+    for name in names:
+        selectionList = om.MSelectionList()
+        selectionList.add(name)
+        mDagPath = selectionList.getDagPath(0)
+        component = om.MFnSingleIndexedComponent()
+        componentObject = component.create(componentTypes[componentName])
+        component.addElements(np.asarray(elements).tolist())
+        selection.add((mDagPath, componentObject))
+
+    om.MGlobal.setActiveSelectionList(selection)
+
+def runCase(cmds, profiler, caseName, size, repeat, threads, warm):
+    """times the command on one case and returns the median of every stage
+
+    Returns:\n
+        dict: the result entry of the case
+    """
+    from topologyCache import topologyCache
+
+    cmds.file(new=True, force=True)
+    mesh, componentName, elements, flags, loops = CASES[caseName](size)
+    # a case on several meshes returns a list of them with the same
+    # components
+    if isinstance(mesh, list):
+        meshes = mesh
+        names = [standalone.createMesh(*item, name="{0}{1}".format(
+            caseName, index)) for index, item in enumerate(meshes)]
+    else:
+        meshes = [mesh]
+        names = [standalone.createMesh(*mesh, name=caseName)]
+
+    totals = []
+    stageRuns = []
+    for run in range(repeat + (1 if warm else 0)):
+        if not warm:
+            topologyCache.clear()
+        selectComponents(names, componentName, elements)
+        profiler.reset()
+        start = time.perf_counter()
+        cmds.circlelize(threads=threads, **flags)
+        total = time.perf_counter() - start
+        cmds.undo()
+        # the first run only fills the caches
+        if warm and run == 0:
+            continue
+        totals.append(total)
+        stageRuns.append(dict(profiler.totals))
+
+    stageNames = sorted(set(stage for stages in stageRuns
+                            for stage in stages))
+    stages = dict((stage, float(np.median([stages.get(stage, 0.0)
+                                           for stages in stageRuns])))
+                  for stage in stageNames)
+    total = float(np.median(totals))
+    stages["other"] = max(0.0, total - sum(stages.values()))
+
+    return {"case": caseName,
+            "loopVertices": int(len(np.unique(elements)) * len(meshes) if
+                                componentName == "vtx" else size),
+            "meshVertices": int(sum(len(item[0]) for item in meshes)),
+            "loops": int(loops),
+            "cachedMeshes": len(topologyCache),
+            "total": total,
+            "stages": stages}
+
+def scalingExponents(results):
+    """calculates for every case, stage and pair of sizes the exponent of
+    the growth t ~ n^exponent
+
+    Returns:\n
+        List[dict]: one entry per case, stage and size step
+    """
+    exponents = []
+    for caseName in sorted(set(result["case"] for result in results)):
+        caseResults = sorted((result for result in results
+                              if result["case"] == caseName),
+                             key=lambda result: result["loopVertices"])
+        for smaller, larger in zip(caseResults[:-1], caseResults[1:]):
+            growth = math.log(float(larger["loopVertices"]) /
+                              smaller["loopVertices"])
+            timings = dict(("stage:" + stage, value)
+                           for stage, value in larger["stages"].items())
+            timings["total"] = larger["total"]
+            for key, value in sorted(timings.items()):
+                previous = smaller["total"] if key == "total" else \
+                    smaller["stages"].get(key[6:], 0.0)
+                if previous < MIN_COMPARED_SECONDS or growth == 0.0:
+                    continue
+                exponent = math.log(max(value, 1e-9) / previous) / growth
+                exponents.append({"case": caseName,
+                                  "timing": key,
+                                  "from": smaller["loopVertices"],
+                                  "to": larger["loopVertices"],
+                                  "exponent": exponent,
+                                  "superlinear": exponent > SCALING_LIMIT})
+    return exponents
+
+def compareResults(results, baseline, tolerance):
+    """compares the results with the results of a baseline file
+
+    Returns:\n
+        List[dict]: every timing which is slower than the tolerance allows
+    """
+    baselineResults = dict(((result["case"], result["loopVertices"]), result)
+                           for result in baseline["results"])
+    regressions = []
+    for result in results:
+        previous = baselineResults.get((result["case"],
+                                        result["loopVertices"]))
+        if previous is None:
+            continue
+        timings = [("total", result["total"], previous["total"])]
+        timings.extend(("stage:" + stage, value,
+                        previous["stages"].get(stage, 0.0))
+                       for stage, value in sorted(result["stages"].items()))
+        for key, value, previousValue in timings:
+            if max(value, previousValue) < MIN_COMPARED_SECONDS:
+                continue
+            ratio = value / max(previousValue, 1e-9)
+            if ratio > tolerance:
+                regressions.append({"case": result["case"],
+                                    "loopVertices": result["loopVertices"],
+                                    "timing": key,
+                                    "baseline": previousValue,
+                                    "current": value,
+                                    "ratio": ratio})
+    return regressions
+
+def printResults(results):
+    stageNames = sorted(set(stage for result in results
+                            for stage in result["stages"]))
+    header = ["case", "loopVerts", "meshVerts", "loops", "total"] + stageNames
+    rows = [[result["case"], str(result["loopVertices"]),
+             str(result["meshVertices"]), str(result["loops"]),
+             "{0:.4f}".format(result["total"])] +
+            ["{0:.4f}".format(result["stages"].get(stage, 0.0))
+             for stage in stageNames] for result in results]
+    widths = [max(len(row[column]) for row in [header] + rows)
+              for column in range(len(header))]
+    for row in [header] + rows:
+        print("  ".join(value.rjust(width)
+                        for value, width in zip(row, widths)))
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().split(
+        "\n")[0], formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES),
+                        default=sorted(CASES))
+    parser.add_argument("--sizes", nargs="+", type=int,
+                        default=list(DEFAULT_SIZES),
+                        help="number of loop vertices of every run")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="runs per case, the median is reported")
+    parser.add_argument("--threads", type=int, default=1,
+                        help="threads of the command, more than one mixes "
+                             "the stage timings of the threads")
+    parser.add_argument("--warm", action="store_true",
+                        help="keep the topology cache between the runs")
+    parser.add_argument("--output", help="json file for the results")
+    parser.add_argument("--compare", help="json file of a baseline run")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="slowdown against the baseline which fails")
+    args = parser.parse_args(arguments)
+
+    cmds = standalone.initialize()
+    plugin = cmds._plugins["Circlelizer.py"]
+    profiler = StageProfiler()
+    profiler.install(plugin)
+
+    results = []
+    try:
+        for caseName in args.cases:
+            for size in args.sizes:
+                result = runCase(cmds, profiler, caseName, size,
+                                 max(1, args.repeat), args.threads,
+                                 args.warm)
+                results.append(result)
+                print("{0} {1}: {2:.4f}s".format(caseName, size,
+                                                 result["total"]))
+                sys.stdout.flush()
+    finally:
+        profiler.uninstall()
+
+    print("")
+    printResults(results)
+    exponents = scalingExponents(results)
+    for entry in exponents:
+        if entry["superlinear"]:
+            print("superlinear: {case} {timing} grows with n^{exponent:.2f} "
+                  "from {from} to {to} loop vertices".format(**entry))
+
+    report = {"meta": {"date": datetime.datetime.now().isoformat(),
+                       "python": platform.python_version(),
+                       "numpy": np.__version__,
+                       "platform": platform.platform(),
+                       "repeat": args.repeat,
+                       "threads": args.threads,
+                       "warm": args.warm},
+              "results": results,
+              "scaling": exponents}
+
+    failed = False
+    if args.compare:
+        with open(args.compare, "r") as baselineFile:
+            baseline = json.load(baselineFile)
+        regressions = compareResults(results, baseline, args.tolerance)
+        report["regressions"] = regressions
+        for entry in regressions:
+            print("regression: {case} {loopVertices} {timing} {baseline:.4f}s"
+                  " -> {current:.4f}s ({ratio:.2f}x)".format(**entry))
+        failed = bool(regressions)
+
+    if args.output:
+        with open(args.output, "w") as outputFile:
+            json.dump(report, outputFile, indent=2, sort_keys=True)
+
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
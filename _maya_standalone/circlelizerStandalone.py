@@ -0,0 +1,231 @@
+"""
+runs the Circlelizer plug-in in plain python without maya. The stand-in of
+maya.api.OpenMaya and maya.cmds in this folder is put in front of the path,
+the plug-in gets loaded and synthetic meshes can be created and circlelized:
+
+    import circlelizerStandalone as standalone
+    cmds = standalone.initialize()
+    grid = standalone.createGrid(16)
+    cmds.select(grid + ".f[100:103]")
+    cmds.circlelize()
+"""
+
+import math
+import os
+import sys
+
+import numpy as np
+
+STANDALONE_PATH = os.path.dirname(os.path.abspath(__file__))
+CIRCLELIZER_PATH = os.path.join(os.path.dirname(STANDALONE_PATH),
+                                "Circlelizer")
+PLUGIN_PATH = os.path.join(CIRCLELIZER_PATH, "plug-ins", "Circlelizer.py")
+
+def initialize():
+    """puts the stand-in, the plug-in scripts and if needed the headless qt
+    onto the path, sets the environment of the module file and loads the
+    plug-in
+
+    Returns:\n
+        module: the stand-in maya.cmds with the plug-in commands
+    """
+    for path in (os.path.join(CIRCLELIZER_PATH, "scripts"), STANDALONE_PATH):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    try:
+        import PySide2.QtWidgets
+    except ImportError:
+        sys.path.append(os.path.join(STANDALONE_PATH, "headless"))
+
+    # the same variables circlelizer.mod defines
+    os.environ.setdefault("CIRCLELIZER_THEMES_PATH",
+                          os.path.join(CIRCLELIZER_PATH, "themes"))
+    os.environ.setdefault("CIRCLELIZER_DOCS_PATH",
+                          os.path.join(CIRCLELIZER_PATH, "docs"))
+    os.environ.setdefault("XBMLANGPATH", os.path.join(CIRCLELIZER_PATH,
+                                                      "icons"))
+
+    import maya.standalone
+    import maya.cmds as cmds
+    maya.standalone.initialize()
+    cmds.loadPlugin(PLUGIN_PATH)
+
+    return cmds
+
+#+---------------------------------------------------------------------------+
+#|                              Synthetic Meshes                             |
+#+---------------------------------------------------------------------------+
+
+def createMesh(points, faceCounts, faceConnects, name=None):
+    """creates a mesh from numpy arrays and returns the name of its
+    transform
+
+    Args:\n
+        points (np.ndarray): (n, 3) vertex positions
+        faceCounts (Sequence[int]): vertex count of every polygon
+        faceConnects (Sequence[int]): vertex id's of all polygons
+        name (str): name of the transform, maya's default if None
+
+    Returns:\n
+        str: name of the transform
+    """
+    import maya.api.OpenMaya as om
+
+    transform = om.MFnMesh().create(om.MPointArray(points), faceCounts,
+                                    faceConnects)
+    if name is not None:
+        transformFn = om.MFnDagNode(transform)
+        transformFn.setName(name)
+        om.MFnDependencyNode(transformFn.child(0)).setName(name + "Shape")
+
+    return om.MFnDependencyNode(transform).name()
+
+def gridMesh(subdivisions, size=1.0):
+    """returns the points and polygons of a quad grid in the xz plane. The
+    vertex of row i and column j has the id i * (subdivisions + 1) + j
+
+    Args:\n
+        subdivisions (int): number of quads along one side
+        size (float): length of one side
+
+    Returns:\n
+        (np.ndarray, np.ndarray, np.ndarray): (n, 3) points, polygon counts
+            and polygon connects
+    """
+    rows = subdivisions + 1
+    coordinates = np.linspace(-0.5 * size, 0.5 * size, rows)
+    x, z = np.meshgrid(coordinates, coordinates)
+    points = np.column_stack((x.ravel(), np.zeros(rows * rows), z.ravel()))
+
+    corners = (np.arange(subdivisions)[:, np.newaxis] * rows +
+               np.arange(subdivisions)[np.newaxis, :]).ravel()
+    faceConnects = np.column_stack((corners, corners + rows,
+                                    corners + rows + 1, corners + 1)).ravel()
+    faceCounts = np.full(subdivisions * subdivisions, 4, dtype=np.intp)
+
+    return points, faceCounts, faceConnects
+
+def cylinderMesh(axisDivisions, heightDivisions, radius=1.0, height=2.0):
+    """returns the points and polygons of an open cylinder around the y axis.
+    Every ring of axisDivisions vertices is an edge loop
+
+    Args:\n
+        axisDivisions (int): number of vertices on one ring
+        heightDivisions (int): number of quad rows
+        radius (float): radius of the rings
+        height (float): height of the cylinder
+
+    Returns:\n
+        (np.ndarray, np.ndarray, np.ndarray): (n, 3) points, polygon counts
+            and polygon connects
+    """
+    angles = np.arange(axisDivisions) * (2.0 * math.pi / axisDivisions)
+    heights = np.linspace(-0.5 * height, 0.5 * height, heightDivisions + 1)
+    points = np.column_stack((
+        np.tile(np.cos(angles) * radius, heightDivisions + 1),
+        np.repeat(heights, axisDivisions),
+        np.tile(-np.sin(angles) * radius, heightDivisions + 1)))
+
+    ring = np.arange(axisDivisions)
+    nextRing = (ring + 1) % axisDivisions
+    rowStarts = np.arange(heightDivisions)[:, np.newaxis] * axisDivisions
+    faceConnects = np.stack((rowStarts + ring, rowStarts + nextRing,
+                             rowStarts + axisDivisions + nextRing,
+                             rowStarts + axisDivisions + ring),
+                            axis=2).ravel()
+    faceCounts = np.full(axisDivisions * heightDivisions, 4, dtype=np.intp)
+
+    return points, faceCounts, faceConnects
+
+def sphereMesh(axisDivisions, heightDivisions, radius=1.0):
+    """returns the points and polygons of a uv sphere with triangle fans at
+    the poles
+
+    Args:\n
+        axisDivisions (int): number of vertices on one ring
+        heightDivisions (int): number of segments from pole to pole
+        radius (float): radius of the sphere
+
+    Returns:\n
+        (np.ndarray, np.ndarray, np.ndarray): (n, 3) points, polygon counts
+            and polygon connects
+    """
+    rings = heightDivisions - 1
+    angles = np.arange(axisDivisions) * (2.0 * math.pi / axisDivisions)
+    polar = np.arange(1, heightDivisions) * (math.pi / heightDivisions)
+    ringPoints = np.column_stack((
+        (np.sin(polar)[:, np.newaxis] * np.cos(angles)).ravel(),
+        np.repeat(np.cos(polar), axisDivisions),
+        (np.sin(polar)[:, np.newaxis] * -np.sin(angles)).ravel())) * radius
+    top = rings * axisDivisions
+    bottom = top + 1
+    points = np.vstack((ringPoints, [(0.0, radius, 0.0),
+                                     (0.0, -radius, 0.0)]))
+
+    ring = np.arange(axisDivisions)
+    nextRing = (ring + 1) % axisDivisions
+    rowStarts = np.arange(rings - 1)[:, np.newaxis] * axisDivisions
+    quads = np.stack((rowStarts + ring, rowStarts + axisDivisions + ring,
+                      rowStarts + axisDivisions + nextRing,
+                      rowStarts + nextRing), axis=2).reshape(-1, 4)
+    topFan = np.column_stack((np.full(axisDivisions, top), ring, nextRing))
+    lastRow = (rings - 1) * axisDivisions
+    bottomFan = np.column_stack((np.full(axisDivisions, bottom),
+                                 lastRow + nextRing, lastRow + ring))
+    faceConnects = np.concatenate((topFan.ravel(), quads.ravel(),
+                                   bottomFan.ravel()))
+    faceCounts = np.concatenate((np.full(axisDivisions, 3), np.full(
+        len(quads), 4), np.full(axisDivisions, 3))).astype(np.intp)
+
+    return points, faceCounts, faceConnects
+
+def createGrid(subdivisions, size=1.0, name=None):
+    """creates a quad grid in the xz plane, see gridMesh"""
+
+    return createMesh(*gridMesh(subdivisions, size), name=name)
+
+def createCylinder(axisDivisions, heightDivisions, radius=1.0, height=2.0,
+                   name=None):
+    """creates an open cylinder around the y axis, see cylinderMesh"""
+
+    return createMesh(*cylinderMesh(axisDivisions, heightDivisions, radius,
+                                    height), name=name)
+
+def createSphere(axisDivisions, heightDivisions, radius=1.0, name=None):
+    """creates a uv sphere, see sphereMesh"""
+
+    return createMesh(*sphereMesh(axisDivisions, heightDivisions, radius),
+                      name=name)
+
+def meshPoints(name):
+    """returns the (n, 3) vertex positions of the mesh"""
+
+    import maya.api.OpenMaya as om
+
+    selectionList = om.MSelectionList()
+    selectionList.add(name)
+    points = om.MFnMesh(selectionList.getDagPath(0)).getPoints()
+    return np.array(points)[:, :3]
+
+if __name__ == "__main__":
+    # circlelizes a square hole of faces in a grid and undoes it again
+    cmds = initialize()
+    grid = createGrid(16, 16.0)
+    before = meshPoints(grid)
+    faces = ["{0}.f[{1}:{2}]".format(grid, row * 16 + 6, row * 16 + 9)
+             for row in range(6, 10)]
+    cmds.select(faces)
+    cmds.circlelize()
+
+    after = meshPoints(grid)
+    moved = np.flatnonzero(np.linalg.norm(after - before, axis=1) > 1e-9)
+    distances = np.linalg.norm(after[moved] - after[moved].mean(axis=0),
+                               axis=1)
+    print("moved {0} vertices onto a circle with radius {1:.4f} "
+          "(deviation {2:.2e})".format(len(moved), distances.mean(),
+                                       distances.std()))
+    print("selection: {0}".format(cmds.ls(selection=True)))
+
+    cmds.undo()
+    print("undo restored the mesh: {0}".format(
+        np.allclose(meshPoints(grid), before)))
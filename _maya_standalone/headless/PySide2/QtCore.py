@@ -0,0 +1,35 @@
+from PySide2 import HeadlessObject, headlessModule
+
+class Signal(object):
+    """per instance signal which calls its connected slots on emit"""
+
+    def __init__(self, *types):
+        self._name = "_signal{0}".format(id(self))
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        bound = instance.__dict__.get(self._name)
+        if bound is None:
+            bound = instance.__dict__[self._name] = BoundSignal()
+        return bound
+
+class BoundSignal(object):
+    def __init__(self):
+        self._slots = []
+
+    def connect(self, slot):
+        self._slots.append(slot)
+
+    def disconnect(self, slot=None):
+        self._slots = [] if slot is None else \
+            [other for other in self._slots if other != slot]
+
+    def emit(self, *args):
+        for slot in list(self._slots):
+            slot(*args)
+
+class QObject(HeadlessObject):
+    pass
+
+__getattr__ = headlessModule(__name__, {})
@@ -0,0 +1,3 @@
+from PySide2 import headlessModule
+
+__getattr__ = headlessModule(__name__, {})
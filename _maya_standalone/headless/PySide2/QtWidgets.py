@@ -0,0 +1,71 @@
+import sys
+
+from PySide2 import HeadlessObject, headlessModule
+
+class QWidget(HeadlessObject):
+    def __init__(self, *args, **kwargs):
+        self._windowTitle = ""
+        self._layout = None
+
+    def setWindowTitle(self, title):
+        self._windowTitle = title
+
+    def windowTitle(self):
+        return self._windowTitle
+
+    def setLayout(self, layout):
+        self._layout = layout
+
+    def layout(self):
+        return self._layout
+
+class QDialog(QWidget):
+    def exec_(self):
+        # the text of the dialog is printed instead of shown
+        texts = []
+        if self._layout is not None:
+            texts = [widget.text() for widget in self._layout.widgets
+                     if isinstance(widget, QLabel) and widget.text()]
+        sys.stderr.write("# {0}: {1}\n".format(self._windowTitle,
+                                               " ".join(texts)))
+        return 0
+
+class QLabel(QWidget):
+    def __init__(self, text="", *args, **kwargs):
+        QWidget.__init__(self)
+        self._text = text if isinstance(text, str) else ""
+
+    def text(self):
+        return self._text
+
+    def setText(self, text):
+        self._text = text
+
+class QLineEdit(QWidget):
+    def __init__(self, text="", *args, **kwargs):
+        QWidget.__init__(self)
+        self._text = text if isinstance(text, str) else ""
+
+    def text(self):
+        return self._text
+
+    def setText(self, text):
+        self._text = text
+
+class QLayout(HeadlessObject):
+    def __init__(self, *args, **kwargs):
+        self.widgets = []
+
+    def addWidget(self, widget, *args, **kwargs):
+        self.widgets.append(widget)
+
+class QGridLayout(QLayout):
+    pass
+
+class QVBoxLayout(QLayout):
+    pass
+
+class QHBoxLayout(QLayout):
+    pass
+
+__getattr__ = headlessModule(__name__, {})
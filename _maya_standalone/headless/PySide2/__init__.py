@@ -0,0 +1,68 @@
+#+---------------------------------------------------------------------------+
+#|                             Headless PySide2                              |
+#|                                                                           |
+#| -> lets the plug-in and its widgets be imported on machines without qt.  |
+#|    Every widget accepts any call and does nothing, dialogs print their    |
+#|    text instead of showing it. It is only put on the path if the real     |
+#|    PySide2 can not be imported                                            |
+#+---------------------------------------------------------------------------+
+
+class HeadlessValue(object):
+    """result of every call and attribute of a headless object"""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __call__(self, *args, **kwargs):
+        return HeadlessValue()
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return HeadlessValue()
+
+    def __bool__(self):
+        return False
+
+    __nonzero__ = __bool__
+
+    def __int__(self):
+        return 0
+
+    def __float__(self):
+        return 0.0
+
+    def __index__(self):
+        return 0
+
+    def __iter__(self):
+        return iter(())
+
+    def __or__(self, other):
+        return self
+
+    __ror__ = __and__ = __rand__ = __add__ = __radd__ = __or__
+
+class HeadlessMeta(type):
+    # class attributes like enums (Qt.AlignCenter) are headless values
+    def __getattr__(cls, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return HeadlessValue()
+
+class HeadlessObject(HeadlessValue, metaclass=HeadlessMeta):
+    """base of every headless qt class, it can be subclassed like a widget"""
+
+def headlessModule(name, classes):
+    """returns the module __getattr__ which creates a headless class for every
+    qt class that is not defined by the module itself"""
+
+    def __getattr__(attribute):
+        if attribute.startswith("__"):
+            raise AttributeError(attribute)
+        if attribute not in classes:
+            classes[attribute] = HeadlessMeta(attribute, (HeadlessObject,),
+                                              {"__module__": name})
+        return classes[attribute]
+
+    return __getattr__
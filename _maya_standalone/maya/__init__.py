@@ -0,0 +1 @@
+# stand-in for the maya package, see api/OpenMaya.py
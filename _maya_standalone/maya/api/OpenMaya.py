@@ -0,0 +1,1993 @@
+import math
+import numbers
+import os
+import uuid
+
+import numpy as np
+
+#+---------------------------------------------------------------------------+
+#|                       Standalone maya.api.OpenMaya                        |
+#|                                                                           |
+#| -> stand-in for the part of the maya python api 2.0 which the Circlelizer |
+#|    plug-in uses. Meshes are kept in a small numpy container inside of a   |
+#|    flat scene, so the real command classes can run on synthetic meshes   |
+#|    in plain CPython. Transforms are always the identity, which makes the  |
+#|    world and the object space the same. It is not a complete api and only |
+#|    follows maya as far as the plug-in depends on it                       |
+#+---------------------------------------------------------------------------+
+
+#+---------------------------------------------------------------------------+
+#|                                Constants                                  |
+#+---------------------------------------------------------------------------+
+
+class MFn(object):
+    kInvalid = 0
+    kDependencyNode = 4
+    kDagNode = 107
+    kTransform = 110
+    kMesh = 296
+    kMeshEdgeComponent = 547
+    kMeshPolygonComponent = 548
+    kMeshVertComponent = 550
+    kSingleIndexedComponent = 704
+    kAttribute = 554
+    kNumericAttribute = 565
+    kPluginDeformerNode = 607
+
+class MSpace(object):
+    kInvalid = 0
+    kTransform = 1
+    kPreTransform = 2
+    kObject = 2
+    kPostTransform = 3
+    kWorld = 4
+
+#+---------------------------------------------------------------------------+
+#|                                   Math                                    |
+#+---------------------------------------------------------------------------+
+
+def _components(args, size, default):
+    """reads the constructor arguments of a math type into a list of floats.
+    A single sequence (or math type) is unpacked, missing values are taken
+    from the default"""
+
+    if len(args) == 1 and not isinstance(args[0], numbers.Number):
+        args = tuple(args[0])
+    values = [float(value) for value in args[:size]]
+    return values + list(default[len(values):size])
+
+class MVector(object):
+    def __init__(self, *args):
+        self.x, self.y, self.z = _components(args, 3, (0.0, 0.0, 0.0))
+
+    def __len__(self):
+        return 3
+
+    def __getitem__(self, index):
+        return (self.x, self.y, self.z)[index]
+
+    def __setitem__(self, index, value):
+        setattr(self, "xyz"[index], float(value))
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.z))
+
+    def __repr__(self):
+        return "{0}({1}, {2}, {3})".format(type(self).__name__, self.x,
+                                           self.y, self.z)
+
+    def __str__(self):
+        return "({0}, {1}, {2})".format(self.x, self.y, self.z)
+
+    def __eq__(self, other):
+        return tuple(self) == tuple(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __neg__(self):
+        return MVector(-self.x, -self.y, -self.z)
+
+    def __add__(self, other):
+        return MVector(self.x + other[0], self.y + other[1],
+                       self.z + other[2])
+
+    def __sub__(self, other):
+        return MVector(self.x - other[0], self.y - other[1],
+                       self.z - other[2])
+
+    def __mul__(self, other):
+        if isinstance(other, MMatrix):
+            return MVector(np.dot(np.append(tuple(self), 0.0),
+                                  other._values)[:3])
+        if isinstance(other, MVector):
+            # like maya the product of two vectors is the dot product
+            return self.x * other.x + self.y * other.y + self.z * other.z
+        return MVector(self.x * other, self.y * other, self.z * other)
+
+    def __rmul__(self, other):
+        return self * other
+
+    def __truediv__(self, other):
+        return MVector(self.x / other, self.y / other, self.z / other)
+
+    __div__ = __truediv__
+
+    def __xor__(self, other):
+        return MVector(np.cross(tuple(self), tuple(other)))
+
+    def length(self):
+        return math.sqrt(self.x * self.x + self.y * self.y + self.z * self.z)
+
+    def normal(self):
+        length = self.length()
+        if length == 0.0:
+            return MVector(self)
+        return self / length
+
+    def normalize(self):
+        self.x, self.y, self.z = self.normal()
+        return self
+
+    def isEquivalent(self, other, tolerance=1e-10):
+        return all(abs(a - b) <= tolerance for a, b in zip(self, other))
+
+    def angle(self, other):
+        lengths = self.length() * MVector(other).length()
+        if lengths == 0.0:
+            return 0.0
+        return math.acos(max(-1.0, min(1.0, self * MVector(other) / lengths)))
+
+    def rotateTo(self, other):
+        return MQuaternion(self, other)
+
+    def rotateBy(self, rotation):
+        return MVector(rotation._rotate(np.array(tuple(self))))
+
+MVector.kZeroVector = MVector(0.0, 0.0, 0.0)
+MVector.kOneVector = MVector(1.0, 1.0, 1.0)
+MVector.kXaxisVector = MVector(1.0, 0.0, 0.0)
+MVector.kYaxisVector = MVector(0.0, 1.0, 0.0)
+MVector.kZaxisVector = MVector(0.0, 0.0, 1.0)
+
+class MFloatVector(MVector):
+    pass
+
+class MPoint(object):
+    def __init__(self, *args):
+        self.x, self.y, self.z, self.w = _components(args, 4,
+                                                     (0.0, 0.0, 0.0, 1.0))
+
+    def __len__(self):
+        return 4
+
+    def __getitem__(self, index):
+        return (self.x, self.y, self.z, self.w)[index]
+
+    def __setitem__(self, index, value):
+        setattr(self, "xyzw"[index], float(value))
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.z, self.w))
+
+    def __repr__(self):
+        return "{0}({1}, {2}, {3}, {4})".format(type(self).__name__, self.x,
+                                                self.y, self.z, self.w)
+
+    def __str__(self):
+        return "({0}, {1}, {2}, {3})".format(self.x, self.y, self.z, self.w)
+
+    def __eq__(self, other):
+        return tuple(self) == tuple(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __add__(self, other):
+        return MPoint(self.x + other[0], self.y + other[1], self.z + other[2])
+
+    def __sub__(self, other):
+        difference = (self.x - other[0], self.y - other[1], self.z - other[2])
+        # point - point is a vector, point - vector is a point again
+        if isinstance(other, MPoint):
+            return MVector(difference)
+        return MPoint(difference)
+
+    def __mul__(self, other):
+        if isinstance(other, MMatrix):
+            return MPoint(np.dot(tuple(self), other._values))
+        return MPoint(self.x * other, self.y * other, self.z * other, self.w)
+
+    def __rmul__(self, other):
+        return self * other
+
+    def distanceTo(self, other):
+        return (MPoint(self).cartesianize() -
+                MPoint(other).cartesianize()).length()
+
+    def cartesianize(self):
+        if self.w not in (0.0, 1.0):
+            self.x, self.y, self.z, self.w = (self.x / self.w, self.y / self.w,
+                                              self.z / self.w, 1.0)
+        return self
+
+    def isEquivalent(self, other, tolerance=1e-10):
+        return all(abs(a - b) <= tolerance for a, b in zip(self, other))
+
+MPoint.kOrigin = MPoint(0.0, 0.0, 0.0)
+
+class MFloatPoint(MPoint):
+    pass
+
+class MQuaternion(object):
+    """rotation as quaternion. Like maya a * b rotates by a and then by b"""
+
+    def __init__(self, *args):
+        self.x, self.y, self.z, self.w = 0.0, 0.0, 0.0, 1.0
+        if len(args) >= 2 and isinstance(args[0], MVector):
+            # shortest rotation from the first onto the second vector
+            self._setRotateTo(args[0], args[1],
+                              args[2] if len(args) > 2 else 1.0)
+        elif len(args) == 2 and isinstance(args[0], numbers.Number):
+            self.setValue(MVector(args[1]), args[0])
+        elif args:
+            self.x, self.y, self.z, self.w = _components(
+                args, 4, (0.0, 0.0, 0.0, 1.0))
+
+    def _setRotateTo(self, source, target, factor):
+        source = np.array(tuple(MVector(source).normal()))
+        target = np.array(tuple(MVector(target).normal()))
+        axis = np.cross(source, target)
+        cosine = max(-1.0, min(1.0, float(np.dot(source, target))))
+        if np.linalg.norm(axis) < 1e-12:
+            if cosine > 0.0:
+                return
+            # opposite vectors rotate around any perpendicular axis
+            axis = np.cross(source, (1.0, 0.0, 0.0))
+            if np.linalg.norm(axis) < 1e-6:
+                axis = np.cross(source, (0.0, 1.0, 0.0))
+        self.setValue(MVector(axis), math.acos(cosine) * factor)
+
+    def setValue(self, axis, angle):
+        axis = MVector(axis).normal()
+        sine = math.sin(angle * 0.5)
+        self.x, self.y, self.z = axis.x * sine, axis.y * sine, axis.z * sine
+        self.w = math.cos(angle * 0.5)
+        return self
+
+    def __len__(self):
+        return 4
+
+    def __getitem__(self, index):
+        return (self.x, self.y, self.z, self.w)[index]
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.z, self.w))
+
+    def __repr__(self):
+        return "MQuaternion({0}, {1}, {2}, {3})".format(self.x, self.y,
+                                                        self.z, self.w)
+
+    def __mul__(self, other):
+        # hamilton product other * self, so self is applied first
+        x1, y1, z1, w1 = other
+        x2, y2, z2, w2 = self
+        return MQuaternion(w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2,
+                           w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2,
+                           w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2,
+                           w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2)
+
+    def conjugate(self):
+        return MQuaternion(-self.x, -self.y, -self.z, self.w)
+
+    def inverse(self):
+        squaredLength = sum(value * value for value in self)
+        return MQuaternion([value / squaredLength
+                            for value in self.conjugate()])
+
+    def normal(self):
+        length = math.sqrt(sum(value * value for value in self))
+        return MQuaternion([value / length for value in self])
+
+    def asAxisAngle(self):
+        quaternion = self.normal()
+        angle = 2.0 * math.acos(max(-1.0, min(1.0, quaternion.w)))
+        sine = math.sqrt(max(0.0, 1.0 - quaternion.w * quaternion.w))
+        if sine < 1e-12:
+            return MVector(0.0, 0.0, 1.0), 0.0
+        return MVector(quaternion.x / sine, quaternion.y / sine,
+                       quaternion.z / sine), angle
+
+    def _rotate(self, vectors):
+        vectors = np.asarray(vectors, dtype=np.float64)
+        quaternion = self.normal()
+        axis = np.array((quaternion.x, quaternion.y, quaternion.z))
+        twice = 2.0 * np.cross(axis, vectors)
+        return vectors + quaternion.w * twice + np.cross(axis, twice)
+
+    def asMatrix(self):
+        # the rows are the rotated axes, maya multiplies row vectors
+        values = np.identity(4)
+        values[:3, :3] = self._rotate(np.identity(3))
+        return MMatrix(values)
+
+MQuaternion.kIdentity = MQuaternion()
+
+class MMatrix(object):
+    def __init__(self, values=None):
+        if values is None:
+            self._values = np.identity(4)
+        elif isinstance(values, MMatrix):
+            self._values = values._values.copy()
+        else:
+            self._values = np.array(values, dtype=np.float64).reshape(4, 4)
+
+    def __len__(self):
+        return 16
+
+    def __getitem__(self, index):
+        if isinstance(index, tuple):
+            return float(self._values[index])
+        return float(self._values.flat[index])
+
+    def __setitem__(self, index, value):
+        if isinstance(index, tuple):
+            self._values[index] = value
+        else:
+            self._values.flat[index] = value
+
+    def __iter__(self):
+        return iter(self._values.flatten().tolist())
+
+    def __repr__(self):
+        return "MMatrix({0})".format(self._values.tolist())
+
+    def __eq__(self, other):
+        return np.array_equal(self._values, MMatrix(other)._values)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __mul__(self, other):
+        if isinstance(other, MMatrix):
+            return MMatrix(np.dot(self._values, other._values))
+        return MMatrix(self._values * other)
+
+    def getElement(self, row, column):
+        return float(self._values[row, column])
+
+    def setElement(self, row, column, value):
+        self._values[row, column] = value
+
+    def transpose(self):
+        return MMatrix(self._values.T)
+
+    def inverse(self):
+        return MMatrix(np.linalg.inv(self._values))
+
+    def isEquivalent(self, other, tolerance=1e-10):
+        return np.allclose(self._values, MMatrix(other)._values, rtol=0.0,
+                           atol=tolerance)
+
+MMatrix.kIdentity = MMatrix()
+
+class MBoundingBox(object):
+    def __init__(self, corner1=None, corner2=None):
+        self._min = None
+        self._max = None
+        if corner1 is not None:
+            self.expand(corner1)
+        if corner2 is not None:
+            self.expand(corner2)
+
+    def expand(self, point):
+        point = np.array(tuple(point)[:3], dtype=np.float64)
+        if self._min is None:
+            self._min, self._max = point, point.copy()
+        else:
+            self._min = np.minimum(self._min, point)
+            self._max = np.maximum(self._max, point)
+
+    def _extent(self, axis):
+        return 0.0 if self._min is None else \
+            float(self._max[axis] - self._min[axis])
+
+    @property
+    def min(self):
+        return MPoint(np.zeros(3) if self._min is None else self._min)
+
+    @property
+    def max(self):
+        return MPoint(np.zeros(3) if self._max is None else self._max)
+
+    @property
+    def center(self):
+        if self._min is None:
+            return MPoint()
+        return MPoint((self._min + self._max) * 0.5)
+
+    @property
+    def width(self):
+        return self._extent(0)
+
+    @property
+    def height(self):
+        return self._extent(1)
+
+    @property
+    def depth(self):
+        return self._extent(2)
+
+    def contains(self, point):
+        if self._min is None:
+            return False
+        point = np.array(tuple(point)[:3])
+        return bool((point >= self._min).all() and (point <= self._max).all())
+
+#+---------------------------------------------------------------------------+
+#|                                  Arrays                                   |
+#+---------------------------------------------------------------------------+
+
+class _NumberArray(list):
+    _type = float
+
+    def __init__(self, *args):
+        if len(args) == 2:
+            list.__init__(self, [self._type(args[1])] * int(args[0]))
+        elif len(args) == 1 and isinstance(args[0], numbers.Integral):
+            list.__init__(self, [self._type(0)] * int(args[0]))
+        elif args:
+            list.__init__(self, [self._type(value) for value in args[0]])
+
+class MIntArray(_NumberArray):
+    _type = int
+
+class MDoubleArray(_NumberArray):
+    pass
+
+class MFloatArray(_NumberArray):
+    pass
+
+class _RowArray(object):
+    """array of math types which keeps its rows in one numpy array, so the
+    bulk conversions to and from numpy stay cheap"""
+
+    _itemType = None
+    _width = 3
+    _fill = (0.0, 0.0, 0.0)
+
+    def __init__(self, *args):
+        if not args:
+            self._values = np.zeros((0, self._width))
+        elif isinstance(args[0], numbers.Integral):
+            self._values = np.tile(self._row(args[1] if len(args) > 1
+                                             else self._fill),
+                                   (int(args[0]), 1))
+        elif isinstance(args[0], _RowArray):
+            self._values = self._rows(args[0]._values)
+        else:
+            items = args[0]
+            try:
+                values = np.array(items, dtype=np.float64)
+            except (TypeError, ValueError):
+                values = np.array([tuple(item) for item in items],
+                                  dtype=np.float64)
+            self._values = self._rows(values.reshape(len(values), -1))
+
+    def _rows(self, values):
+        """adapts (n, 3) or (n, 4) values to the width of the array"""
+
+        values = np.asarray(values, dtype=np.float64)
+        if values.shape[1] == self._width:
+            return values.copy()
+        if values.shape[1] > self._width:
+            return values[:, :self._width].copy()
+        rows = np.tile(np.asarray(self._fill, dtype=np.float64),
+                       (len(values), 1))
+        rows[:, :values.shape[1]] = values
+        return rows
+
+    def _row(self, item):
+        return self._rows(np.array([tuple(item)], dtype=np.float64))[0]
+
+    def __len__(self):
+        return len(self._values)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self._values)
+        if not 0 <= index < len(self._values):
+            raise IndexError("array index out of range")
+        return self._itemType(self._values[index])
+
+    def __setitem__(self, index, item):
+        self._values[index] = self._row(item)
+
+    def __iter__(self):
+        for row in self._values:
+            yield self._itemType(row)
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is None:
+            return self._values.copy()
+        return self._values.astype(dtype)
+
+    def __repr__(self):
+        return "{0}({1})".format(type(self).__name__, self._values.tolist())
+
+    def append(self, item):
+        self._values = np.vstack((self._values, self._row(item)))
+
+    def clear(self):
+        self._values = np.zeros((0, self._width))
+
+    def setLength(self, length):
+        if length <= len(self._values):
+            self._values = self._values[:length].copy()
+        else:
+            self._values = np.vstack((self._values, np.tile(
+                self._row(self._fill), (length - len(self._values), 1))))
+
+    def copy(self, source):
+        self._values = self._rows(source._values)
+        return self
+
+class MPointArray(_RowArray):
+    _itemType = MPoint
+    _width = 4
+    _fill = (0.0, 0.0, 0.0, 1.0)
+
+class MFloatPointArray(MPointArray):
+    _itemType = MFloatPoint
+
+class MVectorArray(_RowArray):
+    _itemType = MVector
+
+class MFloatVectorArray(MVectorArray):
+    _itemType = MFloatVector
+
+#+---------------------------------------------------------------------------+
+#|                               Scene Content                               |
+#+---------------------------------------------------------------------------+
+
+class _MeshData(object):
+    """the mesh container: vertex positions, polygons and the edges which are
+    derived from the polygons in the order of their first appearance"""
+
+    def __init__(self, points, faceCounts, faceConnects):
+        self.points = np.array(points, dtype=np.float64).reshape(-1, 3)
+        self.faceCounts = np.asarray(faceCounts, dtype=np.intp)
+        self.faceConnects = np.asarray(faceConnects, dtype=np.intp)
+        if self.faceCounts.sum() != len(self.faceConnects):
+            raise RuntimeError("(kInvalidParameter): polygon counts do not "
+                               "match the polygon connects")
+        if len(self.faceConnects) and (
+                self.faceConnects.min() < 0 or
+                self.faceConnects.max() >= len(self.points)):
+            raise RuntimeError("(kInvalidParameter): polygon connects out of "
+                               "range")
+        self.faceOffsets = np.zeros(len(self.faceCounts) + 1, dtype=np.intp)
+        np.cumsum(self.faceCounts, out=self.faceOffsets[1:])
+        self._buildEdges()
+        self._buildTriangles()
+
+    def _buildEdges(self):
+        cornerFaces = np.repeat(np.arange(len(self.faceCounts)),
+                                self.faceCounts)
+        # the next corner inside of every polygon
+        nextCorners = np.arange(len(self.faceConnects)) + 1
+        lastCorners = self.faceOffsets[1:] - 1
+        nextCorners[lastCorners] = self.faceOffsets[:-1]
+        first = self.faceConnects
+        second = self.faceConnects[nextCorners]
+
+        keys = np.minimum(first, second) * len(self.points) + \
+            np.maximum(first, second)
+        uniqueKeys, firstCorners, cornerEdges = np.unique(
+            keys, return_index=True, return_inverse=True)
+        # the edge ids follow the first appearance inside of the polygons
+        order = np.argsort(firstCorners, kind="mergesort")
+        edgeIds = np.empty(len(order), dtype=np.intp)
+        edgeIds[order] = np.arange(len(order))
+
+        self.cornerEdges = edgeIds[cornerEdges.ravel()]
+        self.cornerFaces = cornerFaces
+        self.edgeVertices = np.column_stack(
+            (first[firstCorners[order]], second[firstCorners[order]]))
+        self.edgeFaceCounts = np.bincount(self.cornerEdges,
+                                          minlength=len(order))
+
+    def _buildTriangles(self):
+        # every polygon is triangulated as fan around its first vertex
+        triangleCounts = np.maximum(self.faceCounts - 2, 0)
+        faces = np.repeat(np.arange(len(self.faceCounts)), triangleCounts)
+        triangleOffsets = np.zeros(len(faces), dtype=np.intp)
+        if len(faces):
+            starts = np.zeros(len(self.faceCounts), dtype=np.intp)
+            np.cumsum(triangleCounts[:-1], out=starts[1:])
+            triangleOffsets = np.arange(len(faces)) - starts[faces]
+        base = self.faceOffsets[faces]
+        self.triangleCounts = triangleCounts
+        self.triangleFaces = faces
+        self.triangles = np.column_stack((
+            self.faceConnects[base],
+            self.faceConnects[base + triangleOffsets + 1],
+            self.faceConnects[base + triangleOffsets + 2])).reshape(-1, 3)
+
+    @property
+    def numVertices(self):
+        return len(self.points)
+
+    @property
+    def numEdges(self):
+        return len(self.edgeVertices)
+
+    @property
+    def numPolygons(self):
+        return len(self.faceCounts)
+
+    def faceVertices(self, face):
+        return self.faceConnects[self.faceOffsets[face]:
+                                 self.faceOffsets[face + 1]]
+
+    def faceAreaVectors(self):
+        """returns the (f, 3) newell normal of every polygon scaled by its
+        area"""
+
+        if len(self.faceCounts) == 0:
+            return np.zeros((0, 3))
+        nextCorners = np.arange(len(self.faceConnects)) + 1
+        nextCorners[self.faceOffsets[1:] - 1] = self.faceOffsets[:-1]
+        corners = self.points[self.faceConnects]
+        crosses = np.cross(corners, corners[nextCorners])
+        return 0.5 * np.add.reduceat(crosses, self.faceOffsets[:-1], axis=0)
+
+    def vertexNormals(self):
+        """returns the (n, 3) area weighted average of the adjacent polygon
+        normals"""
+
+        cornerNormals = self.faceAreaVectors()[self.cornerFaces]
+        normals = np.empty((self.numVertices, 3))
+        for axis in range(3):
+            normals[:, axis] = np.bincount(self.faceConnects,
+                                           weights=cornerNormals[:, axis],
+                                           minlength=self.numVertices)
+        lengths = np.linalg.norm(normals, axis=1)
+        hasLength = lengths > 0.0
+        normals[hasLength] /= lengths[hasLength, np.newaxis]
+        normals[~hasLength] = (0.0, 1.0, 0.0)
+        return normals
+
+class _Node(object):
+    """dependency or dag node of the scene"""
+
+    def __init__(self, name, typeName, apiType):
+        self.name = name
+        self.typeName = typeName
+        self.apiType = apiType
+        self.uuid = str(uuid.uuid4()).upper()
+        self.parent = None
+        self.children = []
+
+class _MeshNode(_Node):
+    def __init__(self, name, data):
+        _Node.__init__(self, name, "mesh", MFn.kMesh)
+        self.data = data
+
+class _Component(object):
+    def __init__(self, apiType, elements=()):
+        self.apiType = apiType
+        self.elements = sorted(set(int(element) for element in elements))
+
+class _Attribute(object):
+    def __init__(self, longName, shortName, dataType, default):
+        self.longName = longName
+        self.shortName = shortName
+        self.dataType = dataType
+        self.default = default
+        self.properties = {}
+
+# every node of the scene in the order of its creation
+_nodes = []
+
+def _uniqueName(name):
+    """appends (or increases) a number until no other node has the name"""
+
+    names = set(node.name for node in _nodes)
+    if name not in names:
+        return name
+    base = name.rstrip("0123456789")
+    index = 1
+    while "{0}{1}".format(base, index) in names:
+        index += 1
+    return "{0}{1}".format(base, index)
+
+def _findNodes(name):
+    """returns the nodes with the given name or dag path"""
+
+    parts = [part for part in name.split("|") if part]
+    if not parts:
+        return []
+    found = []
+    for node in _nodes:
+        path = []
+        current = node
+        while current is not None:
+            path.insert(0, current.name)
+            current = current.parent
+        if path[-len(parts):] == parts and (not name.startswith("|") or
+                                             len(path) == len(parts)):
+            found.append(node)
+    return found
+
+def _removeNode(node):
+    for child in list(node.children):
+        _removeNode(child)
+    _callbacks.notify("preRemoval", node, MObject(node))
+    if node.parent is not None:
+        node.parent.children.remove(node)
+    _nodes.remove(node)
+
+def _clearScene():
+    for node in [node for node in _nodes if node.parent is None]:
+        _removeNode(node)
+
+#+---------------------------------------------------------------------------+
+#|                             Objects and Paths                             |
+#+---------------------------------------------------------------------------+
+
+class MObject(object):
+    def __init__(self, other=None):
+        self._payload = other._payload if isinstance(other, MObject) else \
+            other
+
+    def __eq__(self, other):
+        return isinstance(other, MObject) and self._payload is other._payload
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return id(self._payload)
+
+    def isNull(self):
+        return self._payload is None
+
+    def apiType(self):
+        if self._payload is None:
+            return MFn.kInvalid
+        return self._payload.apiType
+
+    def hasFn(self, fnType):
+        apiType = self.apiType()
+        if apiType == fnType:
+            return True
+        if isinstance(self._payload, _Node):
+            if fnType == MFn.kDependencyNode:
+                return True
+            if fnType == MFn.kDagNode:
+                return apiType in (MFn.kTransform, MFn.kMesh)
+        if isinstance(self._payload, _Component):
+            return fnType == MFn.kSingleIndexedComponent
+        return False
+
+MObject.kNullObj = MObject()
+
+class MDagPath(object):
+    def __init__(self, other=None):
+        self._nodes = list(other._nodes) if other is not None else []
+
+    @staticmethod
+    def getAPathTo(mObject):
+        node = mObject._payload
+        if not isinstance(node, _Node) or node.apiType not in (MFn.kTransform,
+                                                               MFn.kMesh):
+            raise RuntimeError("(kInvalidParameter): Object is incompatible "
+                               "with this method")
+        path = MDagPath()
+        while node is not None:
+            path._nodes.insert(0, node)
+            node = node.parent
+        return path
+
+    def __eq__(self, other):
+        return isinstance(other, MDagPath) and self._nodes == other._nodes
+
+    def __ne__(self, other):
+        return not self == other
+
+    def _last(self):
+        if not self._nodes:
+            raise RuntimeError("(kFailure): Object does not exist")
+        return self._nodes[-1]
+
+    def isValid(self):
+        return bool(self._nodes) and all(node in _nodes
+                                         for node in self._nodes)
+
+    def length(self):
+        return len(self._nodes) - 1
+
+    def node(self):
+        return MObject(self._last())
+
+    def transform(self):
+        for node in reversed(self._nodes):
+            if node.apiType == MFn.kTransform:
+                return MObject(node)
+        raise RuntimeError("(kFailure): Object does not exist")
+
+    def apiType(self):
+        return self._last().apiType
+
+    def hasFn(self, fnType):
+        return self.node().hasFn(fnType)
+
+    def extendToShape(self):
+        last = self._last()
+        if last.apiType == MFn.kTransform:
+            shapes = [child for child in last.children
+                      if child.apiType == MFn.kMesh]
+            if len(shapes) != 1:
+                raise RuntimeError("(kFailure): Object does not have a unique "
+                                   "shape")
+            self._nodes.append(shapes[0])
+        return self
+
+    def fullPathName(self):
+        return "|" + "|".join(node.name for node in self._nodes)
+
+    def partialPathName(self):
+        return self._last().name
+
+    def __str__(self):
+        return self.fullPathName()
+
+def _meshNodeOf(target):
+    """returns the mesh node of an MDagPath or MObject, paths to transforms
+    are extended to their shape"""
+
+    if isinstance(target, MDagPath):
+        target = MDagPath(target).extendToShape().node()
+    node = target._payload if isinstance(target, MObject) else None
+    if not isinstance(node, _MeshNode):
+        raise RuntimeError("(kInvalidParameter): Object is incompatible with "
+                           "this method")
+    return node
+
+#+---------------------------------------------------------------------------+
+#|                               Function Sets                               |
+#+---------------------------------------------------------------------------+
+
+class MUuid(object):
+    def __init__(self, value=None):
+        self._value = value
+
+    def valid(self):
+        return self._value is not None
+
+    def asString(self):
+        return self._value or ""
+
+class MFnDependencyNode(object):
+    def __init__(self, mObject=None):
+        self._node = None
+        if mObject is not None:
+            self.setObject(mObject)
+
+    def setObject(self, mObject):
+        if not isinstance(mObject._payload, _Node):
+            raise RuntimeError("(kInvalidParameter): Object is incompatible "
+                               "with this method")
+        self._node = mObject._payload
+
+    def object(self):
+        return MObject(self._node)
+
+    @property
+    def typeName(self):
+        return self._node.typeName
+
+    def name(self):
+        return self._node.name
+
+    def setName(self, name):
+        self._node.name = name if self._node.name == name else \
+            _uniqueName(name)
+        return self._node.name
+
+    def uuid(self):
+        return MUuid(self._node.uuid)
+
+class MFnDagNode(MFnDependencyNode):
+    def __init__(self, target=None):
+        if isinstance(target, MDagPath):
+            target = target.node()
+        MFnDependencyNode.__init__(self, target)
+
+    def getPath(self):
+        return MDagPath.getAPathTo(self.object())
+
+    def fullPathName(self):
+        return self.getPath().fullPathName()
+
+    def partialPathName(self):
+        return self._node.name
+
+    def childCount(self):
+        return len(self._node.children)
+
+    def child(self, index):
+        return MObject(self._node.children[index])
+
+    def parentCount(self):
+        return 0 if self._node.parent is None else 1
+
+    def parent(self, index):
+        return MObject(self._node.parent)
+
+class MFnSingleIndexedComponent(object):
+    def __init__(self, mObject=None):
+        self._component = None
+        if mObject is not None:
+            if not isinstance(mObject._payload, _Component):
+                raise RuntimeError("(kInvalidParameter): Object is "
+                                   "incompatible with this method")
+            self._component = mObject._payload
+
+    def create(self, componentType):
+        self._component = _Component(componentType)
+        return MObject(self._component)
+
+    def object(self):
+        return MObject(self._component)
+
+    @property
+    def componentType(self):
+        return self._component.apiType
+
+    @property
+    def elementCount(self):
+        return len(self._component.elements)
+
+    def element(self, index):
+        return self._component.elements[index]
+
+    def addElement(self, element):
+        return self.addElements([element])
+
+    def addElements(self, elements):
+        merged = set(self._component.elements)
+        merged.update(int(element) for element in elements)
+        self._component.elements = sorted(merged)
+        return self
+
+    def getElements(self):
+        return MIntArray(self._component.elements)
+
+class MFnMesh(object):
+    def __init__(self, target=None):
+        self._node = None
+        if target is not None:
+            self.setObject(target)
+
+    def setObject(self, target):
+        self._node = _meshNodeOf(target)
+
+    def object(self):
+        return MObject(self._node)
+
+    def create(self, vertices, polygonCounts, polygonConnects, uValues=None,
+               vValues=None, parent=MObject.kNullObj):
+        """creates a new mesh under a new transform and returns the
+        transform"""
+
+        data = _MeshData(np.array(vertices, dtype=np.float64)[:, :3],
+                         polygonCounts, polygonConnects)
+        transform = parent._payload
+        if transform is None:
+            transform = _Node(_uniqueName("polySurface1"), "transform",
+                              MFn.kTransform)
+            _nodes.append(transform)
+        shapeName = transform.name.rstrip("0123456789")
+        shapeName += "Shape" + transform.name[len(shapeName):]
+        self._node = _MeshNode(_uniqueName(shapeName), data)
+        self._node.parent = transform
+        transform.children.append(self._node)
+        _nodes.append(self._node)
+        return MObject(transform)
+
+    @property
+    def _data(self):
+        return self._node.data
+
+    @property
+    def numVertices(self):
+        return self._data.numVertices
+
+    @property
+    def numEdges(self):
+        return self._data.numEdges
+
+    @property
+    def numPolygons(self):
+        return self._data.numPolygons
+
+    @property
+    def numFaceVertices(self):
+        return len(self._data.faceConnects)
+
+    @property
+    def boundingBox(self):
+        box = MBoundingBox()
+        if self.numVertices:
+            box.expand(self._data.points.min(axis=0))
+            box.expand(self._data.points.max(axis=0))
+        return box
+
+    def _changed(self):
+        _callbacks.notify("dirtyPlug", self._node, MObject(self._node),
+                          MPlug(self._node, "outMesh"))
+
+    def getPoints(self, space=MSpace.kObject):
+        return MPointArray(self._data.points)
+
+    def setPoints(self, points, space=MSpace.kObject):
+        values = np.array(points, dtype=np.float64)
+        if len(values) != self.numVertices:
+            raise RuntimeError("(kInvalidParameter): the number of points "
+                               "does not match the mesh")
+        self._data.points = np.ascontiguousarray(values[:, :3])
+        self._changed()
+
+    def getPoint(self, vertexId, space=MSpace.kObject):
+        return MPoint(self._data.points[vertexId])
+
+    def setPoint(self, vertexId, point, space=MSpace.kObject):
+        self._data.points[vertexId] = tuple(point)[:3]
+        self._changed()
+
+    def getVertexNormals(self, angleWeighted, space=MSpace.kObject):
+        return MFloatVectorArray(self._data.vertexNormals())
+
+    def getVertexNormal(self, vertexId, angleWeighted,
+                        space=MSpace.kObject):
+        # only the adjacent polygons are taken into account
+        data = self._data
+        faces = data.cornerFaces[data.faceConnects == vertexId]
+        areaVectors = data.faceAreaVectors()[faces]
+        normal = MFloatVector(areaVectors.sum(axis=0))
+        if normal.length() == 0.0:
+            return MFloatVector(0.0, 1.0, 0.0)
+        return normal.normalize()
+
+    def getVertices(self):
+        return (MIntArray(self._data.faceCounts.tolist()),
+                MIntArray(self._data.faceConnects.tolist()))
+
+    def getPolygonVertices(self, polygonId):
+        return MIntArray(self._data.faceVertices(polygonId).tolist())
+
+    def getEdgeVertices(self, edgeId):
+        return tuple(self._data.edgeVertices[edgeId].tolist())
+
+    def getTriangles(self):
+        return (MIntArray(self._data.triangleCounts.tolist()),
+                MIntArray(self._data.triangles.ravel().tolist()))
+
+    def autoUniformGridParams(self):
+        return MMeshIsectAccelParams()
+
+    def closestIntersection(self, raySource, rayDirection, space, maxParam,
+                            testBothDirections, faceIds=None, triIds=None,
+                            idsSorted=False, accelParams=None,
+                            tolerance=1e-6):
+        """returns the hit point, the ray parameter, the face, the triangle
+        and the barycentric coordinates of the closest hit. The face is -1 if
+        the ray does not hit the mesh"""
+
+        data = self._data
+        corners = data.points[data.triangles]
+        origin = np.array(tuple(raySource)[:3], dtype=np.float64)
+        direction = np.array(tuple(rayDirection)[:3], dtype=np.float64)
+
+        edge1 = corners[:, 1] - corners[:, 0]
+        edge2 = corners[:, 2] - corners[:, 0]
+        pvec = np.cross(direction, edge2)
+        determinant = np.einsum("ij,ij->i", edge1, pvec)
+        isValid = np.abs(determinant) > 1e-12
+        inverse = np.where(isValid, 1.0 / np.where(isValid, determinant, 1.0),
+                           0.0)
+        tvec = origin - corners[:, 0]
+        u = np.einsum("ij,ij->i", tvec, pvec) * inverse
+        qvec = np.cross(tvec, edge1)
+        v = np.dot(qvec, direction) * inverse
+        params = np.einsum("ij,ij->i", edge2, qvec) * inverse
+
+        isHit = isValid & (u >= -tolerance) & (v >= -tolerance) & \
+            (u + v <= 1.0 + tolerance) & (np.abs(params) <= maxParam)
+        if not testBothDirections:
+            isHit &= params >= 0.0
+        if faceIds is not None:
+            isHit &= np.isin(data.triangleFaces, list(faceIds))
+        if not isHit.any():
+            return (MFloatPoint(), 0.0, -1, -1, 0.0, 0.0)
+
+        hits = np.flatnonzero(isHit)
+        triangle = hits[np.argmin(np.abs(params[hits]))]
+        param = float(params[triangle])
+        face = int(data.triangleFaces[triangle])
+        # the triangle id is local to its polygon like in maya
+        localTriangle = triangle - int(np.searchsorted(
+            data.triangleFaces, face))
+        return (MFloatPoint(origin + param * direction), param, face,
+                localTriangle, float(u[triangle]), float(v[triangle]))
+
+    def getClosestPoint(self, point, space=MSpace.kObject):
+        position, triangle = _closestPointOnTriangles(
+            np.array(tuple(point)[:3], dtype=np.float64),
+            self._data.points[self._data.triangles])
+        return MPoint(position), int(self._data.triangleFaces[triangle])
+
+def _closestPointOnTriangles(point, corners):
+    """returns the closest point on (t, 3, 3) triangles and the triangle it
+    lies on. The regions of every triangle are tested at once"""
+
+    a, b, c = corners[:, 0], corners[:, 1], corners[:, 2]
+    ab = b - a
+    ac = c - a
+    dot = lambda first, second: np.einsum("ij,ij->i", first, second)
+    ap = point - a
+    d1 = dot(ab, ap)
+    d2 = dot(ac, ap)
+    bp = point - b
+    d3 = dot(ab, bp)
+    d4 = dot(ac, bp)
+    cp = point - c
+    d5 = dot(ab, cp)
+    d6 = dot(ac, cp)
+    va = d3 * d6 - d5 * d4
+    vb = d5 * d2 - d1 * d6
+    vc = d1 * d4 - d3 * d2
+
+    safe = lambda values: np.where(values == 0.0, 1.0, values)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        denominator = 1.0 / safe(va + vb + vc)
+        closest = a + ab * (vb * denominator)[:, np.newaxis] + \
+            ac * (vc * denominator)[:, np.newaxis]
+        # the regions are applied from the lowest to the highest priority
+        regions = (
+            ((va <= 0.0) & (d4 - d3 >= 0.0) & (d5 - d6 >= 0.0),
+             b + (c - b) * ((d4 - d3) / safe((d4 - d3) + (d5 - d6)))[
+                 :, np.newaxis]),
+            ((vb <= 0.0) & (d2 >= 0.0) & (d6 <= 0.0),
+             a + ac * (d2 / safe(d2 - d6))[:, np.newaxis]),
+            ((d6 >= 0.0) & (d5 <= d6), c),
+            ((vc <= 0.0) & (d1 >= 0.0) & (d3 <= 0.0),
+             a + ab * (d1 / safe(d1 - d3))[:, np.newaxis]),
+            ((d3 >= 0.0) & (d4 <= d3), b),
+            ((d1 <= 0.0) & (d2 <= 0.0), a))
+        for isRegion, region in regions:
+            closest = np.where(isRegion[:, np.newaxis], region, closest)
+
+    triangle = int(np.argmin(np.linalg.norm(closest - point, axis=1)))
+    return closest[triangle], triangle
+
+class MMeshIsectAccelParams(object):
+    pass
+
+class MPointOnMesh(object):
+    def __init__(self, point, normal, face, triangle):
+        self.point = point
+        self.normal = normal
+        self.face = face
+        self.triangle = triangle
+
+class MMeshIntersector(object):
+    """closest point queries on a snapshot of the mesh at creation time"""
+
+    def __init__(self):
+        self._corners = None
+        self._triangleFaces = None
+        self._faceNormals = None
+
+    @property
+    def isCreated(self):
+        return self._corners is not None
+
+    def create(self, mObject, matrix=None):
+        data = _meshNodeOf(mObject).data
+        corners = data.points[data.triangles]
+        if matrix is not None:
+            homogeneous = np.concatenate(
+                (corners, np.ones(corners.shape[:2] + (1,))), axis=2)
+            corners = np.dot(homogeneous, MMatrix(matrix)._values)[..., :3]
+        self._corners = corners
+        self._triangleFaces = data.triangleFaces.copy()
+        areaVectors = data.faceAreaVectors()
+        lengths = np.linalg.norm(areaVectors, axis=1)[:, np.newaxis]
+        self._faceNormals = areaVectors / np.where(lengths > 0.0, lengths,
+                                                   1.0)
+
+    def getClosestPoint(self, point, maxDistance=float("inf")):
+        if self._corners is None:
+            raise RuntimeError("(kFailure): the intersector was not created")
+        position, triangle = _closestPointOnTriangles(
+            np.array(tuple(point)[:3], dtype=np.float64), self._corners)
+        point = np.array(tuple(point)[:3], dtype=np.float64)
+        if np.linalg.norm(position - point) > maxDistance:
+            raise RuntimeError("(kFailure): no point inside of the distance")
+        face = int(self._triangleFaces[triangle])
+        return MPointOnMesh(MFloatPoint(position),
+                            MFloatVector(self._faceNormals[face]), face,
+                            triangle - int(np.searchsorted(
+                                self._triangleFaces, face)))
+
+#+---------------------------------------------------------------------------+
+#|                                 Iterators                                 |
+#+---------------------------------------------------------------------------+
+
+class _ComponentIterator(object):
+    """walks over the elements of a component or over every element of the
+    mesh if no component is given"""
+
+    _componentType = None
+
+    def __init__(self, target, component=None):
+        self._node = _meshNodeOf(target)
+        if component is None or component.isNull():
+            self._elements = list(range(self._count()))
+        else:
+            if component.apiType() != self._componentType:
+                raise RuntimeError("(kInvalidParameter): Object is "
+                                   "incompatible with this method")
+            self._elements = list(component._payload.elements)
+        self._position = 0
+
+    @property
+    def _data(self):
+        return self._node.data
+
+    def _count(self):
+        raise NotImplementedError
+
+    def count(self):
+        return len(self._elements)
+
+    def isDone(self):
+        return self._position >= len(self._elements)
+
+    def next(self, *args):
+        self._position += 1
+
+    def reset(self):
+        self._position = 0
+
+    def index(self):
+        return self._elements[self._position]
+
+    def setIndex(self, index):
+        self._position = self._elements.index(index)
+        return index
+
+class MItMeshVertex(_ComponentIterator):
+    _componentType = MFn.kMeshVertComponent
+
+    def _count(self):
+        return self._data.numVertices
+
+    def position(self, space=MSpace.kObject):
+        return MPoint(self._data.points[self.index()])
+
+    def setPosition(self, point, space=MSpace.kObject):
+        MFnMesh(MObject(self._node)).setPoint(self.index(), point)
+
+    def getNormal(self, space=MSpace.kObject):
+        return MFnMesh(MObject(self._node)).getVertexNormal(self.index(),
+                                                            False)
+
+    def getConnectedVertices(self):
+        edges = self._data.edgeVertices
+        index = self.index()
+        neighbours = np.concatenate((edges[edges[:, 0] == index, 1],
+                                     edges[edges[:, 1] == index, 0]))
+        return MIntArray(neighbours.tolist())
+
+    def onBoundary(self):
+        data = self._data
+        boundary = data.edgeVertices[data.edgeFaceCounts == 1]
+        return bool((boundary == self.index()).any())
+
+class MItMeshEdge(_ComponentIterator):
+    _componentType = MFn.kMeshEdgeComponent
+
+    def _count(self):
+        return self._data.numEdges
+
+    def vertexId(self, which):
+        return int(self._data.edgeVertices[self.index(), which])
+
+    def point(self, which, space=MSpace.kObject):
+        return MPoint(self._data.points[self.vertexId(which)])
+
+    def onBoundary(self):
+        return bool(self._data.edgeFaceCounts[self.index()] == 1)
+
+class MItMeshPolygon(_ComponentIterator):
+    _componentType = MFn.kMeshPolygonComponent
+
+    def _count(self):
+        return self._data.numPolygons
+
+    def getVertices(self):
+        return MIntArray(self._data.faceVertices(self.index()).tolist())
+
+    def polygonVertexCount(self):
+        return int(self._data.faceCounts[self.index()])
+
+#+---------------------------------------------------------------------------+
+#|                                 Selection                                 |
+#+---------------------------------------------------------------------------+
+
+# component names of the selection strings
+_COMPONENT_NAMES = {"vtx": MFn.kMeshVertComponent,
+                    "e": MFn.kMeshEdgeComponent,
+                    "f": MFn.kMeshPolygonComponent}
+
+def _parseSelectionString(pattern):
+    """parses "object" or "object.vtx[0:3]" into a dag path and a component"""
+
+    objectName, _, componentString = pattern.partition(".")
+    matches = [node for node in _findNodes(objectName)
+               if node.apiType in (MFn.kTransform, MFn.kMesh)]
+    if len(matches) != 1:
+        raise RuntimeError("(kInvalidParameter): Object '{0}' does not "
+                           "exist".format(pattern) if not matches else
+                           "(kInvalidParameter): More than one object "
+                           "matches name: {0}".format(objectName))
+    mDagPath = MDagPath.getAPathTo(MObject(matches[0]))
+    if not componentString:
+        return mDagPath, None
+
+    name, _, indexString = componentString.partition("[")
+    if name not in _COMPONENT_NAMES or not indexString.endswith("]"):
+        raise RuntimeError("(kInvalidParameter): Invalid component "
+                           "'{0}'".format(pattern))
+    data = _meshNodeOf(mDagPath).data
+    count = {"vtx": data.numVertices, "e": data.numEdges,
+             "f": data.numPolygons}[name]
+    indexString = indexString[:-1]
+    if indexString == "*":
+        elements = range(count)
+    else:
+        start, _, end = indexString.partition(":")
+        elements = range(int(start), int(end or start) + 1)
+    if any(element >= count for element in elements):
+        raise RuntimeError("(kInvalidParameter): Component index out of "
+                           "range '{0}'".format(pattern))
+    return mDagPath, _Component(_COMPONENT_NAMES[name], elements)
+
+class MSelectionList(object):
+    def __init__(self, other=None):
+        # every item is a dag path with a component or None
+        self._items = []
+        if other is not None:
+            self._items = [(MDagPath(mDagPath), component)
+                           for mDagPath, component in other._items]
+
+    def __len__(self):
+        return len(self._items)
+
+    def length(self):
+        return len(self._items)
+
+    def isEmpty(self):
+        return not self._items
+
+    def clear(self):
+        self._items = []
+        return self
+
+    def add(self, item, mergeWithExisting=True):
+        if isinstance(item, str):
+            mDagPath, component = _parseSelectionString(item)
+        elif isinstance(item, MDagPath):
+            mDagPath, component = MDagPath(item), None
+        elif isinstance(item, tuple):
+            mDagPath = MDagPath(item[0])
+            component = None if item[1].isNull() else \
+                _Component(item[1].apiType(), item[1]._payload.elements)
+        elif isinstance(item, MObject):
+            mDagPath, component = MDagPath.getAPathTo(item), None
+        else:
+            raise TypeError("an object, dag path or string is required")
+
+        if mergeWithExisting:
+            for index, (other, otherComponent) in enumerate(self._items):
+                if other != mDagPath:
+                    continue
+                if component is None and otherComponent is None:
+                    return self
+                if component is not None and otherComponent is not None and \
+                        otherComponent.apiType == component.apiType:
+                    self._items[index] = (other, _Component(
+                        component.apiType,
+                        otherComponent.elements + component.elements))
+                    return self
+        self._items.append((mDagPath, component))
+        return self
+
+    def merge(self, other):
+        for mDagPath, component in other._items:
+            self.add((mDagPath, MObject(component)))
+        return self
+
+    def _item(self, index):
+        if not 0 <= index < len(self._items):
+            raise IndexError("selection list index out of range")
+        return self._items[index]
+
+    def getDagPath(self, index):
+        return MDagPath(self._item(index)[0])
+
+    def getDependNode(self, index):
+        return self._item(index)[0].node()
+
+    def getComponent(self, index):
+        mDagPath, component = self._item(index)
+        return MDagPath(mDagPath), MObject(component)
+
+    def getSelectionStrings(self, index=None):
+        items = self._items if index is None else [self._item(index)]
+        strings = []
+        for mDagPath, component in items:
+            name = mDagPath.partialPathName()
+            if component is None:
+                strings.append(name)
+                continue
+            shortName = [key for key, value in _COMPONENT_NAMES.items()
+                         if value == component.apiType][0]
+            elements = component.elements
+            # continues ranges are written as one string like maya does
+            start = 0
+            for end in range(1, len(elements) + 1):
+                if end == len(elements) or elements[end] != elements[end - 1] + 1:
+                    strings.append("{0}.{1}[{2}]".format(
+                        name, shortName, elements[start] if end - start == 1
+                        else "{0}:{1}".format(elements[start],
+                                              elements[end - 1])))
+                    start = end
+        return strings
+
+_activeSelection = MSelectionList()
+
+class MGlobal(object):
+    kReplaceList = 0
+    kXORWithList = 1
+    kRemoveFromList = 2
+    kAddToList = 3
+
+    kInteractive = 0
+    kBatch = 1
+    kLibraryApp = 2
+
+    @staticmethod
+    def getActiveSelectionList(orderedSelectionIfAvailable=False):
+        return MSelectionList(_activeSelection)
+
+    @staticmethod
+    def setActiveSelectionList(selectionList, listAdjustment=0):
+        global _activeSelection
+
+        if listAdjustment == MGlobal.kReplaceList:
+            _activeSelection = MSelectionList(selectionList)
+        elif listAdjustment == MGlobal.kAddToList:
+            _activeSelection.merge(selectionList)
+        else:
+            raise RuntimeError("(kInvalidParameter): only replace and add "
+                               "are supported")
+
+    @staticmethod
+    def clearSelectionList():
+        _activeSelection.clear()
+
+    @staticmethod
+    def mayaState():
+        return MGlobal.kLibraryApp
+
+    @staticmethod
+    def displayInfo(message):
+        print(message)
+
+    @staticmethod
+    def displayWarning(message):
+        print("# Warning: {0}".format(message))
+
+    @staticmethod
+    def displayError(message):
+        print("# Error: {0}".format(message))
+
+#+---------------------------------------------------------------------------+
+#|                            Messages and Plugs                             |
+#+---------------------------------------------------------------------------+
+
+class MPlug(object):
+    def __init__(self, node=None, attributeName=""):
+        self._node = node
+        self._attributeName = attributeName
+
+    def isNull(self):
+        return self._node is None
+
+    def node(self):
+        return MObject(self._node)
+
+    def name(self):
+        return "{0}.{1}".format(self._node.name, self._attributeName)
+
+    def partialName(self):
+        return self._attributeName
+
+class _CallbackRegistry(object):
+    """every registered callback by its id. The node is None for scene
+    callbacks"""
+
+    def __init__(self):
+        self._callbacks = {}
+        self._nextId = 1
+
+    def add(self, kind, node, function, clientData):
+        callbackId = self._nextId
+        self._nextId += 1
+        self._callbacks[callbackId] = (kind, node, function, clientData)
+        return callbackId
+
+    def remove(self, callbackId):
+        if self._callbacks.pop(callbackId, None) is None:
+            raise RuntimeError("(kInvalidParameter): unknown callback id")
+
+    def notify(self, kind, node, *args):
+        for callbackKind, callbackNode, function, clientData in \
+                list(self._callbacks.values()):
+            if callbackKind == kind and callbackNode is node:
+                function(*(args + (clientData,)))
+
+_callbacks = _CallbackRegistry()
+
+class MMessage(object):
+    @staticmethod
+    def removeCallback(callbackId):
+        _callbacks.remove(callbackId)
+
+    @staticmethod
+    def removeCallbacks(callbackIds):
+        for callbackId in callbackIds:
+            _callbacks.remove(callbackId)
+
+class MSceneMessage(MMessage):
+    kBeforeNew = 2
+    kAfterNew = 3
+    kBeforeOpen = 6
+    kAfterOpen = 7
+
+    @staticmethod
+    def addCallback(message, function, clientData=None):
+        return _callbacks.add(("scene", message), None, function, clientData)
+
+def _notifyScene(message):
+    _callbacks.notify(("scene", message), None)
+
+class MNodeMessage(MMessage):
+    @staticmethod
+    def addNodePreRemovalCallback(node, function, clientData=None):
+        return _callbacks.add("preRemoval", node._payload, function,
+                              clientData)
+
+    @staticmethod
+    def addNodeDirtyPlugCallback(node, function, clientData=None):
+        return _callbacks.add("dirtyPlug", node._payload, function,
+                              clientData)
+
+class MPolyMessage(MMessage):
+    @staticmethod
+    def addPolyTopologyChangedCallback(node, function, clientData=None):
+        return _callbacks.add("topologyChanged", node._payload, function,
+                              clientData)
+
+#+---------------------------------------------------------------------------+
+#|                                   Files                                   |
+#+---------------------------------------------------------------------------+
+
+class MFileObject(object):
+    kNone = 0
+    kExact = 1
+    kDirMap = 2
+    kReferenceMapping = 3
+    kRelative = 4
+    kInputFile = 5
+
+    def __init__(self):
+        self.resolveMethod = MFileObject.kExact
+        self._rawPath = ""
+        self._rawName = ""
+
+    def setRawPath(self, path):
+        self._rawPath = path
+
+    def setRawName(self, name):
+        self._rawName = name
+
+    def rawPath(self):
+        return self._rawPath
+
+    def rawName(self):
+        return self._rawName
+
+    def _resolvedDirectory(self):
+        # the raw path can be a search path like XBMLANGPATH
+        for directory in self._rawPath.split(os.pathsep):
+            directory = directory.replace("%B", "")
+            if directory and os.path.exists(os.path.join(directory,
+                                                         self._rawName)):
+                return directory.rstrip("/\\") + "/"
+        return None
+
+    def exists(self):
+        return self._resolvedDirectory() is not None
+
+    def resolvedPath(self):
+        return self._resolvedDirectory() or ""
+
+    def resolvedName(self):
+        return self._rawName if self.exists() else ""
+
+    def resolvedFullName(self):
+        directory = self._resolvedDirectory()
+        return "" if directory is None else directory + self._rawName
+
+#+---------------------------------------------------------------------------+
+#|                          Commands and Arguments                           |
+#+---------------------------------------------------------------------------+
+
+class MSyntax(object):
+    kInvalidArgType = 0
+    kNoArg = 1
+    kBoolean = 2
+    kLong = 3
+    kUnsigned = 4
+    kDouble = 5
+    kString = 6
+    kDistance = 7
+    kAngle = 8
+    kTime = 9
+    kSelectionItem = 10
+
+    kNone = 1
+    kStringObjects = 2
+    kSelectionList = 3
+
+    def __init__(self):
+        # short flag to (long flag, argument types, multi use)
+        self._flags = {}
+        self._longFlags = {}
+        self.enableQuery = False
+        self.enableEdit = False
+
+    def addFlag(self, shortName, longName, *argumentTypes):
+        types = []
+        for argumentType in argumentTypes:
+            if isinstance(argumentType, (tuple, list)):
+                types.extend(argumentType)
+            else:
+                types.append(argumentType)
+        types = [argumentType for argumentType in types
+                 if argumentType != MSyntax.kNoArg]
+        if shortName in self._flags or longName in self._longFlags:
+            raise RuntimeError("(kInvalidParameter): flag {0} is already "
+                               "defined".format(shortName))
+        self._flags[shortName] = [longName, types, False]
+        self._longFlags[longName] = shortName
+        return self
+
+    def makeFlagMultiUse(self, flag):
+        self._flags[self.shortFlag(flag)][2] = True
+        return self
+
+    def setObjectType(self, objectType, minimumObjects=0,
+                      maximumObjects=None):
+        return self
+
+    def useSelectionAsDefault(self, useSelection):
+        return self
+
+    def addArg(self, argumentType):
+        return self
+
+    def shortFlag(self, flag):
+        """returns the short name of a short or long flag"""
+
+        if flag in self._flags:
+            return flag
+        if flag in self._longFlags:
+            return self._longFlags[flag]
+        raise TypeError("Invalid flag '{0}'".format(flag.lstrip("-")))
+
+    def flagArgumentTypes(self, flag):
+        return self._flags[self.shortFlag(flag)][1]
+
+    def isFlagMultiUse(self, flag):
+        return self._flags[self.shortFlag(flag)][2]
+
+class MArgList(object):
+    def __init__(self, values=None):
+        self._values = list(values or [])
+
+    def __len__(self):
+        return len(self._values)
+
+    def length(self):
+        return len(self._values)
+
+    def addArg(self, value):
+        self._values.append(value)
+        return self
+
+    def asDouble(self, index):
+        return float(self._values[index])
+
+    def asInt(self, index):
+        return int(self._values[index])
+
+    def asBool(self, index):
+        return bool(self._values[index])
+
+    def asString(self, index):
+        return str(self._values[index])
+
+class MArgParser(object):
+    def __init__(self, syntax, args):
+        self._syntax = syntax
+        # short flag to the arguments of every use
+        self._uses = {}
+        self._objects = []
+        values = args._values
+        index = 0
+        while index < len(values):
+            value = values[index]
+            if isinstance(value, str) and value.startswith("-") and \
+                    len(value) > 1 and not value[1].isdigit():
+                flag = syntax.shortFlag(value)
+                count = len(syntax.flagArgumentTypes(flag))
+                arguments = values[index + 1:index + 1 + count]
+                if len(arguments) != count:
+                    raise RuntimeError("(kInvalidParameter): flag {0} needs "
+                                       "{1} arguments".format(value, count))
+                self._uses.setdefault(flag, []).append(arguments)
+                index += 1 + count
+            else:
+                self._objects.append(value)
+                index += 1
+
+    @property
+    def isQuery(self):
+        return False
+
+    @property
+    def isEdit(self):
+        return False
+
+    def isFlagSet(self, flag):
+        return self._syntax.shortFlag(flag) in self._uses
+
+    def numberOfFlagUses(self, flag):
+        return len(self._uses.get(self._syntax.shortFlag(flag), []))
+
+    def _argument(self, flag, index, use=0):
+        uses = self._uses.get(self._syntax.shortFlag(flag))
+        if not uses:
+            raise RuntimeError("(kFailure): flag {0} is not set".format(flag))
+        return uses[use][index]
+
+    def flagArgumentDouble(self, flag, index):
+        return float(self._argument(flag, index))
+
+    def flagArgumentInt(self, flag, index):
+        return int(self._argument(flag, index))
+
+    def flagArgumentBool(self, flag, index):
+        return bool(self._argument(flag, index))
+
+    def flagArgumentString(self, flag, index):
+        return str(self._argument(flag, index))
+
+    def getFlagArgumentList(self, flag, use):
+        uses = self._uses.get(self._syntax.shortFlag(flag), [])
+        if use >= len(uses):
+            raise RuntimeError("(kFailure): flag {0} is not used {1} "
+                               "times".format(flag, use + 1))
+        return MArgList(uses[use])
+
+    def commandArgumentString(self, index):
+        return str(self._objects[index])
+
+    def getObjectStrings(self):
+        return [str(value) for value in self._objects]
+
+# result of the command which runs right now
+_commandResult = []
+
+class MPxCommand(object):
+    def __init__(self):
+        # set by maya.cmds to the syntax the command was registered with
+        self._syntax = MSyntax()
+
+    def syntax(self):
+        return self._syntax
+
+    def hasSyntax(self):
+        return True
+
+    def isUndoable(self):
+        return False
+
+    def doIt(self, args):
+        pass
+
+    def undoIt(self):
+        pass
+
+    def redoIt(self):
+        pass
+
+    @staticmethod
+    def setResult(result):
+        _commandResult[:] = [result]
+
+    @staticmethod
+    def appendToResult(result):
+        _commandResult.append(result)
+
+    @staticmethod
+    def clearResult():
+        _commandResult[:] = []
+
+    @staticmethod
+    def displayInfo(message):
+        MGlobal.displayInfo(message)
+
+    @staticmethod
+    def displayWarning(message):
+        MGlobal.displayWarning(message)
+
+    @staticmethod
+    def displayError(message):
+        MGlobal.displayError(message)
+
+#+---------------------------------------------------------------------------+
+#|                            Nodes and Plug-ins                             |
+#+---------------------------------------------------------------------------+
+
+class MTypeId(object):
+    def __init__(self, value=0):
+        self._value = value
+
+    def __eq__(self, other):
+        return isinstance(other, MTypeId) and self._value == other._value
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self._value)
+
+    def id(self):
+        return self._value
+
+class MPxNode(object):
+    kDependNode = 0
+    kLocatorNode = 1
+    kDeformerNode = 2
+    kManipContainer = 3
+    kSurfaceShape = 4
+
+    kDefaultScheduling = 0
+    kParallel = 1
+    kSerial = 2
+    kGloballySerial = 3
+    kUntrusted = 4
+
+    def __init__(self):
+        pass
+
+    @classmethod
+    def addAttribute(cls, attribute):
+        attributes = cls.__dict__.get("_attributes")
+        if attributes is None:
+            attributes = []
+            setattr(cls, "_attributes", attributes)
+        attributes.append(attribute)
+
+    @classmethod
+    def attributeAffects(cls, whenChanges, isAffected):
+        pass
+
+    def schedulingType(self):
+        return MPxNode.kDefaultScheduling
+
+class MFnNumericData(object):
+    kInvalid = 0
+    kBoolean = 1
+    kByte = 2
+    kChar = 3
+    kShort = 4
+    kInt = 7
+    kLong = 7
+    kFloat = 11
+    kDouble = 14
+    k2Double = 15
+    k3Float = 13
+    k3Double = 16
+
+class MFnNumericAttribute(object):
+    def __init__(self, attribute=None):
+        self._attribute = None if attribute is None else attribute._payload
+
+    def create(self, longName, shortName, dataType, default=0.0):
+        self._attribute = _Attribute(longName, shortName, dataType, default)
+        self._attribute.apiType = MFn.kNumericAttribute
+        return MObject(self._attribute)
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if name == "default":
+            return self._attribute.default
+        return self._attribute.properties.get(name, True)
+
+    def __setattr__(self, name, value):
+        if name.startswith("_"):
+            object.__setattr__(self, name, value)
+        elif name == "default":
+            self._attribute.default = value
+        else:
+            self._attribute.properties[name] = value
+
+    def setMin(self, *values):
+        self._attribute.properties["min"] = values
+
+    def setMax(self, *values):
+        self._attribute.properties["max"] = values
+
+class MFnPlugin(object):
+    def __init__(self, mObject=None, vendor="Unknown", version="Unknown",
+                 apiVersion="Any"):
+        self.vendor = vendor
+        self.version = version
+
+    def registerCommand(self, commandName, creator, syntaxCreator=None):
+        import maya.cmds
+        maya.cmds._registerCommand(commandName, creator, syntaxCreator)
+
+    def deregisterCommand(self, commandName):
+        import maya.cmds
+        maya.cmds._deregisterCommand(commandName)
+
+    def registerNode(self, typeName, typeId, creator, initialize,
+                     nodeType=MPxNode.kDependNode, classification=None):
+        if typeName in _registeredNodes or \
+                any(entry[0] == typeId for entry in _registeredNodes.values()):
+            raise RuntimeError("(kFailure): node {0} is already "
+                               "registered".format(typeName))
+        # like maya the attributes are created on registration
+        initialize()
+        _registeredNodes[typeName] = (typeId, creator, nodeType)
+
+    def deregisterNode(self, typeId):
+        for typeName, entry in list(_registeredNodes.items()):
+            if entry[0] == typeId:
+                del _registeredNodes[typeName]
+                return
+        raise RuntimeError("(kFailure): node id is not registered")
+
+# node types which are registered by plug-ins
+_registeredNodes = {}
@@ -0,0 +1,27 @@
+import maya.api.OpenMaya as om
+
+#+---------------------------------------------------------------------------+
+#|                     Standalone maya.api.OpenMayaAnim                      |
+#|                                                                           |
+#| -> the deformer base class, so plug-ins with deformer nodes can be        |
+#|    imported and registered. Deformers are not evaluated by the stand-in   |
+#+---------------------------------------------------------------------------+
+
+class MPxDeformerNode(om.MPxNode):
+    # the attributes every deformer inherits
+    input = om.MObject()
+    inputGeom = om.MObject()
+    groupId = om.MObject()
+    outputGeom = om.MObject()
+    envelope = om.MObject()
+    weightList = om.MObject()
+    weights = om.MObject()
+
+    def __init__(self):
+        om.MPxNode.__init__(self)
+
+    def weightValue(self, dataBlock, multiIndex, index):
+        return 1.0
+
+    def deform(self, dataBlock, geoIterator, matrix, multiIndex):
+        pass
@@ -0,0 +1,360 @@
+import os
+import sys
+
+import numpy as np
+
+import maya.api.OpenMaya as om
+
+#+---------------------------------------------------------------------------+
+#|                            Standalone maya.cmds                           |
+#|                                                                           |
+#| -> the commands the Circlelizer plug-in and its scripts are calling. The  |
+#|    commands of loaded plug-ins are available like in maya, keyword flags  |
+#|    are turned into an MArgList and undoable commands go onto the undo     |
+#|    queue                                                                  |
+#+---------------------------------------------------------------------------+
+
+# version which is reported by about
+VERSION = "2020"
+API_VERSION = 20200000
+
+# name of every plug-in command to its creator and syntax creator
+_commands = {}
+
+# loaded plug-in modules by their file name
+_plugins = {}
+
+# executed undoable commands
+_undoQueue = []
+_redoQueue = []
+_undoState = [True]
+
+#+---------------------------------------------------------------------------+
+#|                              Plug-in Commands                             |
+#+---------------------------------------------------------------------------+
+
+def _registerCommand(commandName, creator, syntaxCreator=None):
+    if commandName in _commands or commandName in globals():
+        raise RuntimeError("(kFailure): command {0} is already "
+                           "registered".format(commandName))
+    _commands[commandName] = (creator, syntaxCreator)
+    globals()[commandName] = lambda *args, **kwargs: _runCommand(
+        commandName, args, kwargs)
+
+def _deregisterCommand(commandName):
+    if _commands.pop(commandName, None) is None:
+        raise RuntimeError("(kFailure): command {0} is not "
+                           "registered".format(commandName))
+    del globals()[commandName]
+
+def _argumentList(syntax, args, kwargs):
+    """translates keyword flags into the MArgList maya would pass to doIt.
+    Flags without arguments are set by True, multi use flags take a list
+    with the arguments of every use"""
+
+    argList = om.MArgList()
+    for name, value in kwargs.items():
+        flag = syntax.shortFlag("-" + name)
+        count = len(syntax.flagArgumentTypes(flag))
+        if count == 0:
+            if value:
+                argList.addArg(flag)
+            continue
+        uses = value if syntax.isFlagMultiUse(flag) and \
+            isinstance(value, list) else [value]
+        for use in uses:
+            arguments = list(use) if count > 1 else [use]
+            argList.addArg(flag)
+            for argument in arguments:
+                argList.addArg(argument)
+    for argument in args:
+        argList.addArg(argument)
+    return argList
+
+def _runCommand(commandName, args, kwargs):
+    creator, syntaxCreator = _commands[commandName]
+    command = creator()
+    command._syntax = syntaxCreator() if syntaxCreator is not None else \
+        om.MSyntax()
+    argList = _argumentList(command._syntax, args, kwargs)
+
+    om.MPxCommand.clearResult()
+    command.doIt(argList)
+    if command.isUndoable() and _undoState[0]:
+        _undoQueue.append(command)
+        del _redoQueue[:]
+
+    result = list(om._commandResult)
+    om.MPxCommand.clearResult()
+    if not result:
+        return None
+    return result[0] if len(result) == 1 else result
+
+def undo():
+    if not _undoQueue:
+        raise RuntimeError("There are no more commands to undo.")
+    command = _undoQueue.pop()
+    command.undoIt()
+    _redoQueue.append(command)
+
+def redo():
+    if not _redoQueue:
+        raise RuntimeError("There are no more commands to redo.")
+    command = _redoQueue.pop()
+    command.redoIt()
+    _undoQueue.append(command)
+
+def flushUndo():
+    del _undoQueue[:]
+    del _redoQueue[:]
+
+def undoInfo(query=False, q=False, state=None, stateWithoutFlush=None):
+    if query or q:
+        return _undoState[0]
+    if state is not None:
+        _undoState[0] = bool(state)
+        if not state:
+            flushUndo()
+    if stateWithoutFlush is not None:
+        _undoState[0] = bool(stateWithoutFlush)
+
+#+---------------------------------------------------------------------------+
+#|                             Application State                             |
+#+---------------------------------------------------------------------------+
+
+def about(version=False, apiVersion=False, batch=False, **kwargs):
+    if apiVersion:
+        return API_VERSION
+    if batch:
+        return True
+    return VERSION
+
+def _loadSource(moduleName, path):
+    try:
+        import importlib.util
+    except ImportError:
+        import imp
+        return imp.load_source(moduleName, path)
+
+    spec = importlib.util.spec_from_file_location(moduleName, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[moduleName] = module
+    spec.loader.exec_module(module)
+    return module
+
+def loadPlugin(path, quiet=False, **kwargs):
+    """imports the plug-in file and calls its initializePlugin"""
+
+    name = os.path.basename(path)
+    if name in _plugins:
+        return [os.path.splitext(name)[0]]
+    module = _loadSource(os.path.splitext(name)[0], path)
+    module.initializePlugin(om.MObject())
+    _plugins[name] = module
+    return [os.path.splitext(name)[0]]
+
+def unloadPlugin(name, force=False, **kwargs):
+    module = _plugins.pop(os.path.basename(name), None)
+    if module is None:
+        raise RuntimeError("Plug-in, \"{0}\", was not found".format(name))
+    module.uninitializePlugin(om.MObject())
+    sys.modules.pop(module.__name__, None)
+
+def pluginInfo(name, query=False, q=False, loaded=False, **kwargs):
+    return os.path.basename(name) in _plugins
+
+def makePaintable(*args, **kwargs):
+    pass
+
+# path of the current scene, empty for an untitled scene
+_sceneName = [""]
+
+def _meshNodes():
+    """returns every mesh node of the scene which has a transform"""
+
+    return [node for node in om._nodes
+            if isinstance(node, om._MeshNode) and node.parent is not None]
+
+def _saveScene(path):
+    """writes the meshes of the scene as .npz file, every mesh keeps the
+    names of its transform and shape"""
+
+    arrays = {}
+    for index, mesh in enumerate(_meshNodes()):
+        prefix = "mesh{0}_".format(index)
+        arrays[prefix + "names"] = np.array([mesh.parent.name, mesh.name])
+        arrays[prefix + "points"] = mesh.data.points
+        arrays[prefix + "faceCounts"] = mesh.data.faceCounts
+        arrays[prefix + "faceConnects"] = mesh.data.faceConnects
+    # a file object keeps numpy from appending .npz to the name
+    with open(path, "wb") as sceneFile:
+        np.savez(sceneFile, **arrays)
+
+def _openScene(path):
+    """creates the meshes of a scene written by _saveScene"""
+
+    if not os.path.isfile(path):
+        raise RuntimeError("File not found: {0}".format(path))
+    with np.load(path) as arrays:
+        index = 0
+        while "mesh{0}_names".format(index) in arrays:
+            prefix = "mesh{0}_".format(index)
+            transformName, shapeName = [str(name) for name in
+                                        arrays[prefix + "names"]]
+            transform = om.MFnMesh().create(
+                om.MPointArray(arrays[prefix + "points"]),
+                arrays[prefix + "faceCounts"],
+                arrays[prefix + "faceConnects"])
+            transformFn = om.MFnDagNode(transform)
+            transformFn.setName(transformName)
+            om.MFnDependencyNode(transformFn.child(0)).setName(shapeName)
+            index += 1
+
+def file(*args, **kwargs):
+    """supports new, open, rename, save and the query of the scene name. The
+    scenes of the stand-in are .npz files with the meshes of the scene"""
+
+    if kwargs.get("query") or kwargs.get("q"):
+        if kwargs.get("sceneName") or kwargs.get("sn"):
+            return _sceneName[0]
+        raise RuntimeError("only the scene name can be queried")
+
+    if kwargs.get("rename") or kwargs.get("rn"):
+        _sceneName[0] = kwargs.get("rename") or kwargs.get("rn")
+        return _sceneName[0]
+
+    if kwargs.get("save") or kwargs.get("s"):
+        if not _sceneName[0]:
+            raise RuntimeError("an untitled scene has to be renamed first")
+        _saveScene(_sceneName[0])
+        return _sceneName[0]
+
+    isOpen = kwargs.get("open") or kwargs.get("o")
+    if not (kwargs.get("new") or isOpen):
+        raise RuntimeError("only new, open, rename and save are supported by "
+                           "the stand-in")
+    om._notifyScene(om.MSceneMessage.kBeforeOpen if isOpen else
+                    om.MSceneMessage.kBeforeNew)
+    om._clearScene()
+    om.MGlobal.clearSelectionList()
+    flushUndo()
+    _sceneName[0] = ""
+    if isOpen:
+        _openScene(args[0])
+        _sceneName[0] = args[0]
+    om._notifyScene(om.MSceneMessage.kAfterOpen if isOpen else
+                    om.MSceneMessage.kAfterNew)
+    return _sceneName[0]
+
+def delete(*names):
+    for name in names:
+        nodes = om._findNodes(name)
+        if not nodes:
+            raise ValueError("No object matches name: {0}".format(name))
+        om._removeNode(nodes[0])
+
+#+---------------------------------------------------------------------------+
+#|                                 Selection                                 |
+#+---------------------------------------------------------------------------+
+
+def select(*items, **kwargs):
+    """selects objects or components like "pPlane1.vtx[0:4]" """
+
+    selection = om.MSelectionList()
+    if kwargs.get("clear") or kwargs.get("cl"):
+        om.MGlobal.setActiveSelectionList(selection)
+        return
+    for item in items:
+        for name in (item if isinstance(item, (list, tuple)) else [item]):
+            selection.add(name)
+    if kwargs.get("add"):
+        om.MGlobal.setActiveSelectionList(selection, om.MGlobal.kAddToList)
+    else:
+        om.MGlobal.setActiveSelectionList(selection)
+
+def ls(selection=False, sl=False, flatten=False, fl=False, **kwargs):
+    if not (selection or sl):
+        return [node.name for node in om._nodes]
+    strings = om.MGlobal.getActiveSelectionList().getSelectionStrings()
+    if not (flatten or fl):
+        return strings
+    flattened = []
+    for string in strings:
+        name, _, indices = string.partition("[")
+        if not indices:
+            flattened.append(string)
+            continue
+        start, _, end = indices[:-1].partition(":")
+        flattened.extend("{0}[{1}]".format(name, index)
+                         for index in range(int(start), int(end or start) + 1))
+    return flattened
+
+def _selectedVertexMask(data, component):
+    """returns the vertices of a component as mask over the mesh"""
+
+    mask = np.zeros(data.numVertices, dtype=bool)
+    elements = np.asarray(component.elements, dtype=np.intp)
+    if component.apiType == om.MFn.kMeshVertComponent:
+        mask[elements] = True
+    elif component.apiType == om.MFn.kMeshEdgeComponent:
+        mask[data.edgeVertices[elements].ravel()] = True
+    else:
+        faces = np.zeros(data.numPolygons, dtype=bool)
+        faces[elements] = True
+        mask[data.faceConnects[faces[data.cornerFaces]]] = True
+    return mask
+
+def _selectedFaceMask(data, component):
+    """returns the faces of a component, or the faces which only use its
+    vertices, as mask over the mesh"""
+
+    if component.apiType == om.MFn.kMeshPolygonComponent:
+        faces = np.zeros(data.numPolygons, dtype=bool)
+        faces[np.asarray(component.elements, dtype=np.intp)] = True
+        return faces
+    vertexMask = _selectedVertexMask(data, component)
+    return np.logical_and.reduceat(vertexMask[data.faceConnects],
+                                   data.faceOffsets[:-1]) & \
+        (data.faceCounts > 0)
+
+def _containedEdges(data, component):
+    if component.apiType == om.MFn.kMeshEdgeComponent:
+        return component.elements
+    if component.apiType == om.MFn.kMeshPolygonComponent:
+        faces = _selectedFaceMask(data, component)
+        return np.unique(data.cornerEdges[faces[data.cornerFaces]])
+    vertexMask = _selectedVertexMask(data, component)
+    return np.flatnonzero(vertexMask[data.edgeVertices[:, 0]] &
+                          vertexMask[data.edgeVertices[:, 1]])
+
+def _perimeterEdges(data, component):
+    faces = _selectedFaceMask(data, component)
+    # an edge of the region is on the perimeter if only one of its faces is
+    # part of the region
+    regionCounts = np.bincount(data.cornerEdges[faces[data.cornerFaces]],
+                               minlength=data.numEdges)
+    return np.flatnonzero(regionCounts == 1)
+
+def _convertSelection(convert):
+    """replaces every component of the active selection by the edges the
+    convert function returns"""
+
+    converted = om.MSelectionList()
+    active = om.MGlobal.getActiveSelectionList()
+    for index in range(active.length()):
+        mDagPath, mObject = active.getComponent(index)
+        if mObject.isNull():
+            continue
+        edges = convert(om._meshNodeOf(mDagPath).data, mObject._payload)
+        if len(edges):
+            component = om.MFnSingleIndexedComponent()
+            edgeObject = component.create(om.MFn.kMeshEdgeComponent)
+            component.addElements(np.asarray(edges).tolist())
+            converted.add((mDagPath, edgeObject))
+    om.MGlobal.setActiveSelectionList(converted)
+
+def ConvertSelectionToContainedEdges():
+    _convertSelection(_containedEdges)
+
+def ConvertSelectionToEdgePerimeter():
+    _convertSelection(_perimeterEdges)
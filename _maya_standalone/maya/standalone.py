@@ -0,0 +1,12 @@
+#+---------------------------------------------------------------------------+
+#|                          Standalone maya.standalone                       |
+#|                                                                           |
+#| -> the stand-in scene needs no initialization, these functions only exist |
+#|    so scripts written for mayapy run unchanged                            |
+#+---------------------------------------------------------------------------+
+
+def initialize(name="python"):
+    pass
+
+def uninitialize():
+    pass
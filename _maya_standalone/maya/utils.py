@@ -0,0 +1,8 @@
+#+---------------------------------------------------------------------------+
+#|                            Standalone maya.utils                          |
+#|                                                                           |
+#| -> the stand-in has no event loop, so deferred calls run right away       |
+#+---------------------------------------------------------------------------+
+
+def executeDeferred(function, *args, **kwargs):
+    function(*args, **kwargs)